@@ -1,66 +1,174 @@
 
 # ============= Imports (must be at top) =============
 import ast
+import bisect
+import collections
+import concurrent.futures
+import copy
+import functools
+import hashlib
 import math
+import operator
+import os
+import pickle
+import sys
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+
+import numpy as np
+
+
+# ============= Expression Compilation =============
+
+# Maximum number of distinct expression strings kept in compiled form
+_EXPRESSION_CACHE_SIZE = 4096
+
+# Builtins exposed to every DSL expression (DSL functions are layered on top)
+_SAFE_BUILTINS = {
+    '__builtins__': None,
+    'int': int,
+    'float': float,
+    'str': str,
+    'len': len,
+    'min': min,
+    'max': max,
+    'sum': sum,
+    'round': round,
+    'True': True,
+    'False': False,
+    'None': None,
+}
+
+# Globals namespace shared by all evaluations; built once DSL_FUNCTIONS exists
+_safe_globals = None
+
+
+def _get_safe_globals() -> Dict[str, Any]:
+    """Return the shared evaluation globals (safe builtins + DSL functions).
+
+    The namespace is built on first use because `DSL_FUNCTIONS` is defined at
+    the bottom of this module. Expressions are evaluated in 'eval' mode and
+    cannot rebind globals, so one mapping can be reused for every call.
+    """
+    global _safe_globals
+    if _safe_globals is None:
+        dsl_funcs = globals().get('DSL_FUNCTIONS')
+        namespace = dict(_SAFE_BUILTINS)
+        if dsl_funcs is None:
+            # Module still importing: do not cache an incomplete namespace
+            return namespace
+        namespace.update(dsl_funcs)
+        _safe_globals = namespace
+    return _safe_globals
+
+
+def _layered_namespace(context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Evaluation globals for many rows that share one context.
+
+    Namespaces are layered instead of copied per row: the shared function
+    layer (safe builtins + DSL functions), then `context` on top of it, built
+    once per call; each row then only supplies a small dict of row variables
+    as locals. Without a context the shared layer itself is returned.
+    """
+    safe_globals = _get_safe_globals()
+    if not context:
+        return safe_globals
+    namespace = dict(safe_globals)
+    namespace.update((k, v) for k, v in context.items() if k != '__builtins__')
+    return namespace
+
+
+def _shadowed_row_names(names, *layers) -> set:
+    """Row-variable names that a DSL function or one of `layers` shadows.
+
+    Such names are left out of the per-row layer so the lookup falls through
+    to the layer that used to override them.
+    """
+    dsl_funcs = globals().get('DSL_FUNCTIONS', {})
+    return {n for n in names if n in dsl_funcs or any(layer and n in layer for layer in layers)}
+
+
+def _validate_expression_tree(tree: ast.AST) -> None:
+    """Reject dunder names/attributes, which are the usual sandbox escape route."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id.startswith('__'):
+            raise ValueError(f"Name '{node.id}' is not allowed in DSL expressions")
+        if isinstance(node, ast.Attribute) and node.attr.startswith('__'):
+            raise ValueError(f"Attribute '{node.attr}' is not allowed in DSL expressions")
+
+
+class _LazyIifTransformer(ast.NodeTransformer):
+    """Rewrite every `iif(cond, a, b)` call into the conditional `a if cond else b`.
+
+    Only the chosen branch is evaluated at runtime, at any nesting depth.
+    Calls with keywords, star-args or a different arity are left untouched
+    and keep the eager `if_op` semantics.
+    """
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if (isinstance(node.func, ast.Name) and node.func.id == 'iif'
+                and len(node.args) == 3 and not node.keywords
+                and not any(isinstance(a, ast.Starred) for a in node.args)):
+            cond, when_true, when_false = node.args
+            return ast.copy_location(ast.IfExp(test=cond, body=when_true, orelse=when_false), node)
+        return node
+
+
+def _parse_expression(expression: str) -> ast.Expression:
+    """Parse and validate a DSL expression into its lazily-evaluating AST.
+
+    Mirrors `eval()` string handling: leading spaces/tabs are ignored and
+    syntax errors carry the same '<string>' filename.
+    """
+    source = expression.lstrip(' \t')
+    tree = ast.parse(source, filename='<string>', mode='eval')
+    _validate_expression_tree(tree)
+    tree = _LazyIifTransformer().visit(tree)
+    return ast.fix_missing_locations(tree)
+
+
+@functools.lru_cache(maxsize=_EXPRESSION_CACHE_SIZE)
+def _compile_expression(expression: str):
+    """Compile a DSL expression (LRU-cached by text, including the iif rewrite)."""
+    return compile(_parse_expression(expression), '<string>', 'eval')
+
+
+def expression_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters for the compiled-expression cache."""
+    info = _compile_expression.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+    }
+
+
+def clear_expression_cache() -> None:
+    """Drop all compiled expressions and reset the cache counters."""
+    _compile_expression.cache_clear()
 
 
-def safe_eval_expression(expression: str, context: Dict[str, Any]):
+def safe_eval_expression(expression: str, context: Dict[str, Any], namespace: Optional[Dict[str, Any]] = None):
     """
     Evaluate a DSL expression string in a restricted context.
     Uses the registered `DSL_FUNCTIONS` and a small set of safe builtins.
+    Expressions are compiled once and served from an LRU cache afterwards.
+    `namespace` optionally replaces the shared globals with a layered one
+    from `_layered_namespace()`.
     Falls back to raising the original exception to the caller.
     """
-    # Build a safe globals mapping exposing DSL functions and a few helpers
-    safe_globals = {
-        '__builtins__': None,
-        'int': int,
-        'float': float,
-        'str': str,
-        'len': len,
-        'min': min,
-        'max': max,
-        'sum': sum,
-        'round': round,
-        'True': True,
-        'False': False,
-        'None': None,
-    }
+    safe_globals = namespace if namespace is not None else _get_safe_globals()
 
-    # Insert DSL functions if available
-    dsl_funcs = globals().get('DSL_FUNCTIONS', {})
-    safe_globals.update(dsl_funcs)
-
-    # Lazy-evaluate top-level iif(...) to avoid evaluating both branches
-    expr_str = str(expression).strip()
-    if expr_str.startswith('iif(') and expr_str.endswith(')'):
-        inside = expr_str[len('iif('):-1]
-        parts = []
-        buf = ''
-        depth = 0
-        for ch in inside:
-            if ch == ',' and depth == 0:
-                parts.append(buf.strip())
-                buf = ''
-                continue
-            buf += ch
-            if ch == '(':
-                depth += 1
-            elif ch == ')':
-                depth -= 1
-        if buf:
-            parts.append(buf.strip())
-        if len(parts) == 3:
-            cond_expr, true_expr, false_expr = parts
-            cond_val = safe_eval_expression(cond_expr, context)
-            chosen = true_expr if cond_val else false_expr
-            return safe_eval_expression(chosen, context)
+    # iif(...) calls are rewritten to conditional expressions at compile time,
+    # so only the selected branch is evaluated.
 
     # Evaluate expression using eval with restricted globals and provided locals
     # The context variables are provided as locals so they shadow DSL functions if needed
     try:
-        return eval(expression, safe_globals, context or {})
+        code = _compile_expression(expression) if isinstance(expression, str) else expression
+        return eval(code, safe_globals, context or {})
     except Exception:
         # Re-raise to let callers handle/log; callers often catch and return None
         raise
@@ -171,10 +279,33 @@ from typing import List, Dict, Any, Optional
 
 # ============= Date Normalization Helper =============
 
+# Distinct strings whose normalized form (and parsed date) is memoized
+_NORMALIZE_DATE_CACHE_SIZE = 65536
+
+# Non-ISO formats normalize_date() tries, in priority order
+_DATE_FORMATS = ('%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%d %H:%M:%S',
+                 '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S.%f', '%m/%d/%Y', '%d/%m/%Y')
+
+# Earlier formats that can read the same text as a later one; they keep
+# their priority when the later format is the remembered one
+_DATE_FORMAT_OVERLAPS = {'%d/%m/%Y': ('%m/%d/%Y',)}
+
+# Last format that parsed each input shape (digits replaced by '9'); the
+# values of one column share a shape, so later values try it first
+_DATE_SHAPE_FORMATS: Dict[str, str] = {}
+_DATE_SHAPE_LIMIT = 1024
+_DATE_SHAPE_DIGITS = str.maketrans('0123456789', '9999999999')
+
+# How normalize_date() resolved the strings it had to parse
+_normalize_date_counters = collections.Counter()
+
+
 def normalize_date(date_value: Any) -> str:
     """
     Normalize a date value to YYYY-MM-DD string format.
     Handles datetime objects, timestamps, and various string formats.
+    Strings already in YYYY-MM-DD form are returned as they are; other
+    strings are memoized (see `normalize_date_stats()`).
     
     Args:
         date_value: Date in any format (datetime, timestamp, string)
@@ -187,30 +318,11 @@ def normalize_date(date_value: Any) -> str:
     
     # If already a string, try to parse and reformat
     if isinstance(date_value, str):
-        date_str = date_value.strip()
-        if not date_str or date_str == 'None':
-            return ''
-        
         # Already in YYYY-MM-DD format
-        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
-            return date_str
-        
-        # Try to parse common formats
-        for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', 
-                    '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S.%f', '%m/%d/%Y', '%d/%m/%Y']:
-            try:
-                dt = datetime.strptime(date_str[:min(len(date_str), 26)], fmt)
-                return dt.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        # If it has a 'T' or space, just take the date part
-        if 'T' in date_str:
-            return date_str.split('T')[0]
-        if ' ' in date_str:
-            return date_str.split(' ')[0]
-        
-        return date_str
+        if (len(date_value) == 10 and date_value[4] == '-' and date_value[7] == '-'
+                and not date_value[0].isspace() and not date_value[9].isspace()):
+            return date_value
+        return _normalize_date_text(date_value)
     
     # If datetime object
     if isinstance(date_value, datetime):
@@ -230,6 +342,123 @@ def normalize_date(date_value: Any) -> str:
     return str_val
 
 
+@functools.lru_cache(maxsize=_NORMALIZE_DATE_CACHE_SIZE)
+def _normalize_date_text(date_value: str) -> str:
+    """normalize_date() of a string that is not already YYYY-MM-DD."""
+    date_str = date_value.strip()
+    if not date_str or date_str == 'None':
+        return ''
+    
+    # Already in YYYY-MM-DD format
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        _normalize_date_counters['iso'] += 1
+        return date_str
+    
+    # Try to parse common formats, the one that last read this shape first
+    text = date_str[:min(len(date_str), 26)]
+    shape = text.translate(_DATE_SHAPE_DIGITS)
+    remembered = _DATE_SHAPE_FORMATS.get(shape)
+    formats = _DATE_FORMATS
+    if remembered is not None:
+        first = _DATE_FORMAT_OVERLAPS.get(remembered, ()) + (remembered,)
+        formats = first + tuple(fmt for fmt in _DATE_FORMATS if fmt not in first)
+    for fmt in formats:
+        try:
+            dt = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if remembered != fmt:
+            if len(_DATE_SHAPE_FORMATS) >= _DATE_SHAPE_LIMIT:
+                _DATE_SHAPE_FORMATS.clear()
+            _DATE_SHAPE_FORMATS[shape] = fmt
+        _normalize_date_counters[fmt] += 1
+        return dt.strftime('%Y-%m-%d')
+    
+    # If it has a 'T' or space, just take the date part
+    _normalize_date_counters['unparsed'] += 1
+    if 'T' in date_str:
+        return date_str.split('T')[0]
+    if ' ' in date_str:
+        return date_str.split(' ')[0]
+    
+    return date_str
+
+
+@functools.lru_cache(maxsize=_NORMALIZE_DATE_CACHE_SIZE)
+def _parse_iso_date(date_str: str) -> datetime:
+    """`datetime.fromisoformat()` of a normalized date string, memoized."""
+    return datetime.fromisoformat(date_str)
+
+
+class DateValue(str):
+    """A YYYY-MM-DD string that carries its parsed date.
+
+    The date functions return these and read the date back instead of
+    parsing the text again, so chained calls such as
+    days_between(start_of_month(d), end_of_month(d)) parse `d` once. In
+    every other respect they are ordinary strings (comparison, hashing,
+    JSON, concatenation); createTransaction and print emit plain str.
+    """
+
+
+@functools.lru_cache(maxsize=_NORMALIZE_DATE_CACHE_SIZE)
+def _date_value(year: int, month: int, day: int) -> DateValue:
+    """The shared DateValue of a calendar date."""
+    value = DateValue(f"{year:04d}-{month:02d}-{day:02d}")
+    # str subclasses cannot declare slots, so the date lives in the instance dict
+    value._parsed = datetime(year, month, day)
+    return value
+
+
+def _date_result(year: int, month: int, day: int) -> str:
+    """A date function's YYYY-MM-DD result (plain text outside years 1-9999)."""
+    if 1 <= year <= 9999:
+        return _date_value(year, month, day)
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _read_date(value: Any) -> Optional[datetime]:
+    """The datetime of a date argument, or None if it normalizes to ''.
+
+    Raises ValueError for text `datetime.fromisoformat()` cannot read.
+    """
+    if type(value) is DateValue:
+        return value._parsed
+    nd = normalize_date(value)
+    return _parse_iso_date(nd) if nd else None
+
+
+def _read_dates(*values: Any) -> Optional[tuple]:
+    """The datetimes of several date arguments, or None if any normalizes to ''
+    (checked before any of them is parsed)."""
+    texts = [normalize_date(value) for value in values]
+    if not all(texts):
+        return None
+    return tuple(text._parsed if type(text) is DateValue else _parse_iso_date(text) for text in texts)
+
+
+def normalize_date_stats() -> Dict[str, Any]:
+    """How normalize_date() resolved the strings it parsed, plus its cache counters.
+
+    'formats' counts each strptime format that read a string, 'iso' the
+    padded ISO strings and 'unparsed' those returned as-is (or cut at 'T'
+    or a space); every distinct string is counted once.
+    """
+    text = _normalize_date_text.cache_info()
+    parsed = _parse_iso_date.cache_info()
+    return {
+        'formats': {fmt: _normalize_date_counters[fmt] for fmt in _DATE_FORMATS if _normalize_date_counters[fmt]},
+        'iso': _normalize_date_counters['iso'],
+        'unparsed': _normalize_date_counters['unparsed'],
+        'hits': text.hits,
+        'misses': text.misses,
+        'size': text.currsize,
+        'parse_hits': parsed.hits,
+        'parse_misses': parsed.misses,
+        'maxsize': text.maxsize,
+    }
+
+
 # ============= Core Financial Functions =============
 
 def pv(rate: float, n: int, pmt: float, fv: float = 0, type: int = 0) -> float:
@@ -242,6 +471,8 @@ def pv(rate: float, n: int, pmt: float, fv: float = 0, type: int = 0) -> float:
         fv: Future value (default 0)
         type: 0 = payment at end of period (default), 1 = payment at beginning
     """
+    if _any_list(rate, n, pmt, fv, type):
+        return _map_list_args(pv, _array_pv, rate, n, pmt, fv, type)
     # Allow n to be provided as float; coerce to int
     n = _coerce_n_to_int(n, 'n')
     if rate == 0:
@@ -264,6 +495,8 @@ def fv(rate: float, n: int, pmt: float, pv: float = 0, type: int = 0) -> float:
         pv: Present value (default 0)
         type: 0 = payment at end of period (default), 1 = payment at beginning
     """
+    if _any_list(rate, n, pmt, pv, type):
+        return _map_list_args(fv, _array_fv, rate, n, pmt, pv, type)
     n = _coerce_n_to_int(n, 'n')
     if rate == 0:
         return -(pv + pmt * n)
@@ -285,6 +518,8 @@ def pmt(rate: float, n: int, pv: float, fv: float = 0, type: int = 0) -> float:
         fv: Future value (default 0)
         type: 0 = payment at end of period (default), 1 = payment at beginning
     """
+    if _any_list(rate, n, pv, fv, type):
+        return _map_list_args(pmt, _array_pmt, rate, n, pv, fv, type)
     n = _coerce_n_to_int(n, 'n')
     # Guard against zero periods to avoid division by zero
     if n == 0:
@@ -315,6 +550,8 @@ def rate(n: int, pmt: float, pv: float, fv: float = 0, type: int = 0, guess: flo
     Returns:
         Interest rate as decimal (0.1 = 10%)
     """
+    if _any_list(n, pmt, pv, fv, type, guess):
+        return _map_list_args(rate, _array_rate, n, pmt, pv, fv, type, guess)
     # Coerce n to int if provided as float
     n = _coerce_n_to_int(n, 'n')
     if n == 0:
@@ -368,6 +605,8 @@ def nper(rate: float, pmt: float, pv: float, fv: float = 0, type: int = 0) -> fl
     Returns:
         Number of periods (can be fractional)
     """
+    if _any_list(rate, pmt, pv, fv, type):
+        return _map_list_args(nper, _array_nper, rate, pmt, pv, fv, type)
     if rate == 0:
         if pmt == 0:
             return 0
@@ -387,8 +626,24 @@ def nper(rate: float, pmt: float, pv: float, fv: float = 0, type: int = 0) -> fl
     n = -math.log(denominator / numerator) / math.log(1 + rate)
     return n
 
+def _cashflow_vector(cashflows: Any) -> Optional[np.ndarray]:
+    """float64 array of numeric cash flows, or None if any is not an int/float."""
+    if not isinstance(cashflows, (list, tuple)) or not all(type(cf) in (int, float) for cf in cashflows):
+        return None
+    try:
+        return np.array(cashflows, dtype=np.float64)
+    except OverflowError:
+        return None
+
+
 def npv(rate: float, cashflows: List[float]) -> float:
     """Net present value"""
+    flows = _cashflow_vector(cashflows)
+    if flows is not None and type(rate) in (int, float):
+        with np.errstate(all='ignore'):
+            total = float(flows @ (1 + rate) ** -np.arange(1, len(flows) + 1, dtype=np.float64))
+        if math.isfinite(total):
+            return total if len(flows) else 0
     total = 0
     for i, cf in enumerate(cashflows, start=1):
         total += cf / ((1 + rate) ** i)
@@ -408,7 +663,65 @@ def irr(cashflows: List[float], guess: float = 0.1) -> float:
     """
     if not cashflows or len(cashflows) < 2:
         return 0
+    flows = _cashflow_vector(cashflows)
+    if flows is not None and type(guess) in (int, float):
+        exponents = np.arange(1, len(flows) + 1, dtype=np.float64)
+        result, status = _newton_rate(flows, exponents, guess, 1e-7, flat_step=True)
+        # Overflowing factors are left to the loop, which raises as it always has
+        if status != 'overflow':
+            return result
+    return _irr_loop(cashflows, guess)
+
+
+def _newton_rate(flows: np.ndarray, exponents: np.ndarray, guess: float, tolerance: float,
+                 flat_step: bool) -> tuple:
+    """Newton-Raphson for sum(flows * (1 + rate) ** -exponents) = 0, following irr().
+
+    The exponents are built once by the caller; each iteration takes one
+    vector power for the discount factors shared by the NPV and its
+    derivative. On a flat derivative the rate moves 0.01 towards the root
+    (`flat_step`) or the search stops. Returns (rate, status): status is
+    'solved', 'unsolved' (rate is the last estimate) or 'overflow' (an NPV
+    was not finite; rate is the last finite estimate).
+    """
+    weighted = -exponents * flows
+    rate = guess
     
+    with np.errstate(all='ignore'):
+        for iteration in range(100):
+            discount = (1 + rate) ** -exponents
+            npv_val = float(flows @ discount)
+            if not math.isfinite(npv_val):
+                return rate, 'overflow'
+            
+            if abs(npv_val) < tolerance:
+                return rate, 'solved'
+            
+            dnpv = float(weighted @ discount) / (1 + rate)
+            
+            # Handle zero derivative (try a different approach)
+            if abs(dnpv) < 1e-10:
+                if not flat_step:
+                    return rate, 'unsolved'
+                rate = rate + 0.01 if npv_val > 0 else rate - 0.01
+                continue
+            
+            # Newton-Raphson update, kept within the same bounds as the loop
+            new_rate = rate - npv_val / dnpv
+            if not math.isfinite(new_rate):
+                return rate, 'overflow'
+            new_rate = min(max(new_rate, -0.99), 10)
+            
+            if abs(new_rate - rate) < tolerance:
+                return new_rate, 'solved'
+            
+            rate = new_rate
+    
+    return rate, 'unsolved'
+
+
+def _irr_loop(cashflows: List[float], guess: float) -> float:
+    """irr() one cash flow at a time (any values; reference for `_newton_rate()`)."""
     rate = guess
     max_iterations = 100
     tolerance = 1e-7
@@ -450,6 +763,153 @@ def irr(cashflows: List[float], guess: float = 0.1) -> float:
     # Return best estimate if no perfect solution found
     return rate
 
+
+# Bracket the batch solvers bisect in when Newton does not converge (the bounds Newton is kept in)
+_IRR_BRACKET = (-0.99, 10.0)
+
+
+def irr_many(cashflow_lists: List[List[float]], guess: float = 0.1) -> List[Optional[float]]:
+    """
+    irr() for many instruments at once.
+    
+    The cash flows are padded into one matrix and Newton-Raphson runs on
+    all rows together, each row stopping when it converges. Rows that do
+    not converge are bisected between -0.99 and 10 when their NPV changes
+    sign there (None when it does not). Rows with non-numeric values go
+    through irr() one by one.
+    
+    Args:
+        cashflow_lists: One list of cash flows per instrument
+        guess: Initial guess for every rate (default 0.1 = 10%)
+    
+    Returns:
+        One IRR per instrument (0 for fewer than two cash flows)
+    
+    Example:
+        irr_many([[-1000, 300, 400, 500], [-500, 100, 450]])
+    """
+    results = [0] * len(cashflow_lists)
+    rows, vectors = [], []
+    for idx, cashflows in enumerate(cashflow_lists):
+        if not cashflows or len(cashflows) < 2:
+            continue
+        flows = _cashflow_vector(cashflows)
+        if flows is None or type(guess) not in (int, float):
+            results[idx] = irr(cashflows, guess)
+        else:
+            rows.append(idx)
+            vectors.append(flows)
+    if not rows:
+        return results
+    
+    flows = _padded_rows(vectors)
+    exponents = _padded_rows([np.arange(1, len(vector) + 1, dtype=np.float64) for vector in vectors])
+    tolerance = 1e-7
+    rates, solved = _newton_rates(flows, exponents, guess, tolerance, flat_step=True)
+    rates[~solved] = np.nan
+    pending = np.flatnonzero(~solved)
+    if len(pending):
+        rates[pending] = _rate_bisect(flows[pending], exponents[pending], tolerance)
+    
+    for row, value in zip(rows, rates.tolist()):
+        results[row] = None if math.isnan(value) else value
+    return results
+
+
+def _padded_rows(vectors: List[np.ndarray]) -> np.ndarray:
+    """Vectors as the rows of a zero-padded matrix.
+
+    Padding cells of an exponent matrix are 0 (discount factor 1), so the
+    matching zero cash flows add nothing even where other factors overflow.
+    """
+    matrix = np.zeros((len(vectors), max(map(len, vectors))))
+    for row, vector in enumerate(vectors):
+        matrix[row, :len(vector)] = vector
+    return matrix
+
+
+def _newton_rates(flows: np.ndarray, exponents: np.ndarray, guess: float, tolerance: float,
+                  flat_step: bool) -> tuple:
+    """Newton-Raphson on every row of sum(flows * (1 + rate) ** -exponents) = 0 at once.
+
+    Each row follows irr()'s iteration: stop when the NPV or the step is
+    within `tolerance`, keep rates within `_IRR_BRACKET`, and on a flat
+    derivative move 0.01 towards the root (`flat_step`) or give up.
+    Returns (rates, solved): the last estimate per row and whether it converged.
+    """
+    weighted = -exponents * flows
+    rates = np.full(len(flows), float(guess))
+    solved = np.zeros(len(flows), dtype=bool)
+    active = np.arange(len(flows))
+    with np.errstate(all='ignore'):
+        for _ in range(100):
+            if not len(active):
+                break
+            rate = rates[active]
+            discount = (1 + rate)[:, None] ** -exponents[active]
+            value = np.einsum('ij,ij->i', flows[active], discount)
+            slope = np.einsum('ij,ij->i', weighted[active], discount) / (1 + rate)
+            finite = np.isfinite(value)
+            hit = finite & (np.abs(value) < tolerance)
+            flat = finite & ~hit & (np.abs(slope) < 1e-10)
+            new_rate = np.clip(rate - value / slope, *_IRR_BRACKET)
+            step = finite & ~hit & ~flat
+            converged = step & (np.abs(new_rate - rate) < tolerance)
+            rates[active[step]] = new_rate[step]
+            solved[active[hit | converged]] = True
+            stopped = hit | converged | ~finite
+            if flat_step:
+                rates[active[flat]] += np.where(value[flat] > 0, 0.01, -0.01)
+            else:
+                stopped |= flat
+            active = active[~stopped]
+    return rates, solved
+
+
+def _rate_bisect(flows: np.ndarray, exponents: np.ndarray, tolerance: float) -> np.ndarray:
+    """Per-row root of sum(flows * (1 + rate) ** -exponents) by bisection over
+    `_IRR_BRACKET` (NaN where it does not change sign there)."""
+    def npv_rows(rate):
+        return np.einsum('ij,ij->i', flows, (1 + rate)[:, None] ** -exponents)
+    
+    with np.errstate(all='ignore'):
+        # Raise the lower bound where (1 + rate) ** -n would overflow for the row's largest exponent
+        low = np.maximum(_IRR_BRACKET[0], 10.0 ** (-300 / exponents.max(axis=1)) - 1)
+        high = np.full(len(flows), _IRR_BRACKET[1])
+        npv_low, npv_high = npv_rows(low), npv_rows(high)
+        bracketed = np.sign(npv_low) * np.sign(npv_high) < 0
+        for _ in range(200):
+            if not np.any(high - low > tolerance):
+                break
+            mid = (low + high) / 2
+            npv_mid = npv_rows(mid)
+            lower = np.sign(npv_mid) == np.sign(npv_low)
+            low, npv_low = np.where(lower, mid, low), np.where(lower, npv_mid, npv_low)
+            high = np.where(lower, high, mid)
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+
+def _xnpv_years(cashflows: List[float], dates: List[Any]) -> Optional[np.ndarray]:
+    """Years (days / 365) from the first date to each date of xnpv()/xirr()
+    inputs, or None when a date is empty (xnpv() is then 0)."""
+    if len(cashflows) != len(dates):
+        raise ValueError("Cashflows and dates must have same length")
+    if not dates:
+        raise ValueError("Cashflows and dates must have same length and not be empty")
+    parsed = _date_array(dates)
+    if parsed is not None:
+        days = (parsed - parsed[0]).astype(np.int64)
+    else:
+        ordinals = []
+        for value in dates:
+            date = _read_date(value)
+            if date is None:
+                return None
+            ordinals.append(date.toordinal())
+        days = np.array(ordinals) - ordinals[0]
+    return days / 365  # Excel uses 365, not 365.25
+
+
 def xnpv(rate: float, cashflows: List[float], dates: List[str]) -> float:
     """NPV with specific dates (matches Excel XNPV)
     
@@ -460,22 +920,35 @@ def xnpv(rate: float, cashflows: List[float], dates: List[str]) -> float:
     
     Note: Uses 365 days per year (Excel convention), not 365.25
     """
+    flows = _cashflow_vector(cashflows)
+    if flows is None or type(rate) not in (int, float):
+        return _xnpv_loop(rate, cashflows, dates)
+    years = _xnpv_years(cashflows, dates)
+    if years is None:
+        return 0
+    with np.errstate(all='ignore'):
+        total = float(flows @ (1 + rate) ** -years)
+    if math.isfinite(total):
+        return total
+    return _xnpv_loop(rate, cashflows, dates)
+
+
+def _xnpv_loop(rate: float, cashflows: List[float], dates: List[str]) -> float:
+    """xnpv() one cash flow at a time (any values)."""
     if len(cashflows) != len(dates):
         raise ValueError("Cashflows and dates must have same length")
     
     # Normalize and validate dates
     if not dates or len(dates) != len(cashflows):
         raise ValueError("Cashflows and dates must have same length and not be empty")
-    nd0 = normalize_date(dates[0])
-    if not nd0:
+    base_date = _read_date(dates[0])
+    if base_date is None:
         return 0
-    base_date = datetime.fromisoformat(nd0)
     total = 0
     for cf, date_str in zip(cashflows, dates):
-        nd = normalize_date(date_str)
-        if not nd:
+        date = _read_date(date_str)
+        if date is None:
             return 0
-        date = datetime.fromisoformat(nd)
         days = (date - base_date).days
         total += cf / ((1 + rate) ** (days / 365))  # Excel uses 365, not 365.25
     return total
@@ -483,6 +956,11 @@ def xnpv(rate: float, cashflows: List[float], dates: List[str]) -> float:
 def xirr(cashflows: List[float], dates: List[str], guess: float = 0.1) -> float:
     """IRR with specific dates (matches Excel XIRR)
     
+    The dates are converted to year fractions once; Newton-Raphson uses
+    the analytic derivative of XNPV, and when it does not converge (or
+    stalls on the -0.99/10 bounds) the rate is bisected between those
+    bounds if XNPV changes sign there.
+    
     Args:
         cashflows: List of cash flows
         dates: List of dates (ISO format: YYYY-MM-DD)
@@ -490,7 +968,107 @@ def xirr(cashflows: List[float], dates: List[str], guess: float = 0.1) -> float:
     """
     if not cashflows or len(cashflows) < 2:
         return 0
+    flows = _cashflow_vector(cashflows)
+    if flows is None or type(guess) not in (int, float):
+        return _xirr_loop(cashflows, dates, guess)
+    years = _xnpv_years(cashflows, dates)
+    if years is None:
+        # XNPV is 0 at any rate
+        return guess
+    return _xirr_solve(flows, years, guess)
+
+
+def xirr_many(cashflow_lists: List[List[float]], date_lists: List[List[str]], guess: float = 0.1) -> List[Optional[float]]:
+    """
+    xirr() for many instruments at once.
+    
+    The dates of all instruments are parsed together, and Newton-Raphson
+    (then bisection, as in xirr()) runs on one padded matrix of cash
+    flows and year fractions. As in irr_many(), a row whose Newton search
+    does not converge and whose XNPV does not change sign between -0.99
+    and 10 is None, where xirr() returns its last estimate. Rows with
+    non-numeric values go through xirr() one by one.
+    
+    Args:
+        cashflow_lists: One list of cash flows per instrument
+        date_lists: The matching list of dates per instrument
+        guess: Initial guess for every rate (default 0.1 = 10%)
+    
+    Returns:
+        One XIRR per instrument (0 for fewer than two cash flows, None
+        when no rate is found)
+    
+    Example:
+        xirr_many([[-1000, 500, 600], [-500, 550]],
+                  [["2024-01-01", "2024-07-01", "2025-01-01"], ["2024-01-01", "2024-12-31"]])
+    """
+    if len(cashflow_lists) != len(date_lists):
+        raise ValueError("cashflow_lists and date_lists must have the same length")
+    results = [0] * len(cashflow_lists)
+    rows, vectors = [], []
+    for idx, (cashflows, dates) in enumerate(zip(cashflow_lists, date_lists)):
+        if not cashflows or len(cashflows) < 2:
+            continue
+        flows = _cashflow_vector(cashflows)
+        if flows is None or type(guess) not in (int, float) or not _is_list_arg(dates) or len(dates) != len(flows):
+            results[idx] = xirr(cashflows, dates, guess)
+        else:
+            rows.append(idx)
+            vectors.append(flows)
+    if not rows:
+        return results
+    
+    # One date conversion for every instrument (each one's own when any date is unusual)
+    parsed = _date_array([date for idx in rows for date in date_lists[idx]])
+    year_rows, kept = [], []
+    offset = 0
+    for idx, flows in zip(rows, vectors):
+        if parsed is not None:
+            dates = parsed[offset:offset + len(flows)]
+            years = (dates - dates[0]).astype(np.int64) / 365
+        else:
+            years = _xnpv_years(flows, date_lists[idx])
+        offset += len(flows)
+        if years is None:
+            results[idx] = guess
+        else:
+            year_rows.append(years)
+            kept.append((idx, flows))
+    if not kept:
+        return results
     
+    rates = _xirr_rows(_padded_rows([flows for _, flows in kept]), _padded_rows(year_rows), guess)
+    for (idx, _), value in zip(kept, rates):
+        results[idx] = value
+    return results
+
+
+def _xirr_solve(flows: np.ndarray, years: np.ndarray, guess: float) -> float:
+    """XIRR of one instrument: Newton-Raphson, then bisection when Newton finds no root."""
+    tolerance = 1e-6
+    result, status = _newton_rate(flows, years, guess, tolerance, flat_step=False)
+    # Newton held on a bound has not found a root there
+    if status == 'solved' and result not in _IRR_BRACKET:
+        return result
+    root = _rate_bisect(flows[None], years[None], tolerance)[0]
+    return result if math.isnan(root) else float(root)
+
+
+def _xirr_rows(flows: np.ndarray, years: np.ndarray, guess: float) -> List[Optional[float]]:
+    """XIRR of each row of padded cash-flow and year-fraction matrices (None
+    where there is no root)."""
+    tolerance = 1e-6
+    rates, solved = _newton_rates(flows, years, guess, tolerance, flat_step=False)
+    # As in _xirr_solve(): rows held on a bound are bisected too
+    solved &= ~np.isin(rates, _IRR_BRACKET)
+    pending = np.flatnonzero(~solved)
+    if len(pending):
+        rates[pending] = _rate_bisect(flows[pending], years[pending], tolerance)
+    return [None if math.isnan(value) else value for value in rates.tolist()]
+
+
+def _xirr_loop(cashflows: List[float], dates: List[str], guess: float) -> float:
+    """xirr() through xnpv() calls and a finite-difference slope (any values)."""
     rate = guess
     max_iterations = 100
     tolerance = 1e-6
@@ -794,64 +1372,58 @@ def days_between(d1: Any, d2: Any) -> int:
     Robust days between that accepts strings, datetime objects, or None.
     Normalizes inputs using `normalize_date` and returns 0 for invalid/empty values.
     """
+    if _is_list_arg(d1) or _is_list_arg(d2):
+        return _map_list_args(days_between, _array_days_between, d1, d2)
     # Normalize inputs (handles None, datetime, various string formats)
     try:
-        n1 = normalize_date(d1)
+        date1 = _read_date(d1)
+        date2 = _read_date(d2)
     except Exception:
-        n1 = ''
-    try:
-        n2 = normalize_date(d2)
-    except Exception:
-        n2 = ''
-
-    if not n1 or not n2:
         return 0
-
-    try:
-        date1 = datetime.fromisoformat(n1)
-        date2 = datetime.fromisoformat(n2)
-        return abs((date2 - date1).days)
-    except Exception:
+    if date1 is None or date2 is None:
         return 0
+    return abs((date2 - date1).days)
 
 
 
 def months_between(d1: str, d2: str) -> int:
     # Handle empty or invalid date strings gracefully
     try:
-        nd1 = normalize_date(d1)
-        nd2 = normalize_date(d2)
-        if not nd1 or not nd2:
-            return 0
-        date1 = datetime.fromisoformat(nd1)
-        date2 = datetime.fromisoformat(nd2)
+        date1 = _read_date(d1)
+        date2 = _read_date(d2)
     except Exception:
         return 0
+    if date1 is None or date2 is None:
+        return 0
     return abs((date2.year - date1.year) * 12 + date2.month - date1.month)
 
 def years_between(d1: str, d2: str) -> float:
     return days_between(d1, d2) / 365.25
 
 def add_days(d: str, n: int) -> str:
+    if _is_list_arg(d) or _is_list_arg(n):
+        return _map_list_args(add_days, _array_add_days, d, n)
     n = _coerce_n_to_int(n, 'n')
-    nd = normalize_date(d)
-    if not nd:
+    date = _read_date(d)
+    if date is None:
         return ''
-    date = datetime.fromisoformat(nd)
     new_date = date + timedelta(days=n)
-    return new_date.strftime('%Y-%m-%d')
+    if new_date.year < 1000:
+        return new_date.strftime('%Y-%m-%d')
+    return _date_value(new_date.year, new_date.month, new_date.day)
 
 def add_months(d: str, n: int) -> str:
     """Add n months to a date, handling month-end dates properly"""
+    if _is_list_arg(d) or _is_list_arg(n):
+        return _map_list_args(add_months, _array_add_months, d, n)
     n = _coerce_n_to_int(n, 'n')
     # Normalize input and handle empty/invalid gracefully
-    nd = normalize_date(d)
-    if not nd:
-        return ''
     try:
-        date = datetime.fromisoformat(nd)
+        date = _read_date(d)
     except Exception:
         return ''
+    if date is None:
+        return ''
     month = date.month + n
     year = date.year + (month - 1) // 12
     month = (month - 1) % 12 + 1
@@ -865,23 +1437,22 @@ def add_months(d: str, n: int) -> str:
         last_day = (next_month_first - timedelta(days=1)).day
     
     day = min(date.day, last_day)
-    return f"{year:04d}-{month:02d}-{day:02d}"
+    return _date_result(year, month, day)
 
 def add_years(d: str, n: int) -> str:
     """Add n years to a date, handling leap year dates properly"""
     n = _coerce_n_to_int(n, 'n')
-    nd = normalize_date(d)
-    if not nd:
+    date = _read_date(d)
+    if date is None:
         return ''
-    date = datetime.fromisoformat(nd)
     target_year = date.year + n
     
     # Handle Feb 29 -> Feb 28 for non-leap years
     if date.month == 2 and date.day == 29:
         if not (target_year % 4 == 0 and (target_year % 100 != 0 or target_year % 400 == 0)):
-            return f"{target_year:04d}-02-28"
+            return _date_result(target_year, 2, 28)
     
-    return f"{target_year:04d}-{date.month:02d}-{date.day:02d}"
+    return _date_result(target_year, date.month, date.day)
 
 def subtract_days(d: str, n: int) -> str:
     """Subtract n days from a date"""
@@ -899,43 +1470,56 @@ def subtract_years(d: str, n: int) -> str:
     return add_years(d, -n)
 
 def start_of_month(d: str) -> str:
+    if _is_list_arg(d):
+        return _map_list_args(start_of_month, _array_start_of_month, d)
     # Normalize input and handle empty/invalid gracefully
-    nd = normalize_date(d)
-    if not nd:
+    date = _read_date(d)
+    if date is None:
         return ''
-    date = datetime.fromisoformat(nd)
-    return f"{date.year:04d}-{date.month:02d}-01"
+    return _date_value(date.year, date.month, 1)
 
 def end_of_month(d: str) -> str:
-    nd = normalize_date(d)
-    if not nd:
-        return ''
+    if _is_list_arg(d):
+        return _map_list_args(end_of_month, _array_end_of_month, d)
     try:
-        date = datetime.fromisoformat(nd)
+        date = _read_date(d)
     except Exception:
         return ''
+    if date is None:
+        return ''
     if date.month == 12:
         next_month = datetime(date.year + 1, 1, 1)
     else:
         next_month = datetime(date.year, date.month + 1, 1)
     last_day = (next_month - timedelta(days=1)).day
-    return f"{date.year:04d}-{date.month:02d}-{last_day:02d}"
+    return _date_value(date.year, date.month, last_day)
 
 def day_count_fraction(d1: str, d2: str, conv: str = "ACT/360") -> float:
-    """Year fraction using DCC"""
+    """Year fraction using DCC: ACT/360, ACT/365, 30/360, 30E/360, ACT/ACT ISDA or ACT/365L
+
+    ACT/365L divides by 366 when d2's year is a leap year (the rule for
+    non-annual periods); period() with freq 'A' uses 366 only when Feb 29
+    falls within the period.
+    """
+    if _is_list_arg(d1) or _is_list_arg(d2) or _is_list_arg(conv):
+        return _map_list_args(day_count_fraction, _array_day_count_fraction, d1, d2, conv)
     days = days_between(d1, d2)
     if conv == "ACT/360":
         return days / 360
     elif conv == "ACT/365":
         return days / 365
     elif conv == "30/360":
-        nd1 = normalize_date(d1)
-        nd2 = normalize_date(d2)
-        if not nd1 or not nd2:
+        dates = _read_dates(d1, d2)
+        if dates is None:
             return 0
-        date1 = datetime.fromisoformat(nd1)
-        date2 = datetime.fromisoformat(nd2)
+        date1, date2 = dates
         return ((date2.year - date1.year) * 360 + (date2.month - date1.month) * 30 + (date2.day - date1.day)) / 360
+    elif isinstance(conv, str) and conv in _DAY_COUNT_CONVENTIONS:
+        dates = _read_dates(d1, d2)
+        if dates is None:
+            return 0.0
+        date1, date2 = (np.datetime64(date.date(), 'D') for date in dates)
+        return _day_count_vector(date1, date2, conv).item()
     return days / 365.25
 
 def is_leap_year(year: int) -> bool:
@@ -948,174 +1532,966 @@ def days_in_year(year: int) -> int:
 
 def quarter(d: str) -> int:
     """Get quarter from date"""
-    nd = normalize_date(d)
-    if not nd:
-        return 0
+    if _is_list_arg(d):
+        return _map_list_args(quarter, _array_quarter, d)
     try:
-        date = datetime.fromisoformat(nd)
-        return (date.month - 1) // 3 + 1
+        date = _read_date(d)
     except Exception:
         return 0
+    if date is None:
+        return 0
+    return (date.month - 1) // 3 + 1
 
 def day_of_week(d: str) -> int:
     """Day of week (0=Monday, 6=Sunday)"""
-    nd = normalize_date(d)
-    if not nd:
-        return 0
     try:
-        date = datetime.fromisoformat(nd)
-        return date.weekday()
+        date = _read_date(d)
     except Exception:
         return 0
+    if date is None:
+        return 0
+    return date.weekday()
 
 def is_weekend(d: str) -> bool:
     """Check if weekend"""
     return day_of_week(d) >= 5
 
-def business_days(d1: str, d2: str) -> int:
-    """Count business days"""
+def business_days(d1: str, d2: str, calendar: str = None) -> int:
+    """Count business days
+
+    Counts from the earlier date up to (not including) the later one, so
+    the order of d1 and d2 does not matter. Without a calendar only
+    weekends are closed.
+    """
+    if _is_list_arg(d1) or _is_list_arg(d2):
+        return _map_list_args(business_days, _array_business_days, d1, d2, calendar)
     # Normalize inputs and handle empty/invalid values
-    nd1 = normalize_date(d1)
-    nd2 = normalize_date(d2)
-    if not nd1 or not nd2:
+    dates = _read_dates(d1, d2)
+    if dates is None:
         return 0
-    date1 = datetime.fromisoformat(nd1)
-    date2 = datetime.fromisoformat(nd2)
-    days = abs((date2 - date1).days)
-    weeks = days // 7
-    remaining = days % 7
-    weekdays = weeks * 5
-    for i in range(remaining):
-        if (date1 + timedelta(days=i)).weekday() < 5:
-            weekdays += 1
-    return weekdays
+    date1, date2 = dates
+    first, last = sorted((date1.toordinal(), date2.toordinal()))
+    return int(_get_calendar(calendar).count(first, last))
 
-# ============= Schedule Functions =============
+# ============= Array Date Functions =============
+#
+# add_days, add_months, start_of_month, end_of_month, days_between,
+# day_count_fraction, quarter and business_days also accept lists, e.g.
+# add_days(collect_by_instrument("maturitydate"), 30). List arguments must
+# have the same length, scalar arguments apply to every element, and the
+# result is a list. When every date is a valid YYYY-MM-DD date (after
+# normalize_date) and every count an int, the whole list is computed in one
+# numpy.datetime64 operation; otherwise each element goes through the
+# scalar function, which keeps its usual '' / 0 results and errors.
 
-def period(start: str, end: str, freq: str = "M", convention: str = "ACT/360") -> Dict[str, Any]:
-    """
-    Creates a period definition for schedule generation.
-    
-    Args:
-        start: Start date (YYYY-MM-DD)
-        end: End date (YYYY-MM-DD)
-        freq: Frequency - M (monthly), Q (quarterly), A (annual), D (daily), W (weekly)
-        convention: Day count convention - ACT/360, ACT/365, 30/360
-    
-    Returns:
-        Period definition object with dates list
-    """
-    # Support passing arrays of start/end dates to create per-item schedules implicitly.
-    if isinstance(start, list) and isinstance(end, list):
-        if len(start) != len(end):
-            raise ValueError("start and end arrays must have the same length")
-        return {
-            "type": "period_array",
-            "start_dates": start,
-            "end_dates": end,
-            "freq": freq,
-            "convention": convention,
-        }
+_MIN_DATE64 = np.datetime64('0001-01-01')
+_MAX_DATE64 = np.datetime64('9999-12-31')
 
-    # If either date is empty or invalid, return an empty period (no dates)
-    if not start or not end:
-        return {
-            "type": "period",
-            "start": start,
-            "end": end,
-            "freq": freq,
-            "convention": convention,
-            "dates": []
-        }
-    # Normalize start/end and guard invalid values
-    nd_start = normalize_date(start)
-    nd_end = normalize_date(end)
-    if not nd_start or not nd_end:
-        return {
-            "type": "period",
-            "start": start,
-            "end": end,
-            "freq": freq,
-            "convention": convention,
-            "dates": []
-        }
+# add_days() formats results before year 1000 with strftime, which does not pad the year
+_ADD_DAYS_MIN_DATE64 = np.datetime64('1000-01-01')
+
+# Largest day/month count the NumPy path takes; larger ones overflow in the scalar path
+_MAX_ARRAY_DATE_COUNT = 10 ** 7
+
+
+def _is_list_arg(value: Any) -> bool:
+    return isinstance(value, (list, tuple))
+
+
+def _map_list_args(scalar, vector, *args) -> list:
+    """Apply a function element-wise over its list arguments.
+
+    `vector` gets the arguments as passed and returns the result list, or
+    None when NumPy cannot reproduce the scalar results exactly.
+    """
+    lengths = sorted({len(arg) for arg in args if _is_list_arg(arg)})
+    if len(lengths) > 1:
+        raise ValueError(f"{scalar.__name__}: list arguments must have the same length, got {lengths}")
+    n = lengths[0]
+    if n:
+        result = vector(*args)
+        if result is not None:
+            return result
+    columns = [arg if _is_list_arg(arg) else [arg] * n for arg in args]
+    return [scalar(*values) for values in zip(*columns)]
+
+
+def _date_array(value: Any) -> Optional[np.ndarray]:
+    """datetime64[D] values of a date argument (a list or a single date), or
+    None unless every date is a valid YYYY-MM-DD date in years 1-9999."""
+    texts = [normalize_date(v) for v in value] if _is_list_arg(value) else [normalize_date(value)]
+    if not all(map(_is_iso_date, texts)):
+        return None
     try:
-        start_date = datetime.fromisoformat(nd_start)
-        end_date = datetime.fromisoformat(nd_end)
-    except Exception:
-        return {
-            "type": "period",
-            "start": start,
-            "end": end,
-            "freq": freq,
-            "convention": convention,
-            "dates": []
-        }
-    
-    dates = []
-    current = start_date
-    
-    while current <= end_date:
-        dates.append(current.strftime("%Y-%m-%d"))
-        
-        if freq == "M":
-            # Monthly - advance to same day next month
-            month = current.month + 1
-            year = current.year
-            if month > 12:
-                month = 1
-                year += 1
-            # Handle month-end dates
-            try:
-                current = current.replace(year=year, month=month)
-            except ValueError:
-                # If day doesn't exist in target month, go to last day
-                if month == 12:
-                    next_month = current.replace(year=year+1, month=1, day=1)
-                else:
-                    next_month = current.replace(year=year, month=month+1, day=1)
-                current = next_month - timedelta(days=1)
-        elif freq == "Q":
-            # Quarterly
-            month = current.month + 3
-            year = current.year
-            while month > 12:
-                month -= 12
-                year += 1
-            try:
-                current = current.replace(year=year, month=month)
-            except ValueError:
-                if month == 12:
-                    next_month = current.replace(year=year+1, month=1, day=1)
-                else:
-                    next_month = current.replace(year=year, month=month+1, day=1)
-                current = next_month - timedelta(days=1)
-        elif freq == "A":
-            # Annual
-            current = current.replace(year=current.year + 1)
-        elif freq == "W":
-            # Weekly
-            current = current + timedelta(weeks=1)
-        elif freq == "D":
-            # Daily
-            current = current + timedelta(days=1)
-        else:
-            # Default to monthly
-            month = current.month + 1
-            year = current.year
-            if month > 12:
-                month = 1
-                year += 1
-            try:
-                current = current.replace(year=year, month=month)
-            except ValueError:
-                if month == 12:
-                    next_month = current.replace(year=year+1, month=1, day=1)
-                else:
-                    next_month = current.replace(year=year, month=month+1, day=1)
-                current = next_month - timedelta(days=1)
+        dates = np.array(texts, dtype='datetime64[D]')
+    except ValueError:
+        return None
+    if dates.min() < _MIN_DATE64:
+        return None
+    return dates if _is_list_arg(value) else dates[0]
+
+
+def _count_array(value: Any) -> Optional[np.ndarray]:
+    """int64 values of a day/month count argument, or None unless every value is an int."""
+    values = value if _is_list_arg(value) else [value]
+    if not all(type(v) is int and abs(v) <= _MAX_ARRAY_DATE_COUNT for v in values):
+        return None
+    counts = np.array(values, dtype=np.int64)
+    return counts if _is_list_arg(value) else counts[0]
+
+
+def _date_strings(dates: np.ndarray, low: np.datetime64 = _MIN_DATE64) -> Optional[List[str]]:
+    """YYYY-MM-DD strings of a date result, or None if any date is outside [low, 9999-12-31]."""
+    if dates.min() < low or dates.max() > _MAX_DATE64:
+        return None
+    return np.datetime_as_string(dates, unit='D').tolist()
+
+
+def _array_add_days(d, n):
+    dates, days = _date_array(d), _count_array(n)
+    if dates is None or days is None:
+        return None
+    return _date_strings(dates + days, _ADD_DAYS_MIN_DATE64)
+
+
+def _array_add_months(d, n):
+    dates, count = _date_array(d), _count_array(n)
+    if dates is None or count is None:
+        return None
+    months = dates.astype('datetime64[M]')
+    target = months + count
+    first = target.astype('datetime64[D]')
+    # Clamp the day of month to the length of the target month
+    last_offset = (target + 1).astype('datetime64[D]') - first - 1
+    return _date_strings(first + np.minimum(dates - months.astype('datetime64[D]'), last_offset))
+
+
+def _array_start_of_month(d):
+    dates = _date_array(d)
+    if dates is None:
+        return None
+    return _date_strings(dates.astype('datetime64[M]').astype('datetime64[D]'))
+
+
+def _array_end_of_month(d):
+    dates = _date_array(d)
+    if dates is None:
+        return None
+    months = dates.astype('datetime64[M]')
+    # end_of_month() of a December 9999 date is '' (its next month does not exist)
+    if months.max() >= _MAX_DATE64.astype('datetime64[M]'):
+        return None
+    return _date_strings((months + 1).astype('datetime64[D]') - 1)
+
+
+def _array_days_between(d1, d2):
+    date1, date2 = _date_array(d1), _date_array(d2)
+    if date1 is None or date2 is None:
+        return None
+    return np.abs((date2 - date1).astype(np.int64)).tolist()
+
+
+def _array_quarter(d):
+    dates = _date_array(d)
+    if dates is None:
+        return None
+    return (dates.astype('datetime64[M]').astype(np.int64) % 12 // 3 + 1).tolist()
+
+
+def _array_business_days(d1, d2, calendar=None):
+    date1, date2 = _date_array(d1), _date_array(d2)
+    if date1 is None or date2 is None or _is_list_arg(calendar):
+        return None
+    first, last = _ordinal_array(date1), _ordinal_array(date2)
+    return _get_calendar(calendar).count(np.minimum(first, last), np.maximum(first, last)).tolist()
+
+# ============= Array Financial Functions =============
+#
+# pv, fv, pmt, rate and nper also accept lists, e.g.
+# pmt(collect_all("rate"), collect_all("term"), collect_all("balance")).
+# As with the array date functions, list arguments must have the same
+# length, scalar arguments apply to every element, and the result is a list.
+# When every argument is an int or float the whole list is computed with
+# NumPy, and rate() runs its Newton-Raphson iteration on all elements at
+# once. Otherwise, or where NumPy meets an overflow or a division by zero,
+# each element goes through the scalar function, which keeps its usual
+# results and errors.
+
+def _any_list(*args) -> bool:
+    return any(map(_is_list_arg, args))
+
+
+def _number_array(value: Any) -> Optional[np.ndarray]:
+    """float64 values of a numeric argument (a list or a single number), or None
+    unless every value is an int or float."""
+    values = value if _is_list_arg(value) else [value]
+    if not all(type(v) in (int, float) for v in values):
+        return None
+    try:
+        numbers = np.array(values, dtype=np.float64)
+    except OverflowError:
+        return None
+    return numbers if _is_list_arg(value) else numbers[0]
+
+
+def _period_array(value: Any) -> Optional[np.ndarray]:
+    """Periods of an `n` argument, rounded as _coerce_n_to_int() does, or None
+    unless every value is a finite int or float."""
+    numbers = _number_array(value)
+    if numbers is None or not np.isfinite(numbers).all():
+        return None
+    return np.round(numbers)
+
+
+def _finite(*arrays) -> bool:
+    return all(np.isfinite(a).all() for a in arrays)
+
+
+def _financial_arrays(n, *args):
+    """Periods and float64 values of a financial function's arguments, or None
+    if any of them cannot take the NumPy path."""
+    arrays = [_period_array(n)] + [_number_array(arg) for arg in args]
+    return None if any(a is None for a in arrays) else arrays
+
+
+def _array_pv(rate, n, pmt, fv=0, type=0):
+    arrays = _financial_arrays(n, rate, pmt, fv, type)
+    if arrays is None:
+        return None
+    n, rate, pmt, fv, type = arrays
+    with np.errstate(all='ignore'):
+        discount, growth = (1 + rate) ** (-n), (1 + rate) ** n
+        pv_annuity = pmt * ((1 - discount) / rate)
+        pv_annuity = np.where(type == 1, pv_annuity * (1 + rate), pv_annuity)
+        result = np.where(rate == 0, -(fv + pmt * n), -(pv_annuity + fv / growth))
+    if not _finite(discount, growth, result):
+        return None
+    return result.tolist()
+
+
+def _array_fv(rate, n, pmt, pv=0, type=0):
+    arrays = _financial_arrays(n, rate, pmt, pv, type)
+    if arrays is None:
+        return None
+    n, rate, pmt, pv, type = arrays
+    with np.errstate(all='ignore'):
+        growth = (1 + rate) ** n
+        fv_annuity = pmt * ((growth - 1) / rate)
+        fv_annuity = np.where(type == 1, fv_annuity * (1 + rate), fv_annuity)
+        result = np.where(rate == 0, -(pv + pmt * n), -(-pv * growth + fv_annuity))
+    if not _finite(growth, result):
+        return None
+    return result.tolist()
+
+
+def _array_pmt(rate, n, pv, fv=0, type=0):
+    arrays = _financial_arrays(n, rate, pv, fv, type)
+    if arrays is None:
+        return None
+    n, rate, pv, fv, type = arrays
+    with np.errstate(all='ignore'):
+        growth = (1 + rate) ** n
+        payment = -(rate * (fv + pv * growth)) / (growth - 1)
+        payment = np.where(type == 1, payment / (1 + rate), payment)
+        result = np.where(n == 0, 0.0, np.where(rate == 0, -(pv + fv) / n, payment))
+    if not _finite(growth, result):
+        return None
+    return result.tolist()
+
+
+def _array_rate(n, pmt, pv, fv=0, type=0, guess=0.1):
+    arrays = _financial_arrays(n, pmt, pv, fv, type, guess)
+    if arrays is None:
+        return None
+    n, pmt, pv, fv, type, guess = np.broadcast_arrays(*arrays)
+    with np.errstate(all='ignore'):
+        pmt_adj = np.where(type == 1, pmt * 2, pmt)
+    result = guess.astype(np.float64)
+    result[n == 0] = 0.0
+    active = np.flatnonzero(n != 0)
+    tolerance = 1e-6
+    
+    # rate()'s iteration on every element still running; each one leaves the
+    # active set where rate() would have returned
+    with np.errstate(all='ignore'):
+        for _ in range(100):
+            if not len(active):
+                break
+            rate_est, k, p = result[active], n[active], pmt_adj[active]
+            
+            # Linear approximation when the rate is near zero
+            near_zero = np.abs(rate_est) < 1e-10
+            linear = np.where(np.abs(p) < 1e-10, 0.0, -(pv[active] + fv[active]) / (p * k))
+            
+            factor = (1 + rate_est) ** k
+            npv_val = pv[active] + p * (factor - 1) / rate_est + fv[active] / factor
+            square = rate_est ** 2
+            denominator = square * factor
+            derivative = p * (k * factor * rate_est - (factor - 1)) / denominator
+            # Where rate() would raise (a power overflowing or a division by
+            # zero) leave the elements to it; NaNs carry on as in rate()
+            overflow = np.isfinite(rate_est) & (np.isinf(factor) | np.isinf(square))
+            if (~near_zero & (overflow | (factor == 0) | (denominator == 0))).any():
+                return None
+            
+            flat = ~near_zero & (np.abs(derivative) < 1e-10)
+            new_rate = rate_est - npv_val / derivative
+            step = ~near_zero & ~flat
+            converged = step & (np.abs(new_rate - rate_est) < tolerance)
+            result[active[near_zero]] = linear[near_zero]
+            result[active[step]] = new_rate[step]
+            active = active[step & ~converged]
+    return result.tolist()
+
+
+def _array_nper(rate, pmt, pv, fv=0, type=0):
+    arrays = [_number_array(arg) for arg in (rate, pmt, pv, fv, type)]
+    if any(a is None for a in arrays):
+        return None
+    rate, pmt, pv, fv, type = np.broadcast_arrays(*arrays)
+    with np.errstate(all='ignore'):
+        pmt_adj = np.where(type == 1, pmt * (1 + rate), pmt)
+        numerator = pmt_adj / rate + pv
+        denominator = pmt_adj / rate + fv
+        ratio_log, rate_log = np.log(denominator / numerator), np.log(1 + rate)
+        periods = np.where((denominator <= 0) | (numerator <= 0), 0.0, -ratio_log / rate_log)
+        zero_rate = np.where(pmt == 0, 0.0, -(pv + fv) / pmt)
+        result = np.where(rate == 0, zero_rate, periods)
+    # nper() raises where either logarithm is undefined or log(1 + rate) is 0
+    logged = (rate != 0) & (denominator > 0) & (numerator > 0)
+    if not _finite(result, ratio_log[logged], rate_log[logged]) or (rate_log[logged] == 0).any():
+        return None
+    return result.tolist()
+
+
+# ============= Day Count Conventions =============
+#
+# Year fractions for whole date vectors in one NumPy pass. Each convention
+# maps start and end dates (datetime64[D] arrays, or scalars, that
+# broadcast) to float64 fractions; day_count_fraction(), its list form and
+# period() share them. The ACT conventions count absolute days, as
+# days_between() does; the 30/360 family is signed. Any other convention
+# name uses ACT/365.25. ACT/365L follows the ISDA rule for non-annual
+# periods everywhere except annual (freq 'A') period() grids, which use
+# the annual rule.
+
+# Day count convention name -> vector implementation
+_DAY_COUNT_CONVENTIONS = {}
+
+
+def _day_count(name: str):
+    """Register the vector implementation of a day count convention."""
+    def register(func):
+        _DAY_COUNT_CONVENTIONS[name] = func
+        return func
+    return register
+
+
+def _actual_days(d1: np.ndarray, d2: np.ndarray) -> np.ndarray:
+    return np.abs((d2 - d1).astype(np.int64))
+
+
+def _date_fields(dates: np.ndarray) -> tuple:
+    """(year, month, day) arrays of datetime64[D] dates."""
+    months = dates.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    return (years.astype(np.int64) + 1970, (months - years).astype(np.int64) + 1,
+            (dates - months).astype(np.int64) + 1)
+
+
+def _leap_years(years: np.ndarray) -> np.ndarray:
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def _thirty_360(d1: np.ndarray, d2: np.ndarray, cap_days: bool) -> np.ndarray:
+    (year1, month1, day1), (year2, month2, day2) = _date_fields(d1), _date_fields(d2)
+    if cap_days:
+        day1, day2 = np.minimum(day1, 30), np.minimum(day2, 30)
+    return ((year2 - year1) * 360 + (month2 - month1) * 30 + (day2 - day1)) / 360
+
+
+@_day_count('ACT/360')
+def _dcf_act_360(d1, d2):
+    return _actual_days(d1, d2) / 360
+
+
+@_day_count('ACT/365')
+def _dcf_act_365(d1, d2):
+    return _actual_days(d1, d2) / 365
+
+
+@_day_count('30/360')
+def _dcf_30_360(d1, d2):
+    return _thirty_360(d1, d2, False)
+
+
+@_day_count('30E/360')
+def _dcf_30e_360(d1, d2):
+    # Eurobond basis: a 31st counts as the 30th on both ends
+    return _thirty_360(d1, d2, True)
+
+
+@_day_count('ACT/ACT ISDA')
+def _dcf_act_act_isda(d1, d2):
+    # Days in leap years over 366 plus days in other years over 365
+    start, end = np.minimum(d1, d2), np.maximum(d1, d2)
+    year1 = start.astype('datetime64[Y]')
+    year2 = end.astype('datetime64[Y]')
+    basis1 = np.where(_leap_years(year1.astype(np.int64) + 1970), 366, 365)
+    basis2 = np.where(_leap_years(year2.astype(np.int64) + 1970), 366, 365)
+    head = ((year1 + 1).astype('datetime64[D]') - start).astype(np.int64) / basis1
+    tail = (end - year2.astype('datetime64[D]')).astype(np.int64) / basis2
+    spanning = head + (year2 - year1).astype(np.int64) - 1 + tail
+    return np.where(year1 == year2, _actual_days(start, end) / basis1, spanning)
+
+
+@_day_count('ACT/365L')
+def _dcf_act_365l(d1, d2):
+    # Non-annual rule: 366 when the later date falls in a leap year
+    end_years = np.maximum(d1, d2).astype('datetime64[Y]').astype(np.int64) + 1970
+    return _actual_days(d1, d2) / np.where(_leap_years(end_years), 366, 365)
+
+
+def _dcf_act_365l_annual(d1, d2):
+    # Annual rule: 366 when Feb 29 falls in (start, end]; an annual period
+    # touches at most the start and end years
+    start, end = np.minimum(d1, d2), np.maximum(d1, d2)
+    contains_feb29 = np.zeros(np.shape(start), dtype=bool)
+    for years in (start.astype('datetime64[Y]'), end.astype('datetime64[Y]')):
+        feb29 = years.astype('datetime64[D]') + 59
+        contains_feb29 |= _leap_years(years.astype(np.int64) + 1970) & (start < feb29) & (feb29 <= end)
+    return _actual_days(start, end) / np.where(contains_feb29, 366, 365)
+
+
+# Conventions whose rule differs for annual periods; period() uses these when freq is 'A'
+_ANNUAL_DAY_COUNT_CONVENTIONS = {'ACT/365L': _dcf_act_365l_annual}
+
+
+def _day_count_vector(d1: Any, d2: Any, convention: Any) -> np.ndarray:
+    """Year fractions from `d1` to `d2` (datetime64[D]) under `convention`."""
+    kernel = _DAY_COUNT_CONVENTIONS.get(convention) if isinstance(convention, str) else None
+    if kernel is None:
+        return _actual_days(d1, d2) / 365.25
+    return kernel(d1, d2)
+
+
+def _array_day_count_fraction(d1, d2, conv):
+    if _is_list_arg(conv):
+        return None
+    date1, date2 = _date_array(d1), _date_array(d2)
+    if date1 is None or date2 is None:
+        return None
+    return _day_count_vector(date1, date2, conv).tolist()
+
+
+def _dates_dcf(dates: List[Any], convention: Any, freq: Any = None) -> tuple:
+    """Per-row DCF of schedule dates: each date's fraction to the next one,
+    the last row repeating the one before (1/12 for a single date)."""
+    parsed = _date_array(dates) if len(dates) > 1 else None
+    if parsed is not None:
+        return _period_dcf(parsed, convention, freq)
+    n_dates = len(dates)
+    dcf_values = [day_count_fraction(dates[idx], dates[idx + 1], convention) for idx in range(n_dates - 1)]
+    if n_dates > 1:
+        # Last period - use previous DCF
+        dcf_values.append(day_count_fraction(dates[-2], dates[-1], convention))
+    else:
+        dcf_values.append(1/12)  # Default monthly
+    return tuple(dcf_values)
+
+# ============= Business-Day Calendars =============
+#
+# holiday_calendar() registers a named calendar: a list of holidays (for
+# example the dates of a reference event) plus the weekend days. Each
+# calendar keeps a business-day bitmap over a window of dates and the
+# prefix counts of that bitmap, so business_days(), add_business_days(),
+# is_business_day() and roll_date() are array lookups instead of day-by-day
+# walks. The window is rebuilt wider whenever a date falls outside it.
+# Functions taking `calendar` use weekends only when it is None.
+
+# Weekday numbers (0=Monday, as day_of_week()) that are not business days by default
+_WEEKEND_DAYS = (5, 6)
+
+# Days added on both sides of the requested dates when a bitmap window is (re)built
+_CALENDAR_WINDOW_MARGIN = 3660
+
+_MIN_ORDINAL = 1  # 0001-01-01
+_MAX_ORDINAL = datetime(9999, 12, 31).toordinal()
+_UNIX_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+# roll_date() conventions ('none' leaves dates unadjusted)
+_ROLL_CONVENTIONS = ('none', 'following', 'modified_following', 'preceding', 'modified_preceding')
+
+# DSL functions whose results depend on the registered calendars
+_CALENDAR_FUNCTIONS = frozenset({'business_days', 'add_business_days', 'is_business_day', 'roll_date'})
+
+
+class _HolidayCalendar:
+    """Business-day bitmap and prefix counts of one calendar.
+
+    Dates are day ordinals (`datetime.toordinal()`); the lookups take an
+    int or an int64 array and return NumPy values of the same shape.
+    """
+    __slots__ = ('name', 'holidays', 'weekend', 'token', '_busdaycal', '_origin', '_open', '_prefix', '_open_days')
+
+    def __init__(self, name: str, holidays: tuple, weekend: tuple):
+        self.name = name
+        self.holidays = holidays
+        self.weekend = weekend
+        self.token = hashlib.blake2b(repr((holidays, weekend)).encode('utf-8'), digest_size=16).hexdigest()
+        weekmask = [0 if day in weekend else 1 for day in range(7)]
+        self._busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=np.array(holidays, dtype='datetime64[D]'))
+        self._origin = _MIN_ORDINAL  # ordinal of the first window day
+        self._open = None            # business day or not, per window day
+        self._prefix = None          # business days before each window day (plus one past the end)
+        self._open_days = None       # window offsets of the business days, in order
+
+    def _cover(self, first: int, last: int) -> None:
+        """Make the bitmap window include ordinals first..last."""
+        if self._open is not None:
+            end = self._origin + len(self._open) - 1
+            if self._origin <= first and last <= end:
+                return
+            first, last = min(first, self._origin), max(last, end)
+        first = max(_MIN_ORDINAL, first - _CALENDAR_WINDOW_MARGIN)
+        last = min(_MAX_ORDINAL, last + _CALENDAR_WINDOW_MARGIN)
+        days = (np.arange(first, last + 1) - _UNIX_EPOCH_ORDINAL).astype('datetime64[D]')
+        is_open = np.is_busday(days, busdaycal=self._busdaycal)
+        self._origin = first
+        self._open = is_open
+        self._prefix = np.concatenate(([0], np.cumsum(is_open)))
+        self._open_days = np.flatnonzero(is_open)
+
+    def _offsets(self, ordinals: Any, spread: int = 0) -> np.ndarray:
+        """Window offsets of `ordinals`, once the window covers them (and `spread` days around them)."""
+        ordinals = np.asarray(ordinals)
+        self._cover(int(ordinals.min()) - spread, int(ordinals.max()) + spread)
+        return ordinals - self._origin
+
+    def _business_day(self, ranks: np.ndarray, origin: int, ordinals: Any, spread: int) -> np.ndarray:
+        """Ordinals of the business days with the given ranks, counted from the
+        window start `origin` they were computed for; widens the window as needed."""
+        while True:
+            # Widening only moves the window start back: re-base the ranks on it
+            current = ranks + self._prefix[origin - self._origin]
+            if current.min() >= 0 and current.max() < len(self._open_days):
+                return self._open_days[current] + self._origin
+            if self._origin == _MIN_ORDINAL and self._origin + len(self._open) - 1 == _MAX_ORDINAL:
+                raise ValueError("business day outside the supported date range (years 1-9999)")
+            spread = 2 * max(spread, len(self._open))
+            self._offsets(ordinals, spread)
+
+    def is_open(self, ordinals: Any) -> np.ndarray:
+        offsets = self._offsets(ordinals)
+        return self._open[offsets]
+
+    def count(self, first: Any, last: Any) -> np.ndarray:
+        """Business days from `first` up to (not including) `last`, for first <= last."""
+        offsets = self._offsets(np.stack(np.broadcast_arrays(first, last)))
+        return self._prefix[offsets[1]] - self._prefix[offsets[0]]
+
+    def shift(self, ordinals: Any, n: Any) -> np.ndarray:
+        """The n-th business day after each date (before it for n < 0; for n == 0
+        the date itself if it is a business day, else the next one)."""
+        n = np.asarray(n)
+        spread = int(np.abs(n).max()) * 2 + 7
+        offsets = self._offsets(ordinals, spread)
+        before = self._prefix[offsets]
+        ranks = np.where(n > 0, before + self._open[offsets] + n - 1, before + n)
+        return self._business_day(ranks, self._origin, ordinals, spread)
+
+    def roll(self, ordinals: Any, convention: str) -> np.ndarray:
+        """Dates moved to a business day under one of `_ROLL_CONVENTIONS`."""
+        ordinals = np.asarray(ordinals)
+        if convention == 'none':
+            return ordinals
+        offsets = self._offsets(ordinals, 7)
+        origin, before, is_open = self._origin, self._prefix[offsets], self._open[offsets]
+        following = self._business_day(before, origin, ordinals, 7)
+        preceding = self._business_day(np.where(is_open, before, before - 1), origin, ordinals, 7)
+        if convention == 'following':
+            return following
+        if convention == 'preceding':
+            return preceding
+        month = _ordinal_months(ordinals)
+        if convention == 'modified_following':
+            return np.where(_ordinal_months(following) == month, following, preceding)
+        return np.where(_ordinal_months(preceding) == month, preceding, following)
+
+
+def _ordinal_months(ordinals: Any) -> np.ndarray:
+    return (np.asarray(ordinals) - _UNIX_EPOCH_ORDINAL).astype('datetime64[D]').astype('datetime64[M]')
+
+
+def _ordinal_date(ordinal: Any) -> DateValue:
+    date = datetime.fromordinal(int(ordinal))
+    return _date_value(date.year, date.month, date.day)
+
+
+def _ordinal_array(dates: np.ndarray) -> np.ndarray:
+    return dates.astype(np.int64) + _UNIX_EPOCH_ORDINAL
+
+
+def _ordinal_strings(ordinals: np.ndarray) -> List[str]:
+    return np.datetime_as_string((ordinals - _UNIX_EPOCH_ORDINAL).astype('datetime64[D]'), unit='D').tolist()
+
+
+_WEEKEND_CALENDAR = _HolidayCalendar('', (), _WEEKEND_DAYS)
+
+_holiday_calendars: Dict[str, _HolidayCalendar] = {}
+
+
+def _get_calendar(calendar: Optional[str]) -> _HolidayCalendar:
+    """The registered calendar called `calendar` (weekends only for None)."""
+    if calendar is None:
+        return _WEEKEND_CALENDAR
+    try:
+        return _holiday_calendars[calendar]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown holiday calendar {calendar!r}; register it with holiday_calendar()") from None
+
+
+def _roll_convention(convention: Any) -> str:
+    name = str(convention).strip().lower().replace('-', '_').replace(' ', '_')
+    if name not in _ROLL_CONVENTIONS:
+        raise ValueError(f"Unknown roll convention {convention!r}; expected one of {', '.join(_ROLL_CONVENTIONS)}")
+    return name
+
+
+def holiday_calendar(name: str, holidays: List[Any], weekend: List[int] = None) -> str:
+    """
+    Register a named business-day calendar.
     
+    business_days, add_business_days, is_business_day, roll_date and
+    period(..., calendar=...) refer to it by name.
+    
+    Args:
+        name: Name the other functions use for the calendar (registering it again replaces it)
+        holidays: Holiday dates, e.g. the dates of a reference event; empty values are skipped
+        weekend: Weekday numbers that are never business days (0=Monday ... 6=Sunday, default [5, 6])
+    
+    Returns:
+        The calendar name
+    
+    Example:
+        holiday_calendar("US", collect_all(HOLIDAYS.holiday_date))
+        add_business_days("2026-07-02", 1, "US")  -> "2026-07-06"
+    """
+    if not isinstance(name, str) or not name:
+        raise ValueError("holiday_calendar requires a calendar name")
+    if not isinstance(holidays, (list, tuple)):
+        raise ValueError("holiday_calendar requires a list of holiday dates")
+    if weekend is None:
+        weekend = _WEEKEND_DAYS
+    if (not isinstance(weekend, (list, tuple)) or len(set(weekend)) >= 7
+            or not all(type(day) is int and 0 <= day <= 6 for day in weekend)):
+        raise ValueError("weekend must list weekday numbers 0-6 (0=Monday) and leave at least one business day")
+    days = set()
+    for value in holidays:
+        try:
+            date = _read_date(value)
+        except ValueError:
+            raise ValueError(f"Invalid holiday date {value!r}") from None
+        if date is not None:
+            days.add(date.date().isoformat())
+    holidays, weekend = tuple(sorted(days)), tuple(sorted(set(weekend)))
+    current = _holiday_calendars.get(name)
+    if current is None or current.holidays != holidays or current.weekend != weekend:
+        _holiday_calendars[name] = _HolidayCalendar(name, holidays, weekend)
+    return name
+
+
+def _holiday_calendar_specs() -> Dict[str, tuple]:
+    """The registered calendars as plain data: name -> (holidays, weekend)."""
+    return {name: (cal.holidays, cal.weekend) for name, cal in _holiday_calendars.items()}
+
+
+def _install_holiday_calendars(specs: Dict[str, tuple]) -> None:
+    """Register calendars captured by `_holiday_calendar_specs()` (in a worker process)."""
+    for name, (holidays, weekend) in specs.items():
+        current = _holiday_calendars.get(name)
+        if current is None or current.holidays != holidays or current.weekend != weekend:
+            _holiday_calendars[name] = _HolidayCalendar(name, holidays, weekend)
+
+
+def _holiday_calendars_token(names: Optional[frozenset]) -> tuple:
+    """Schedule cache key part for the calendars column expressions can read."""
+    if names is not None and not names & _CALENDAR_FUNCTIONS:
+        return ()
+    return tuple(sorted((name, cal.token) for name, cal in _holiday_calendars.items()))
+
+
+def is_business_day(d: str, calendar: str = None) -> bool:
+    """Whether a date is a business day: not a weekend day or a holiday of `calendar`"""
+    if _is_list_arg(d):
+        return _map_list_args(is_business_day, _array_is_business_day, d, calendar)
+    cal = _get_calendar(calendar)
+    date = _read_date(d)
+    if date is None:
+        return False
+    return bool(cal.is_open(date.toordinal()))
+
+
+def add_business_days(d: str, n: int, calendar: str = None) -> str:
+    """
+    Move a date by n business days of `calendar` (weekends only by default).
+    
+    n > 0 gives the n-th business day after d and n < 0 the n-th one
+    before it; n == 0 rolls d forward to a business day.
+    
+    Example:
+        add_business_days("2026-01-02", 1)  -> "2026-01-05"
+    """
+    if _is_list_arg(d) or _is_list_arg(n):
+        return _map_list_args(add_business_days, _array_add_business_days, d, n, calendar)
+    n = _coerce_n_to_int(n, 'n')
+    cal = _get_calendar(calendar)
+    date = _read_date(d)
+    if date is None:
+        return ''
+    return _ordinal_date(cal.shift(date.toordinal(), n))
+
+
+def roll_date(d: str, convention: str = "following", calendar: str = None) -> str:
+    """
+    Adjust a date that is not a business day.
+    
+    Args:
+        d: Date to adjust
+        convention: following, modified_following (following unless that
+                    changes the month, then preceding), preceding,
+                    modified_preceding or none
+        calendar: Name of a holiday_calendar() (weekends only by default)
+    """
+    if _is_list_arg(d):
+        return _map_list_args(roll_date, _array_roll_date, d, convention, calendar)
+    convention = _roll_convention(convention)
+    cal = _get_calendar(calendar)
+    date = _read_date(d)
+    if date is None:
+        return ''
+    return _ordinal_date(cal.roll(date.toordinal(), convention))
+
+
+def _array_is_business_day(d, calendar):
+    dates = _date_array(d)
+    if dates is None or _is_list_arg(calendar):
+        return None
+    return _get_calendar(calendar).is_open(_ordinal_array(dates)).tolist()
+
+
+def _array_add_business_days(d, n, calendar):
+    dates, counts = _date_array(d), _count_array(n)
+    if dates is None or counts is None or _is_list_arg(calendar):
+        return None
+    return _ordinal_strings(_get_calendar(calendar).shift(_ordinal_array(dates), counts))
+
+
+def _array_roll_date(d, convention, calendar):
+    dates = _date_array(d)
+    if dates is None or _is_list_arg(convention) or _is_list_arg(calendar):
+        return None
+    return _ordinal_strings(_get_calendar(calendar).roll(_ordinal_array(dates), _roll_convention(convention)))
+
+
+def _roll_period_dates(dates: List[str], roll: Optional[str], calendar: Optional[str]) -> List[str]:
+    """Period dates adjusted to business days; dates that roll onto the same day are kept once."""
+    convention = _roll_convention(roll or 'modified_following')
+    cal = _get_calendar(calendar)
+    if not dates or convention == 'none':
+        return dates
+    parsed = _date_array(dates)
+    if parsed is None:
+        ordinals = np.array([_parse_iso_date(date).toordinal() for date in dates])
+    else:
+        ordinals = _ordinal_array(parsed)
+    rolled = cal.roll(ordinals, convention)
+    keep = np.concatenate(([True], np.diff(rolled) != 0))
+    return _ordinal_strings(rolled[keep])
+
+# ============= Schedule Functions =============
+
+_PERIOD_GRID_CACHE_SIZE = 1024
+
+# Month steps per frequency; anything else (other than W/D) is monthly
+_PERIOD_MONTH_STEPS = {"M": 1, "Q": 3, "A": 12}
+
+_PeriodGrid = collections.namedtuple('_PeriodGrid', ['dates', 'ordinals', 'dcf'])
+
+
+def _advance_months(current: datetime, months: int) -> datetime:
+    """Same day `months` later, or the target month's last day if it is shorter."""
+    month = current.month - 1 + months
+    year = current.year + month // 12
+    month = month % 12 + 1
+    try:
+        return current.replace(year=year, month=month)
+    except ValueError:
+        next_month = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+        return current.replace(year=year, month=month, day=(next_month - timedelta(days=1)).day)
+
+
+def _next_period_date(current: datetime, freq: str) -> datetime:
+    """The period date after `current`."""
+    if freq == "A":
+        # Annual
+        return current.replace(year=current.year + 1)
+    if freq == "W":
+        # Weekly
+        return current + timedelta(weeks=1)
+    if freq == "D":
+        # Daily
+        return current + timedelta(days=1)
+    # Monthly/quarterly (default monthly); a month-end clamp sticks to later dates
+    return _advance_months(current, _PERIOD_MONTH_STEPS.get(freq, 1))
+
+
+def _period_dates(start_date: datetime, end_date: datetime, freq: str) -> List[str]:
+    """Period dates stepped one at a time (reference for `_period_grid()`)."""
+    dates = []
+    current = start_date
+    
+    while current <= end_date:
+        dates.append(current.strftime("%Y-%m-%d"))
+        current = _next_period_date(current, freq)
+    return dates
+
+
+def _period_dcf(ordinals: np.ndarray, convention: str, freq: Any = None) -> tuple:
+    """Per-row day count fractions, matching `day_count_fraction()` row by row
+    (except for annual periods of the conventions in `_ANNUAL_DAY_COUNT_CONVENTIONS`)."""
+    n = len(ordinals)
+    if n < 2:
+        return (1/12,) * n
+    annual = _ANNUAL_DAY_COUNT_CONVENTIONS.get(convention) if freq == "A" and isinstance(convention, str) else None
+    if annual is not None:
+        dcf = annual(ordinals[:-1], ordinals[1:])
+    else:
+        dcf = _day_count_vector(ordinals[:-1], ordinals[1:], convention)
+    # Last period repeats the previous DCF
+    return tuple(dcf.tolist()) + (dcf[-1].item(),)
+
+
+@functools.lru_cache(maxsize=_PERIOD_GRID_CACHE_SIZE)
+def _period_grid(start: str, end: str, freq: str, convention: str) -> Optional[_PeriodGrid]:
+    """Shared, read-only date grid and DCF vector for ISO `start`/`end`.
+
+    Dates are computed with datetime64 month/day arithmetic instead of
+    stepping through them. Returns None for the cases left to
+    `_period_dates()`: years outside 1000-9998 (string padding and overflow
+    differ) and annual grids starting on Feb 29, which raise there.
+    """
+    if not ("1000" <= start[:4] and end[:4] <= "9998"):
+        return None
+    first = np.datetime64(start, 'D')
+    last = np.datetime64(end, 'D')
+    if first > last:
+        ordinals = np.array([], dtype='datetime64[D]')
+    elif freq in ("W", "D"):
+        ordinals = np.arange(first, last + 1, 7 if freq == "W" else 1)
+    else:
+        step = _PERIOD_MONTH_STEPS.get(freq, 1)
+        day = int(start[8:])
+        if step == 12 and start[5:] == "02-29":
+            return None
+        first_month = first.astype('datetime64[M]')
+        count = (last.astype('datetime64[M]') - first_month).astype(np.int64) // step + 1
+        months = first_month + np.arange(count) * step
+        month_starts = months.astype('datetime64[D]')
+        month_days = ((months + 1).astype('datetime64[D]') - month_starts).astype(np.int64)
+        # Clamping to a short month carries over to every later date
+        days = np.minimum.accumulate(np.minimum(month_days, day))
+        ordinals = month_starts + (days - 1)
+        ordinals = ordinals[:np.searchsorted(ordinals, last, side='right')]
+    ordinals.flags.writeable = False
+    dates = tuple(np.datetime_as_string(ordinals, unit='D').tolist())
+    return _PeriodGrid(dates, ordinals, _period_dcf(ordinals, convention, freq))
+
+
+def period_grid_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters for the period date-grid cache."""
+    info = _period_grid.cache_info()
     return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+    }
+
+
+def period(start: str, end: str, freq: str = "M", convention: str = "ACT/360",
+           roll: str = None, calendar: str = None) -> Dict[str, Any]:
+    """
+    Creates a period definition for schedule generation.
+    
+    Args:
+        start: Start date (YYYY-MM-DD)
+        end: End date (YYYY-MM-DD)
+        freq: Frequency - M (monthly), Q (quarterly), A (annual), D (daily), W (weekly)
+        convention: Day count convention - ACT/360, ACT/365, 30/360, 30E/360, ACT/ACT ISDA, ACT/365L
+        roll: Business-day adjustment of the period dates (see roll_date());
+              modified_following when only a calendar is given
+        calendar: Name of a holiday_calendar() used for `roll` (weekends only by default)
+    
+    Returns:
+        Period definition object with dates list and per-row day count fractions (dcf)
+    """
+    # Support passing arrays of start/end dates to create per-item schedules implicitly.
+    if isinstance(start, list) and isinstance(end, list):
+        if len(start) != len(end):
+            raise ValueError("start and end arrays must have the same length")
+        return {
+            "type": "period_array",
+            "start_dates": start,
+            "end_dates": end,
+            "freq": freq,
+            "convention": convention,
+            "roll": roll,
+            "calendar": calendar,
+        }
+
+    # If either date is empty or invalid, return an empty period (no dates)
+    if not start or not end:
+        return {
+            "type": "period",
+            "start": start,
+            "end": end,
+            "freq": freq,
+            "convention": convention,
+            "dates": []
+        }
+    # Normalize start/end and guard invalid values
+    nd_start = normalize_date(start)
+    nd_end = normalize_date(end)
+    if not nd_start or not nd_end:
+        return {
+            "type": "period",
+            "start": start,
+            "end": end,
+            "freq": freq,
+            "convention": convention,
+            "dates": []
+        }
+    try:
+        start_date = _parse_iso_date(nd_start)
+        end_date = _parse_iso_date(nd_end)
+    except Exception:
+        return {
+            "type": "period",
+            "start": start,
+            "end": end,
+            "freq": freq,
+            "convention": convention,
+            "dates": []
+        }
+    
+    grid = None
+    if _is_iso_date(nd_start) and _is_iso_date(nd_end) and isinstance(freq, str) and isinstance(convention, str):
+        grid = _period_grid(nd_start, nd_end, freq, convention)
+    dates = list(grid.dates) if grid is not None else _period_dates(start_date, end_date, freq)
+    dcf = grid.dcf if grid is not None else None
+    
+    period_def = {
         "type": "period",
         "start": start,
         "end": end,
@@ -1123,6 +2499,1440 @@ def period(start: str, end: str, freq: str = "M", convention: str = "ACT/360") -
         "convention": convention,
         "dates": dates
     }
+    if roll is not None or calendar is not None:
+        period_def["dates"] = dates = _roll_period_dates(dates, roll, calendar)
+        period_def["roll"] = roll
+        period_def["calendar"] = calendar
+        dcf = None
+    # Per-row day count fractions, computed once for every schedule over this period
+    period_def["dcf"] = dcf if dcf is not None else _dates_dcf(dates, convention, freq)
+    return period_def
+
+
+# ============= Schedule Trace =============
+#
+# Opt-in structured trace of schedule evaluation. Tracing is off by default
+# and then costs nothing: schedule() runs the plain compiled kernel. When
+# enabled (server.py does this per /dsl/run request), schedules run a
+# tracing variant of their kernel that records sampled per-cell events into
+# a bounded in-memory buffer, which is returned with the run result.
+
+# Default bound on buffered trace events (oldest events are dropped first)
+_TRACE_DEFAULT_MAX_EVENTS = 1000
+
+# Non-scalar traced values are recorded as a repr truncated to this length
+_TRACE_VALUE_MAX_CHARS = 200
+
+# Active trace buffer, or None when tracing is disabled
+_trace_buffer = None
+_trace_sample_every = 1
+_trace_recorded = 0
+
+
+def _set_schedule_trace(enabled: bool = True, max_events: int = _TRACE_DEFAULT_MAX_EVENTS, sample_every: int = 1):
+    """Enable (with a fresh buffer) or disable schedule tracing (called from server.py)"""
+    global _trace_buffer, _trace_sample_every, _trace_recorded
+    _trace_recorded = 0
+    if not enabled:
+        _trace_buffer = None
+        return
+    _trace_buffer = collections.deque(maxlen=max(1, int(max_events)))
+    _trace_sample_every = max(1, int(sample_every))
+
+
+def _get_schedule_trace() -> Dict[str, Any]:
+    """Get the buffered trace events plus how many were dropped to stay bounded"""
+    events = list(_trace_buffer) if _trace_buffer is not None else []
+    return {
+        "enabled": _trace_buffer is not None,
+        "sample_every": _trace_sample_every,
+        "max_events": _trace_buffer.maxlen if _trace_buffer is not None else 0,
+        "dropped": _trace_recorded - len(events),
+        "events": events,
+    }
+
+
+def _clear_schedule_trace():
+    """Clear buffered trace events, keeping tracing enabled or disabled as it is"""
+    global _trace_recorded
+    _trace_recorded = 0
+    if _trace_buffer is not None:
+        _trace_buffer.clear()
+
+
+def _trace_event(event: Dict[str, Any]):
+    """Append one event to the active trace buffer"""
+    global _trace_recorded
+    if _trace_buffer is not None:
+        _trace_recorded += 1
+        _trace_buffer.append(event)
+
+
+def _trace_value(value: Any) -> Any:
+    """Make a traced value small and JSON-friendly"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)[:_TRACE_VALUE_MAX_CHARS]
+
+
+def _trace_schedule_row(idx: int, row: Dict[str, Any]):
+    """Record value/error events for every cell of a sampled schedule row"""
+    if idx % _trace_sample_every:
+        return
+    for column, value in row.items():
+        if isinstance(value, str) and value.startswith("ERROR"):
+            _trace_event({"event": "error", "row": idx, "column": column, "error": value})
+        else:
+            _trace_event({"event": "value", "row": idx, "column": column, "value": _trace_value(value)})
+
+
+# ============= Columnar Schedules =============
+
+# Marks rows without the requested column when reading Schedule columns
+_NO_VALUE = object()
+
+
+class Schedule(list):
+    """A schedule stored column by column that reads as a list of row dicts.
+
+    schedule() and generate_schedules() return these. Each column is one
+    value list; row dicts are only built when rows are read. Indexing a
+    single row returns a dict that is kept (edits to it stick and are seen
+    by the column readers). Any other list use (iteration, slicing,
+    appending, ...) turns the schedule into an ordinary list of row dicts.
+    schedule_sum/first/last/column read the columns directly. Pickling and
+    copying keep the columnar form.
+    """
+
+    __slots__ = ('_names', '_columns', '_length', '_views', '_totals', '_indexes', '_source')
+
+    def __init__(self, column_names: tuple, column_values: List[List[Any]], length: Optional[int] = None):
+        list.__init__(self)
+        self._names = tuple(column_names)
+        self._columns = column_values
+        self._length = len(column_values[0]) if length is None else length
+        self._views = {}
+        self._totals = {}
+        # schedule_filter() lookup indexes by match column
+        self._indexes = {}
+        # How the rows were generated, for schedule_state()/extend_schedule()
+        self._source = None
+
+    @classmethod
+    def _restore(cls, names: tuple, columns: List[List[Any]], length: int, views: Dict[int, dict],
+                 source: Optional[Dict[str, Any]] = None) -> "Schedule":
+        sched = cls(names, columns, length)
+        sched._views = views
+        sched._source = source
+        return sched
+
+    @property
+    def column_names(self) -> tuple:
+        """Column names in definition order (empty once turned into plain rows)."""
+        return self._names if getattr(self, '_columns', None) is not None else ()
+
+    def _materialize(self) -> list:
+        columns = getattr(self, '_columns', None)
+        if columns is not None:
+            names, views = self._names, self._views
+            self._columns = self._views = self._totals = self._indexes = None
+            rows = [dict(zip(names, values)) for values in zip(*columns)] if columns else [{} for _ in range(self._length)]
+            for idx, row in views.items():
+                rows[idx] = row
+            list.extend(self, rows)
+        return self
+
+    def _column(self, name: Any, missing: Any) -> Optional[List[Any]]:
+        """Per-row values of `name` (`missing` where a row lacks it), or None
+        once the schedule is plain rows. Do not modify the returned list."""
+        if getattr(self, '_columns', None) is None:
+            return None
+        try:
+            hash(name)
+        except TypeError:
+            return None
+        if name in self._names:
+            values = self._columns[self._names.index(name)]
+        else:
+            values = [missing] * self._length
+        if self._views:
+            values = list(values)
+            for idx, row in self._views.items():
+                values[idx] = row[name] if name in row else missing
+        return values
+
+    def _total(self, name: Any) -> Optional[float]:
+        """schedule_sum() of one column, or None once the schedule is plain rows."""
+        values = self._column(name, None)
+        if values is None:
+            return None
+        if not self._views and name in self._totals:
+            return self._totals[name]
+        if set(map(type, values)) <= {int, float}:
+            total = sum(values)
+        else:
+            total = sum(v for v in values if isinstance(v, (int, float)))
+        if not self._views:
+            self._totals[name] = total
+        return total
+
+    def _cell(self, idx: int, name: Any, missing: Any) -> Any:
+        """`self[idx].get(name, missing)` without creating a kept row view."""
+        if getattr(self, '_columns', None) is None or idx in self._views:
+            return self[idx].get(name, missing)
+        if name not in self._names:
+            return missing
+        return self._columns[self._names.index(name)][idx]
+
+    def _is_single(self) -> bool:
+        """True while columnar and not shaped like generate_schedules() results."""
+        if getattr(self, '_columns', None) is None or not self._length:
+            return False
+        first = self._views.get(0)
+        return 'schedule' not in (first if first is not None else self._names)
+
+    def __len__(self) -> int:
+        if getattr(self, '_columns', None) is not None:
+            return self._length
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        if getattr(self, '_columns', None) is not None and not isinstance(index, slice):
+            try:
+                idx = operator.index(index)
+            except TypeError:
+                idx = None
+            if idx is not None:
+                if idx < 0:
+                    idx += self._length
+                if not 0 <= idx < self._length:
+                    raise IndexError("list index out of range")
+                row = self._views.get(idx)
+                if row is None:
+                    row = self._views[idx] = dict(zip(self._names, [values[idx] for values in self._columns]))
+                return row
+        return list.__getitem__(self._materialize(), index)
+
+    def __sizeof__(self) -> int:
+        size = list.__sizeof__(self)
+        if getattr(self, '_columns', None) is not None:
+            size += sum(values.__sizeof__() for values in self._columns)
+        return size
+
+    def __reduce_ex__(self, protocol):
+        if getattr(self, '_columns', None) is not None:
+            return (Schedule._restore, (self._names, self._columns, self._length, self._views, self._source))
+        return (list, (list.copy(self),))
+
+
+def _materializing(method):
+    def wrapper(self, *args, **kwargs):
+        # list methods read other lists' storage directly, so columnar
+        # arguments need their rows too
+        for arg in args:
+            if isinstance(arg, Schedule):
+                arg._materialize()
+        return method(self._materialize(), *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _method_name in ('__iter__', '__reversed__', '__setitem__', '__delitem__',
+                     '__contains__', '__eq__', '__ne__', '__lt__', '__le__', '__gt__', '__ge__',
+                     '__add__', '__mul__', '__rmul__', '__iadd__', '__imul__', '__repr__',
+                     'append', 'extend', 'insert', 'pop', 'remove', 'clear', 'index', 'count',
+                     'copy', 'sort', 'reverse'):
+    setattr(Schedule, _method_name, _materializing(getattr(list, _method_name)))
+del _method_name
+
+
+# Rows per chunk of a ScheduleStream unless schedule_stream() is told otherwise
+_SCHEDULE_STREAM_CHUNK_ROWS = 1000
+
+
+class ScheduleStream:
+    """A dated schedule whose rows are evaluated chunk by chunk as they are read.
+
+    schedule_stream() returns these. Iterating yields row dicts; `chunks()`
+    yields each chunk as a columnar Schedule. Only one chunk of rows exists
+    at a time, and every pass evaluates the rows again, so a stream can be
+    read more than once. `len()` is the number of periods. schedule_sum,
+    createTransaction and print_schedule consume streams chunk by chunk;
+    `list(stream)` gives an ordinary schedule.
+    """
+
+    __slots__ = ('_period', '_columns', '_context', 'chunk_size')
+
+    def __init__(self, period_def: Dict[str, Any], columns: Dict[str, str],
+                 context: Optional[Dict[str, Any]] = None, chunk_size: int = _SCHEDULE_STREAM_CHUNK_ROWS):
+        self._period = period_def
+        self._columns = dict(columns)
+        self._context = context
+        self.chunk_size = chunk_size
+
+    def chunks(self) -> Iterator[Schedule]:
+        """The rows as consecutive columnar Schedules of up to `chunk_size` rows."""
+        if len(self):
+            yield from _dated_schedule_chunks(self._period, self._columns, self._context, self.chunk_size)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for chunk in self.chunks():
+            names = chunk._names
+            for values in zip(*chunk._columns):
+                yield dict(zip(names, values))
+
+    def __len__(self) -> int:
+        return len(self._period.get("dates", []))
+
+    def __repr__(self) -> str:
+        return f"<ScheduleStream {len(self)} rows of {', '.join(self._columns)}>"
+
+
+# ============= Schedule Result Cache =============
+#
+# Dated schedules are memoized under a hash of their normalized inputs (the
+# period's dates and day count convention, the column expressions and the
+# context values), so instruments sharing a definition, and re-runs over
+# unchanged event data, reuse the computed columns. Entries are evicted
+# least-recently-used once their estimated size exceeds the memory budget;
+# with a spill directory, evicted entries are pickled there and reloaded on
+# a later hit. Traced runs and columns calling functions with side effects
+# bypass the cache.
+
+_SCHEDULE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_SCHEDULE_CACHE_MAX_SPILL_BYTES = 512 * 1024 * 1024
+_SCHEDULE_CACHE_COLUMN_TOKENS = 256
+
+# DSL functions whose calls must run every time
+_SCHEDULE_CACHE_IMPURE = frozenset({'print', 'createTransaction'})
+
+# Context/column value types that hash by value
+_SCHEDULE_CACHE_SCALARS = (type(None), bool, int, float, str)
+
+_schedule_cache = collections.OrderedDict()  # key -> (names, columns, length, size, indexes, mutable)
+_schedule_cache_config = {
+    'enabled': True,
+    'max_bytes': _SCHEDULE_CACHE_MAX_BYTES,
+    'spill_dir': None,
+    'max_spill_bytes': _SCHEDULE_CACHE_MAX_SPILL_BYTES,
+}
+_schedule_cache_spilled = collections.OrderedDict()  # key -> file size
+_schedule_cache_counters = collections.Counter()
+
+
+def configure_schedule_cache(enabled: Optional[bool] = None, max_bytes: Optional[int] = None,
+                             spill_dir: Optional[str] = None, max_spill_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Configure the schedule result cache; arguments left as None are unchanged.
+
+    Args:
+        enabled: Turn caching on or off (off also drops the in-memory entries)
+        max_bytes: Memory budget for cached schedules
+        spill_dir: Directory evicted entries are written to ('' disables spilling);
+                   entries already in it are reused
+        max_spill_bytes: Disk budget of the spill directory
+
+    Returns:
+        The resulting configuration
+    """
+    config = _schedule_cache_config
+    if enabled is not None:
+        config['enabled'] = bool(enabled)
+        if not enabled:
+            _schedule_cache.clear()
+    if max_bytes is not None:
+        config['max_bytes'] = max(0, int(max_bytes))
+    if max_spill_bytes is not None:
+        config['max_spill_bytes'] = max(0, int(max_spill_bytes))
+    if spill_dir is not None:
+        config['spill_dir'] = spill_dir or None
+        _schedule_cache_spilled.clear()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            files = sorted((entry.stat().st_mtime, entry.name[:-4], entry.stat().st_size)
+                           for entry in os.scandir(spill_dir) if entry.name.endswith('.pkl'))
+            for _, key, size in files:
+                _schedule_cache_spilled[key] = size
+    _schedule_cache_trim()
+    return dict(config)
+
+
+def schedule_cache_stats(since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Counters of the schedule result cache.
+
+    Args:
+        since: An earlier result; hits/misses/stores/evictions/spills are then
+               counted from that point (e.g. for one run)
+    """
+    counters = {name: _schedule_cache_counters[name]
+                for name in ('hits', 'memory_hits', 'disk_hits', 'misses', 'stores', 'evictions', 'spills')}
+    if since:
+        counters = {name: value - since.get(name, 0) for name, value in counters.items()}
+    lookups = counters['hits'] + counters['misses']
+    counters.update({
+        'hit_rate': counters['hits'] / lookups if lookups else 0.0,
+        'entries': len(_schedule_cache),
+        'bytes': sum(entry[3] for entry in _schedule_cache.values()),
+        'max_bytes': _schedule_cache_config['max_bytes'],
+        'spilled_entries': len(_schedule_cache_spilled),
+    })
+    return counters
+
+
+def clear_schedule_cache(spill: bool = False) -> None:
+    """Drop the cached schedules (and, with `spill`, the spill files) and reset the counters."""
+    _schedule_cache.clear()
+    _schedule_cache_counters.clear()
+    spill_dir = _schedule_cache_config['spill_dir']
+    if spill and spill_dir:
+        for key in list(_schedule_cache_spilled):
+            _schedule_cache_unspill(key)
+
+
+def _cache_token(value: Any) -> Any:
+    """Type-tagged, repr-stable form of a cache key component (TypeError if unsupported)."""
+    kind = type(value)
+    if kind is DateValue:
+        # Behaves exactly like its text
+        return ('str', str(value))
+    if kind in _SCHEDULE_CACHE_SCALARS:
+        return (kind.__name__, value)
+    if kind in (list, tuple) or isinstance(value, Schedule):
+        return (kind.__name__, tuple(map(_cache_token, value)))
+    if kind is dict:
+        return ('dict', tuple((_cache_token(k), _cache_token(v)) for k, v in value.items()))
+    if kind is datetime:
+        return ('datetime', value.isoformat())
+    raise TypeError(f"uncacheable value of type {kind.__name__}")
+
+
+@functools.lru_cache(maxsize=_SCHEDULE_CACHE_COLUMN_TOKENS)
+def _schedule_columns_token(column_defs: tuple) -> Optional[tuple]:
+    """Cache token of ((column, expression_text), ...), or None if it must not be cached.
+
+    Returns (token, names) where names are the identifiers the expressions
+    read; only those context values go into the key (None: all of them, as
+    some expression did not parse).
+    """
+    names = set()
+    for _, text in column_defs:
+        try:
+            tree = _parse_expression(text)
+        except Exception:
+            names = None
+            continue
+        read = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        if read & _SCHEDULE_CACHE_IMPURE:
+            return None
+        if names is not None:
+            names |= read
+    try:
+        return _cache_token(column_defs), None if names is None else frozenset(names)
+    except TypeError:
+        return None
+
+
+def _schedule_cache_key(period_def: Dict[str, Any], columns_token: Optional[tuple],
+                        context: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Content hash of a dated schedule's inputs, or None when it is not cacheable."""
+    if columns_token is None or not _schedule_cache_config['enabled'] or _trace_buffer is not None:
+        return None
+    try:
+        token = (
+            _cache_token(list(period_def.get("dates", []))),
+            _cache_token(period_def.get("convention", "ACT/360")),
+            columns_token,
+            _cache_token(_schedule_key_context(context, columns_token[1])),
+            _holiday_calendars_token(columns_token[1]),
+        )
+    except TypeError:
+        return None
+    return hashlib.blake2b(repr(token).encode('utf-8'), digest_size=20).hexdigest()
+
+
+def _schedule_key_context(context: Optional[Dict[str, Any]], names: Optional[frozenset]) -> Optional[Dict[str, Any]]:
+    """The part of `context` a schedule's result can depend on.
+
+    A context value `k` is read either as `k` or as `k_full`.
+    """
+    if context is None or names is None:
+        return context
+    return {name: value for name, value in context.items()
+            if name in names or f"{name}_full" in names}
+
+
+def _schedule_cache_get(key: Optional[str]) -> Optional[Schedule]:
+    """The cached schedule for `key` (a fresh Schedule sharing the column lists;
+    columns holding lists, dicts or other mutable cells are copied)."""
+    if key is None:
+        return None
+    entry = _schedule_cache.get(key)
+    if entry is not None:
+        _schedule_cache.move_to_end(key)
+        _schedule_cache_counters['memory_hits'] += 1
+    elif key in _schedule_cache_spilled:
+        try:
+            with open(os.path.join(_schedule_cache_config['spill_dir'], key + '.pkl'), 'rb') as fh:
+                names, columns, length = pickle.load(fh)
+        except Exception:
+            _schedule_cache_unspill(key)
+        else:
+            _schedule_cache_unspill(key)
+            entry = _schedule_cache_insert(key, names, columns, length)
+            _schedule_cache_counters['disk_hits'] += 1
+            _schedule_cache_trim()
+    if entry is None:
+        _schedule_cache_counters['misses'] += 1
+        return None
+    _schedule_cache_counters['hits'] += 1
+    columns = entry[1]
+    if entry[5]:
+        # In-place edits of a cell must not reach the cache or other hits
+        columns = list(columns)
+        for pos in entry[5]:
+            columns[pos] = copy.deepcopy(columns[pos])
+    sched = Schedule(entry[0], columns, entry[2])
+    sched._indexes = entry[4]
+    return sched
+
+
+def _schedule_cache_put(key: Optional[str], sched: Any) -> None:
+    """Remember a freshly computed schedule under `key`."""
+    if key is None or not isinstance(sched, Schedule) or sched._columns is None:
+        return
+    _schedule_cache_insert(key, sched._names, sched._columns, sched._length, sched._indexes)
+    _schedule_cache_counters['stores'] += 1
+    _schedule_cache_trim()
+
+
+def _schedule_cache_insert(key: str, names: tuple, columns: List[List[Any]], length: int,
+                           indexes: Optional[Dict[Any, Any]] = None) -> tuple:
+    size = sys.getsizeof(names) + sum(sys.getsizeof(values) + sum(map(sys.getsizeof, values)) for values in columns)
+    # Columns with mutable cells are stored as private copies and copied again on every hit
+    mutable = tuple(pos for pos, values in enumerate(columns)
+                    if not all(isinstance(v, _SCHEDULE_CACHE_SCALARS) for v in values))
+    if mutable:
+        columns = list(columns)
+        for pos in mutable:
+            columns[pos] = copy.deepcopy(columns[pos])
+    # Lookup indexes only read the shared column lists, so every copy handed out shares them too
+    entry = (names, columns, length, size, {} if indexes is None else indexes, mutable)
+    _schedule_cache[key] = entry
+    _schedule_cache.move_to_end(key)
+    return entry
+
+
+def _schedule_cache_trim() -> None:
+    """Evict least-recently-used entries beyond the memory budget (spilling them if configured)."""
+    config = _schedule_cache_config
+    total = sum(entry[3] for entry in _schedule_cache.values())
+    while _schedule_cache and total > config['max_bytes']:
+        key, (names, columns, length, size, _, _) = _schedule_cache.popitem(last=False)
+        total -= size
+        _schedule_cache_counters['evictions'] += 1
+        if config['spill_dir']:
+            _schedule_cache_spill(key, (names, columns, length))
+    spilled = sum(_schedule_cache_spilled.values())
+    while _schedule_cache_spilled and spilled > config['max_spill_bytes']:
+        spilled -= _schedule_cache_unspill(next(iter(_schedule_cache_spilled)))
+
+
+def _schedule_cache_spill(key: str, payload: tuple) -> None:
+    path = os.path.join(_schedule_cache_config['spill_dir'], key + '.pkl')
+    try:
+        with open(path + '.tmp', 'wb') as fh:
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        return
+    _schedule_cache_spilled[key] = os.path.getsize(path)
+    _schedule_cache_counters['spills'] += 1
+
+
+def _schedule_cache_unspill(key: str) -> int:
+    """Forget a spilled entry and delete its file; returns its size."""
+    size = _schedule_cache_spilled.pop(key, 0)
+    try:
+        os.remove(os.path.join(_schedule_cache_config['spill_dir'], key + '.pkl'))
+    except OSError:
+        pass
+    return size
+
+
+# ============= Schedule Compiler =============
+#
+# schedule() does not interpret column expressions cell by cell. Each
+# distinct schedule definition is compiled once into a specialized Python
+# row-loop function (a "kernel"): every column and every referenced row
+# variable becomes a local variable, lag() reads from per-column ring
+# buffers (bounded by the deepest lag offset used), and no evaluation
+# dictionary is built per row. Kernels are cached by (mode, columns,
+# binding layout), so schedules that share column definitions (e.g. every
+# item of generate_schedules) reuse one kernel.
+#
+# The generated code reproduces the interpreter semantics exactly:
+# - names resolve through the same layers (DSL functions, then context and
+#   schedule variables, then values carried over from the previous row);
+# - a failing cell yields "ERROR: <message>", stores 0 for lag() and leaves
+#   the name bound to its previous value for later columns of the row;
+# - lambda/comprehension bodies only see globals, as they did under eval().
+
+# Maximum number of compiled schedule kernels kept in memory
+_SCHEDULE_KERNEL_CACHE_SIZE = 256
+
+# Keywords that dated schedules resolve without evaluating an expression
+_SCHEDULE_SPECIAL_KEYWORDS = ('period_date', 'period_index', 'dcf')
+
+# Context keys consumed by unified schedules instead of being exposed as names
+_UNIFIED_RESERVED_KEYS = ('amounts', 'start_dates', 'end_dates', 'subinstrument_ids', 'item_names')
+
+# Message produced when an expression reads a name that is not defined. The
+# restricted globals set `__builtins__` to None, so the failed builtins
+# lookup surfaces as this TypeError (unified schedules key a fallback on it).
+_UNDEFINED_NAME_MESSAGE = "'NoneType' object is not subscriptable"
+
+
+def _schedule_error_message(exc: BaseException) -> str:
+    """Text stored after 'ERROR: ' for a failed cell.
+
+    A column read before its first value raises UnboundLocalError inside
+    the kernel frame itself; report it like any other undefined name.
+    """
+    tb = exc.__traceback__
+    if type(exc) is UnboundLocalError and tb is not None and tb.tb_next is None:
+        return _UNDEFINED_NAME_MESSAGE
+    return str(exc)
+
+
+def _make_lag(history: Dict[Any, Any]):
+    """Build lag() over per-column histories that hold completed rows only.
+
+    Histories are appended once per row (fixed-depth deques when the lag
+    offsets are known), so lag() reads prior rows without copying them.
+    """
+    def lag_impl(col_name, offset=1, default=0):
+        col_values = history.get(col_name, [])
+        if len(col_values) >= offset:
+            val = col_values[-offset]
+            # If previous value was an error, return default
+            if isinstance(val, str) and val.startswith("ERROR"):
+                return default
+            return val
+        return default
+    return lag_impl
+
+
+class _ScheduleScopeNames(ast.NodeTransformer):
+    """Collect (and optionally rename) names evaluated in an expression's own scope.
+
+    Lambda and comprehension bodies run in a nested scope that, under eval(),
+    only sees globals; they are skipped. Lambda defaults and the first
+    comprehension iterable belong to the enclosing scope and are visited.
+    Also records which columns are read through literal lag('name', offset)
+    calls and how far back, so their histories can be bounded ring buffers.
+    """
+
+    def __init__(self, rename: Optional[Dict[str, str]] = None):
+        self.rename = rename or {}
+        self.names = set()
+        self.lag_depths = {}  # column -> deepest literal offset, None if unbounded
+        self.dynamic_lag = False
+        self._lag_funcs = set()
+
+    def visit_Name(self, node):
+        self.names.add(node.id)
+        if node.id == 'lag' and id(node) not in self._lag_funcs:
+            # lag passed around as a value: any column may be read
+            self.dynamic_lag = True
+        slot = self.rename.get(node.id)
+        if slot is not None:
+            return ast.copy_location(ast.Name(id=slot, ctx=node.ctx), node)
+        return node
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id == 'lag':
+            self._lag_funcs.add(id(node.func))
+            self._record_lag(node)
+        self.generic_visit(node)
+        return node
+
+    def _record_lag(self, node):
+        args = dict(zip(('col_name', 'offset', 'default'), node.args))
+        args.update((kw.arg, kw.value) for kw in node.keywords)
+        target = args.get('col_name')
+        if (any(isinstance(a, ast.Starred) for a in node.args) or None in args
+                or not (isinstance(target, ast.Constant) and isinstance(target.value, str))):
+            self.dynamic_lag = True
+            return
+        offset = args.get('offset')
+        if offset is None:
+            depth = 1
+        elif isinstance(offset, ast.Constant) and type(offset.value) is int and offset.value > 0:
+            depth = offset.value
+        else:
+            # lag(col, 0) and negative offsets index from the oldest row
+            depth = None
+        if target.value in self.lag_depths:
+            known = self.lag_depths[target.value]
+            depth = None if known is None or depth is None else max(known, depth)
+        self.lag_depths[target.value] = depth
+
+    def visit_Lambda(self, node):
+        node.args.defaults = [self.visit(d) for d in node.args.defaults]
+        node.args.kw_defaults = [self.visit(d) if d is not None else None for d in node.args.kw_defaults]
+        return node
+
+    def _visit_comprehension(self, node):
+        node.generators[0].iter = self.visit(node.generators[0].iter)
+        return node
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+
+@functools.lru_cache(maxsize=_SCHEDULE_KERNEL_CACHE_SIZE)
+def _compile_schedule_kernel(mode: str, columns: tuple, bindings: tuple, fallbacks: tuple = (),
+                             trace: bool = False, precomputed: tuple = ()):
+    """Generate the row-loop function for one schedule definition.
+
+    Args:
+        mode: 'dated' (period-based schedule) or 'unified' (one row per item)
+        columns: ((column_name, expression_text), ...) in evaluation order
+        bindings: ((name, kind, arg), ...) names bound for every row, in the
+                  order they shadow each other (later wins). kind is 'row'
+                  (per-row array), 'const', 'index' (row index + arg) or 'lag'.
+        fallbacks: context names holding per-row arrays; unified schedules
+                   read them when an expression hits a None subscript.
+        trace: build the tracing variant, which hands every row to
+               `_trace_schedule_row()`
+        precomputed: indexes of columns whose per-row values are passed in
+                     (see `_vectorize_columns()`) instead of evaluated
+
+    Returns:
+        kernel(n, binding_values, fallback_values, precomputed_values, resume, offset) -> Schedule
+        where the optional `resume` (dated mode) is (first_row, carried_values,
+        lag_histories) and only rows first_row..n-1 are evaluated. In dated
+        mode per-row binding and precomputed values are read at row - offset,
+        so they may cover only the rows evaluated.
+    """
+    dated = mode == 'dated'
+    safe_globals = _get_safe_globals()
+    dsl_funcs = globals().get('DSL_FUNCTIONS', {})
+    final = {}
+    for pos, (name, kind, arg) in enumerate(bindings):
+        final[name] = pos
+    column_names = [c for c, _ in columns]
+    column_set = set(column_names)
+    fallback_pos = {name: pos for pos, name in enumerate(fallbacks)}
+
+    # Classify every column and parse the expressions that need evaluating
+    plans = []
+    scanner = _ScheduleScopeNames()
+    for j, (col_name, text) in enumerate(columns):
+        if not dated:
+            text = text.strip()
+        if j in precomputed:
+            plans.append(('pre',))
+        elif text in _SCHEDULE_SPECIAL_KEYWORDS:
+            plans.append(('special', text))
+            if not dated:
+                scanner.names.add(text)
+        elif not dated and text.isidentifier():
+            plans.append(('name', text))
+            scanner.names.add(text)
+        else:
+            try:
+                tree = _parse_expression(text)
+            except Exception as e:
+                plans.append(('error', str(e), text))
+                continue
+            scanner.visit(tree)
+            plans.append(('expr', tree, text))
+
+    # Names that become kernel locals: bound or column names read by an expression
+    slots = {name: f"__n_{name}" for name in scanner.names
+             if name in final or name in column_set}
+    # Columns read through lag() keep a ring buffer as deep as the deepest
+    # literal offset; other reads (computed names or offsets) keep everything
+    history_columns, history_depths = [], []
+    if 'lag' in scanner.names:
+        for c in column_names:
+            if scanner.dynamic_lag:
+                history_columns.append(c)
+                history_depths.append(None)
+            elif c in scanner.lag_depths:
+                history_columns.append(c)
+                history_depths.append(scanner.lag_depths[c])
+    uses_lag = any(bindings[final[name]][1] == 'lag' for name in slots if name in final)
+
+    # Position of the current row in the per-row value lists
+    row_var = '__i' if dated else '__idx'
+
+    def binding_code(pos: int, row: Optional[str] = None) -> str:
+        _, kind, arg = bindings[pos]
+        if kind == 'row':
+            return f"__b{pos}[{row or row_var}]"
+        if kind == 'index':
+            index = row or '__idx'
+            return f"({index} + {arg})" if arg else index
+        if kind == 'lag':
+            return '__lag'
+        return f"__b{pos}"
+
+    prologue, row_start, body, row_end = [], [], [], []
+    used_bindings = set()
+    carried = {}  # column name -> slot refreshed from the stored value after each row
+    for name, slot in slots.items():
+        pos = final.get(name)
+        if pos is not None:
+            used_bindings.add(pos)
+        if name not in column_set:
+            if pos is None:
+                continue
+            if bindings[pos][1] in ('row', 'index'):
+                row_start.append(f"{slot} = {binding_code(pos)}")
+            else:
+                prologue.append(f"{slot} = {binding_code(pos)}")
+        elif dated:
+            # Values carried from the previous row shadow every other binding
+            if pos is not None:
+                prologue.append(f"{slot} = {binding_code(pos, '0')}")
+            elif name in safe_globals and name.isidentifier():
+                prologue.append(f"{slot} = {name}")
+            carried[name] = slot
+        elif pos is not None:
+            row_start.append(f"{slot} = {binding_code(pos)}")
+        elif name in dsl_funcs:
+            row_start.append(f"{slot} = {name}")
+        else:
+            if name in safe_globals:
+                prologue.append(f"{slot} = {name}")
+            carried[name] = slot
+    if dated:
+        for keyword in ('period_date', 'dcf'):
+            if keyword in final:
+                used_bindings.add(final[keyword])
+
+    renamer = _ScheduleScopeNames(slots)
+    history_index = {c: i for i, c in enumerate(history_columns)}
+    for j, (col_name, plan) in enumerate(zip(column_names, plans)):
+        v = f"__v{j}"
+        kind = plan[0]
+        if kind == 'special':
+            if dated:
+                keyword = plan[1]
+                body.append(f"{v} = __idx" if keyword == 'period_index' else f"{v} = {binding_code(final[keyword])}")
+            else:
+                body.append(f"{v} = {slots[plan[1]]}")
+        elif kind == 'pre':
+            body.append(f"{v} = __p{j}[{row_var}]")
+        elif kind == 'name':
+            name = plan[1]
+            if name in slots:
+                if name in carried:
+                    body += ["try:", f"    {v} = {slots[name]}", "except __NameError:", f"    {v} = None"]
+                else:
+                    body.append(f"{v} = {slots[name]}")
+            elif dsl_funcs.get(name) is not None:
+                body.append(f"{v} = {name}")
+            else:
+                body.append(f"{v} = None")
+            if name in fallback_pos:
+                body += [f"if {v} is None:", f"    {v} = __f{fallback_pos[name]}[__idx]"]
+        else:
+            fallback = None
+            if not dated:
+                parts = plan[2].replace(']', '').replace('[', ' ').split()
+                if parts and parts[0].split('.')[0] in fallback_pos:
+                    fallback = fallback_pos[parts[0].split('.')[0]]
+            if kind == 'error':
+                message = plan[1]
+                if fallback is not None and 'NoneType' in message and 'subscript' in message:
+                    body.append(f"{v} = __f{fallback}[__idx]")
+                else:
+                    body.append(f"{v} = {'ERROR: ' + message!r}")
+            else:
+                source = ast.unparse(renamer.visit(plan[1]))
+                body += ["try:", f"    {v} = {source}"]
+                if dated:
+                    # DSL functions must not return None inside a dated schedule
+                    body += [f"    if {v} is None:", f"        {v} = 0"]
+                body.append("except __Exception as __e:")
+                if fallback is None:
+                    body.append(f"    {v} = 'ERROR: ' + __msg(__e)")
+                else:
+                    body += ["    __m = __msg(__e)",
+                             "    if 'NoneType' in __m and 'subscript' in __m:",
+                             f"        {v} = __f{fallback}[__idx]",
+                             "    else:",
+                             f"        {v} = 'ERROR: ' + __m"]
+        slot = slots.get(col_name) if isinstance(col_name, str) else None
+        if slot is None and col_name not in history_index:
+            continue
+        # ERROR markers are stored as 0 and do not rebind the column name
+        s = f"__s{j}"
+        body += [f"if __isinstance({v}, __str) and {v}.startswith('ERROR'):",
+                 f"    {s} = 0",
+                 "else:",
+                 f"    {s} = {slot + ' = ' if slot else ''}{v}"]
+        if col_name in history_index:
+            row_end.append(f"__h{history_index[col_name]}({s})")
+        if col_name in carried:
+            row_end.append(f"{carried[col_name]} = {s}")
+
+    row_dict = ', '.join(f"__k{j}: __v{j}" for j in range(len(column_names)))
+    lines = ["def __make_schedule_kernel(__isinstance, __str, __range, __msg, __make_lag, __deque, __trace, __Exception, __NameError, __K, __Schedule):",
+             "    def __kernel(__n, __B, __F, __P=None, __S=None, __o=0):"]
+    inner = []
+    if trace:
+        inner += [f"__k{j} = __K[{j}]" for j in range(len(column_names))]
+    inner += [f"__b{pos} = __B[{pos}]" for pos in sorted(used_bindings) if bindings[pos][1] in ('row', 'const')]
+    inner += [f"__f{pos} = __F[{pos}]" for pos in range(len(fallbacks))]
+    inner += [f"__p{j} = __P[{j}]" for j in precomputed]
+    inner.append("__hist = {" + ', '.join(f"__K[{column_names.index(c)}]: " + (f"__deque((), {d})" if d else "[]")
+                                          for c, d in zip(history_columns, history_depths)) + "}")
+    inner += [f"__h{i} = __hist[__K[{column_names.index(c)}]].append" for i, c in enumerate(history_columns)]
+    if uses_lag:
+        inner.append("__lag = __make_lag(__hist)")
+    inner += prologue
+    inner.append("__start = 0")
+    if dated:
+        # Resuming at row __start: carried values and lag histories of the rows before it
+        inner += ["if __S is not None:",
+                  "    __start, __carry, __past = __S",
+                  "    for __c, __h in __hist.items():",
+                  "        __h.extend(__past.get(__c, ()))"]
+        for name, slot in carried.items():
+            j = column_names.index(name)
+            inner += [f"    if __K[{j}] in __carry:", f"        {slot} = __carry[__K[{j}]]"]
+    inner.append("__cols = [" + ', '.join("[]" for _ in column_names) + "]")
+    inner += [f"__c{j} = __cols[{j}].append" for j in range(len(column_names))]
+    if dated:
+        inner += ["for __i in __range(__start - __o, __n - __o):", "    __idx = __i + __o"]
+    else:
+        inner.append("for __idx in __range(__start, __n):")
+    inner += ["    " + ln for ln in row_start + body]
+    inner += [f"    __c{j}(__v{j})" for j in range(len(column_names))]
+    if trace:
+        inner.append(f"    __trace(__idx, {{{row_dict}}})")
+    inner += ["    " + ln for ln in row_end]
+    inner.append("return __Schedule(__K, __cols, __n - __start)")
+    lines += ["        " + ln for ln in inner]
+    lines.append("    return __kernel")
+    source = '\n'.join(lines) + '\n'
+
+    kernel_globals = dict(safe_globals)
+    exec(compile(source, '<schedule>', 'exec'), kernel_globals)
+    factory = kernel_globals.pop('__make_schedule_kernel')
+    kernel = factory(isinstance, str, range, _schedule_error_message, _make_lag, collections.deque, _trace_schedule_row, Exception, NameError, tuple(column_names), Schedule)
+    kernel.__source__ = source
+    return kernel
+
+
+def schedule_kernel_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters for the compiled schedule-kernel cache."""
+    info = _compile_schedule_kernel.cache_info()
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+    }
+
+
+# ============= Vectorized Schedule Columns =============
+#
+# Columns of a dated schedule that do not depend on earlier rows (no lag(),
+# no reads of values carried over from the previous row) are computed once
+# as NumPy arrays over the whole period vector instead of cell by cell; the
+# compiled kernel then just reads the precomputed values. Only a small,
+# exactly reproducible subset is vectorized: + - * / and the DSL functions
+# below over numeric or ISO-date inputs. Arrays keep Python semantics:
+# all-float inputs use float64 (IEEE results are identical), any other
+# numbers use object arrays (Python int/float arithmetic per element).
+# Whenever a column's inputs do not fit (strings, None, zero divisors,
+# invalid dates, ...), that column and the columns built on it fall back to
+# the row loop, which produces the regular values and ERROR markers.
+
+# Array-aware versions of DSL functions: name -> (argument count, implementation)
+_VECTOR_FUNCTIONS = {}
+
+# Row-binding kinds that have one value per row
+_VECTOR_ROW_KINDS = ('row', 'index')
+
+
+def _vector_function(name: str, argc: int):
+    """Register an array-aware implementation of a DSL function."""
+    def register(func):
+        _VECTOR_FUNCTIONS[name] = (argc, func)
+        return func
+    return register
+
+
+def _is_number_vector(value: Any) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in 'fO'
+    return type(value) in (int, float)
+
+
+def _is_date_vector(value: Any) -> bool:
+    return isinstance(value, (np.ndarray, np.datetime64)) and value.dtype.kind == 'M'
+
+
+@_vector_function('add', 2)
+def _vector_add(a, b):
+    if _is_number_vector(a) and _is_number_vector(b):
+        return a + b
+    return None
+
+
+@_vector_function('subtract', 2)
+def _vector_subtract(a, b):
+    if _is_number_vector(a) and _is_number_vector(b):
+        return a - b
+    return None
+
+
+@_vector_function('multiply', 2)
+def _vector_multiply(a, b):
+    if _is_number_vector(a) and _is_number_vector(b):
+        return a * b
+    return None
+
+
+@_vector_function('divide', 2)
+def _vector_divide(a, b):
+    # Division by zero raises per cell; leave such columns to the row loop
+    if _is_number_vector(a) and _is_number_vector(b) and not np.any(b == 0):
+        return a / b
+    return None
+
+
+@_vector_function('days_between', 2)
+def _vector_days_between(d1, d2):
+    if _is_date_vector(d1) and _is_date_vector(d2):
+        return np.abs((d2 - d1).astype(np.int64)).astype(object)
+    return None
+
+
+@_vector_function('end_of_month', 1)
+def _vector_end_of_month(d):
+    if _is_date_vector(d):
+        return (d.astype('datetime64[M]') + 1).astype('datetime64[D]') - 1
+    return None
+
+
+@_vector_function('start_of_month', 1)
+def _vector_start_of_month(d):
+    if _is_date_vector(d):
+        return d.astype('datetime64[M]').astype('datetime64[D]')
+    return None
+
+
+_VECTOR_BINARY_OPERATORS = {
+    ast.Add: _vector_add,
+    ast.Sub: _vector_subtract,
+    ast.Mult: _vector_multiply,
+    ast.Div: _vector_divide,
+}
+
+
+def _is_iso_date(value: Any) -> bool:
+    return (type(value) in (str, DateValue) and len(value) == 10 and value[4] == '-' and value[7] == '-'
+            and value[:4].isdigit() and value[5:7].isdigit() and value[8:].isdigit())
+
+
+def _to_vector(values: List[Any]) -> Optional[np.ndarray]:
+    """Convert one value per row into an array, or None if it cannot be exact."""
+    types = set(map(type, values))
+    if types == {float}:
+        return np.array(values, dtype=np.float64)
+    if types and types <= {int, float}:
+        return np.array(values, dtype=object)
+    if types and types <= {str, DateValue} and all(map(_is_iso_date, values)):
+        try:
+            return np.array(values, dtype='datetime64[D]')
+        except ValueError:
+            return None
+    return None
+
+
+def _from_vector(array: np.ndarray) -> List[Any]:
+    """Per-row Python values of a vectorized column."""
+    if array.dtype.kind == 'M':
+        return np.datetime_as_string(array, unit='D').tolist()
+    return array.tolist()
+
+
+def _lag_call(node: ast.AST) -> Optional[tuple]:
+    """(column, offset, default_node) of a `lag('col', k, default)` call with
+    a literal column and positive literal offset, else None."""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'lag'
+            and not node.keywords and 1 <= len(node.args) <= 3):
+        return None
+    target = node.args[0]
+    offset = node.args[1] if len(node.args) > 1 else ast.Constant(1)
+    if not (isinstance(target, ast.Constant) and type(target.value) is str
+            and isinstance(offset, ast.Constant) and type(offset.value) is int and offset.value > 0):
+        return None
+    return target.value, offset.value, node.args[2] if len(node.args) > 2 else None
+
+
+def _vectorizable(node: ast.AST, names: set, lag: bool = False) -> bool:
+    """Whether an expression only uses vectorizable operations on `names`
+    (and, with `lag`, literal `lag()` calls)."""
+    if isinstance(node, ast.Expression):
+        return _vectorizable(node.body, names, lag)
+    if isinstance(node, ast.Constant):
+        return type(node.value) in (int, float) or _is_iso_date(node.value)
+    if isinstance(node, ast.Name):
+        return node.id in names
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, (ast.USub, ast.UAdd)) and _vectorizable(node.operand, names, lag)
+    if isinstance(node, ast.BinOp):
+        return (type(node.op) in _VECTOR_BINARY_OPERATORS
+                and _vectorizable(node.left, names, lag) and _vectorizable(node.right, names, lag))
+    if isinstance(node, ast.Call):
+        if lag and 'lag' not in names:
+            call = _lag_call(node)
+            if call is not None:
+                return call[2] is None or _vectorizable(call[2], names, lag)
+        func = node.func
+        return (isinstance(func, ast.Name) and func.id in _VECTOR_FUNCTIONS and func.id not in names
+                and not node.keywords and len(node.args) == _VECTOR_FUNCTIONS[func.id][0]
+                and all(_vectorizable(arg, names, lag) for arg in node.args))
+    return False
+
+
+def _evaluate_vector(node: ast.AST, env: Dict[str, Any], lag=None) -> Any:
+    """Evaluate a `_vectorizable` expression over whole columns (None if unsupported).
+
+    `lag`, when given, is called with the `_lag_call()` tuple of lag() calls.
+    """
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, str):
+            return np.datetime64(node.value, 'D')
+        return node.value
+    if isinstance(node, ast.Name):
+        return env.get(node.id)
+    if isinstance(node, ast.UnaryOp):
+        operand = _evaluate_vector(node.operand, env, lag)
+        if operand is None or not _is_number_vector(operand):
+            return None
+        return -operand if isinstance(node.op, ast.USub) else +operand
+    if isinstance(node, ast.BinOp):
+        left = _evaluate_vector(node.left, env, lag)
+        right = _evaluate_vector(node.right, env, lag) if left is not None else None
+        if right is None:
+            return None
+        return _VECTOR_BINARY_OPERATORS[type(node.op)](left, right)
+    if lag is not None and node.func.id == 'lag':
+        return lag(_lag_call(node))
+    args = []
+    for arg in node.args:
+        value = _evaluate_vector(arg, env, lag)
+        if value is None:
+            return None
+        args.append(value)
+    return _VECTOR_FUNCTIONS[node.func.id][1](*args)
+
+
+# First-order affine recurrences x[t] = x[t-1] * a[t] <op> b[t], where
+# x[t-1] is the column's own lag('x', 1, default), are solved with
+# ufunc.accumulate, which folds left to right exactly like the row loop
+_RECURRENCE_OPERATORS = {ast.Add: (operator.add, np.add), ast.Sub: (operator.sub, np.subtract)}
+
+# DSL functions that are + - * on numbers
+_RECURRENCE_FUNCTIONS = {'add': ast.Add, 'subtract': ast.Sub, 'multiply': ast.Mult}
+
+
+def _binary_operation(node: ast.AST, shadowed: set) -> Optional[tuple]:
+    """(operator type, left, right) of `a + b`, `a - b`, `a * b` or their
+    add/subtract/multiply calls, else None."""
+    if isinstance(node, ast.BinOp) and type(node.op) in (ast.Add, ast.Sub, ast.Mult):
+        return type(node.op), node.left, node.right
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _RECURRENCE_FUNCTIONS
+            and node.func.id not in shadowed and not node.keywords and len(node.args) == 2):
+        return _RECURRENCE_FUNCTIONS[node.func.id], node.args[0], node.args[1]
+    return None
+
+
+def _affine_recurrence(node: ast.AST, column: str, shadowed: set) -> Optional[tuple]:
+    """Match an affine recurrence of `column` on its previous row.
+
+    Recognizes lag(x) + b, b + lag(x), lag(x) - b, lag(x) * a, a * lag(x)
+    and (lag(x) * a) + b / (lag(x) * a) - b, with lag(x) being
+    lag('column', 1, default). Returns (default, scale, operator, term)
+    expression nodes; scale, or operator and term, are None when absent.
+    """
+    def own_lag(candidate):
+        call = _lag_call(candidate)
+        if call is None or call[0] != column or call[1] != 1:
+            return None
+        return call[2] if call[2] is not None else ast.Constant(0)
+
+    parts = _binary_operation(node, shadowed)
+    if parts is None:
+        return None
+    op, left, right = parts
+    if op is ast.Mult:
+        for lagged, scale in ((left, right), (right, left)):
+            default = own_lag(lagged)
+            if default is not None:
+                return default, scale, None, None
+        return None
+    candidates = ((left, right), (right, left)) if op is ast.Add else ((left, right),)
+    for lagged, term in candidates:
+        default = own_lag(lagged)
+        if default is not None:
+            return default, None, op, term
+        scaled = _binary_operation(lagged, shadowed)
+        if scaled is not None and scaled[0] is ast.Mult:
+            for inner, scale in ((scaled[1], scaled[2]), (scaled[2], scaled[1])):
+                default = own_lag(inner)
+                if default is not None:
+                    return default, scale, op, term
+    return None
+
+
+def _solve_recurrence(initial: Any, scale: Any, op: Optional[type], term: Any, shape: tuple) -> Optional[np.ndarray]:
+    """Values of x[t] = x[t-1] * scale[t] <op> term[t] along the last axis.
+
+    x[-1] is `initial[..., 0]`. Inputs are number vectors or scalars that
+    broadcast to `shape`; returns None if any is not a number.
+    """
+    inputs = [v for v in (initial, scale, term) if v is not None]
+    if not all(_is_number_vector(v) for v in inputs):
+        return None
+    floats = all(type(v) is float or (isinstance(v, np.ndarray) and v.dtype == np.float64) for v in inputs)
+    dtype = np.float64 if floats else object
+
+    def full(value):
+        array = np.empty(shape, dtype=dtype)
+        array[...] = value
+        return array
+
+    step, accumulate = _RECURRENCE_OPERATORS.get(op, (None, None))
+    previous = full(initial)[..., 0]
+    scale = full(scale) if scale is not None else None
+    term = full(term) if term is not None else None
+    first = previous * scale[..., 0] if scale is not None else previous
+    if term is not None:
+        first = step(first, term[..., 0])
+    if scale is None:
+        term[..., 0] = first
+        return accumulate.accumulate(term, axis=-1)
+    if term is None:
+        scale[..., 0] = first
+        return np.multiply.accumulate(scale, axis=-1)
+    values = np.empty(shape, dtype=dtype)
+    values[..., 0] = first
+    for t in range(1, shape[-1]):
+        values[..., t] = step(values[..., t - 1] * scale[..., t], term[..., t])
+    return values
+
+
+def _match_recurrence(tree: ast.Expression, column: str, available: set, shadowed: set) -> Optional[tuple]:
+    """`_affine_recurrence()` match of a column that is not plainly
+    vectorizable but whose recurrence inputs only read `available` names."""
+    if _vectorizable(tree, available):
+        return None
+    recurrence = _affine_recurrence(tree.body, column, shadowed)
+    if recurrence is None or not all(_vectorizable(part, available) for part in recurrence if isinstance(part, ast.AST)):
+        return None
+    return recurrence
+
+
+def _evaluate_recurrence(recurrence: tuple, env: Dict[str, Any], shape: tuple,
+                         start: int = 0, previous: Any = _NO_VALUE) -> Optional[np.ndarray]:
+    """Solve an `_affine_recurrence()` match over whole columns (None if unsupported).
+
+    With `previous`, only periods start.. are solved, continuing from the
+    `previous` value of period start - 1.
+    """
+    default, scale, op, term = recurrence
+    values = []
+    for part in (default, scale, term):
+        value = _evaluate_vector(part, env) if part is not None else None
+        if part is not None and value is None:
+            return None
+        if start and isinstance(value, np.ndarray):
+            value = value[..., start:]
+        values.append(value)
+    if previous is not _NO_VALUE:
+        values[0] = previous
+        shape = shape[:-1] + (shape[-1] - start,)
+    return _solve_recurrence(values[0], values[1], op, values[2], shape)
+
+
+@functools.lru_cache(maxsize=_SCHEDULE_KERNEL_CACHE_SIZE)
+def _plan_vector_columns(columns: tuple, bindings: tuple) -> tuple:
+    """Find the dated-schedule columns that can be computed as whole arrays.
+
+    Returns ((column_index, expression_tree, recurrence), ...) in column
+    order; a column may read per-row bindings and vectorizable columns that
+    come before it in the same row. `recurrence` is the
+    `_affine_recurrence()` match for columns built on their own previous
+    value, else None.
+    """
+    final = {name: kind for name, kind, _ in bindings}
+    column_names = {name for name, _ in columns}
+    available = {name for name, kind in final.items() if kind in _VECTOR_ROW_KINDS and name not in column_names}
+    shadowed = set(final) | column_names
+    recurrences = final.get('lag') == 'lag' and 'lag' not in column_names
+    plan = []
+    for j, (col_name, text) in enumerate(columns):
+        if text in _SCHEDULE_SPECIAL_KEYWORDS:
+            # Raw period values, visible to later columns of the row
+            if isinstance(col_name, str) and final.get(text) in _VECTOR_ROW_KINDS:
+                available.add(col_name)
+            continue
+        try:
+            tree = _parse_expression(text)
+        except Exception:
+            continue
+        # Plain names and literals gain nothing from vectorizing
+        if not isinstance(tree.body, (ast.Call, ast.BinOp, ast.UnaryOp)):
+            continue
+        recurrence = None
+        if not _vectorizable(tree, available):
+            if recurrences and isinstance(col_name, str):
+                recurrence = _match_recurrence(tree, col_name, available, shadowed)
+            if recurrence is None:
+                continue
+        if isinstance(col_name, str):
+            available.add(col_name)
+        plan.append((j, tree, recurrence))
+    return tuple(plan)
+
+
+def _vectorize_columns(columns: tuple, bindings: tuple, values: List[Any], n: int,
+                       resume: Optional[tuple] = None, offset: int = 0) -> Dict[int, List[Any]]:
+    """Precompute the lag-free columns of a dated schedule.
+
+    Returns {column_index: per-row values} for every planned column whose
+    inputs turned out to be exactly representable. With `resume`
+    (first_row, carried_values) recurrences continue from the carried
+    values; their rows before first_row are left as None. `offset` is the
+    schedule row of the first value in `values` (period_index counts from it).
+    """
+    start, carry = resume if resume is not None else (0, {})
+    plan = _plan_vector_columns(columns, bindings)
+    if not plan:
+        return {}
+    positions = {name: pos for pos, (name, _, _) in enumerate(bindings)}
+    env, converted = {}, {}
+
+    def lookup(name):
+        if name in env:
+            return env[name]
+        pos = positions.get(name)
+        if pos is None or bindings[pos][1] not in _VECTOR_ROW_KINDS:
+            return None
+        if pos not in converted:
+            _, kind, arg = bindings[pos]
+            if kind == 'index':
+                converted[pos] = np.arange(arg + offset, n + arg + offset).astype(object)
+            else:
+                converted[pos] = _to_vector(values[pos][:n])
+        return converted[pos]
+
+    results = {}
+    for j, (col_name, text) in enumerate(columns):
+        if text in _SCHEDULE_SPECIAL_KEYWORDS and isinstance(col_name, str):
+            env[col_name] = lookup(text)
+    for j, tree, recurrence in plan:
+        names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        scope = {name: lookup(name) for name in names}
+        try:
+            with np.errstate(all='ignore'):
+                if recurrence is None:
+                    array = _evaluate_vector(tree.body, scope)
+                elif resume is not None:
+                    array = _evaluate_recurrence(recurrence, scope, (n,), start, carry.get(columns[j][0]))
+                    if array is not None and start:
+                        array = np.concatenate([np.zeros(start, dtype=array.dtype), array])
+                else:
+                    array = _evaluate_recurrence(recurrence, scope, (n,))
+        except Exception:
+            array = None
+        col_name = columns[j][0]
+        if not isinstance(array, np.ndarray) or array.shape != (n,):
+            # Later columns must not see a binding of the same name instead
+            env[col_name] = None
+            continue
+        env[col_name] = array
+        results[j] = _from_vector(array)
+        if recurrence is not None and start:
+            results[j][:start] = [None] * start
+    return results
+
+
+def _dated_schedule_bindings(period_def: Dict[str, Any], context: Optional[Dict[str, Any]],
+                             rows: Optional[tuple] = None, read: Optional[frozenset] = None):
+    """Names bound in every row of a dated schedule, in shadowing order.
+
+    Returns (bindings, values) as expected by `_compile_schedule_kernel()`.
+    With `rows` (start, stop) the per-row values cover only those rows (for a
+    kernel run with offset start); `<name>_full` context arrays are then only
+    built when `read` (the names the columns read, None if unknown) has them.
+    """
+    dates = period_def.get("dates", [])
+    convention = period_def.get("convention", "ACT/360")
+    n_dates = len(dates)
+    start, stop = rows if rows is not None else (0, n_dates)
+    names, values = [], []
+
+    def bind(name, kind, value=None, arg=None):
+        names.append((name, kind, arg))
+        values.append(value)
+
+    def padded(v, first, last):
+        # Rows first..last-1 of a context value: lists shorter than the
+        # schedule repeat their last value (or 0 when empty), scalars repeat
+        if isinstance(v, list):
+            arr = v[first:last] if first or len(v) > last else list(v)
+            missing = (last - first) - len(arr)
+            if missing > 0:
+                arr = arr + [v[-1] if v else 0] * missing
+            return arr
+        return [0 if v is None else v] * (last - first)
+
+    # Pre-normalize injected context variables into arrays matching the schedule length
+    if context and isinstance(context, dict):
+        for k, v in context.items():
+            if rows is None:
+                arr = full = padded(v, 0, n_dates)
+                if isinstance(v, list) and len(v) > n_dates:
+                    arr = full = list(v)
+            else:
+                arr = padded(v, start, stop)
+                full = None
+                if read is None or f"{k}_full" in read:
+                    full = list(v) if isinstance(v, list) and len(v) > n_dates else padded(v, 0, n_dates)
+            # Per-row value, plus the full array exposed as `<name>_full`
+            bind(f"{k}_full", 'const', full)
+            bind(k, 'row', arr)
+
+    # DCF (attached by period()) and next period date for every row
+    dcf_values = period_def.get("dcf")
+    if dcf_values is None or len(dcf_values) != n_dates:
+        dcf_values = _dates_dcf(dates, convention, period_def.get("freq"))
+    period_starts = list(dates[start + 1:stop + 1]) + ([dates[-1]] if stop >= n_dates else [])
+    if rows is not None:
+        dates, dcf_values = dates[start:stop], dcf_values[start:stop]
+
+    # Special schedule variables, lag() and Python built-ins override context
+    bind('period_date', 'row', dates)
+    bind('period_index', 'index', arg=0)
+    bind('period_start', 'row', period_starts)
+    bind('dcf', 'row', dcf_values)
+    bind('lag', 'lag')
+    for name, func in (('abs', abs), ('min', min), ('max', max), ('round', round),
+                       ('sum', sum_vals), ('len', len), ('int', int), ('float', float),
+                       ('str', str), ('pow', pow), ('True', True), ('False', False)):
+        bind(name, 'const', func)
+
+    return tuple(names), values
 
 
 def schedule(period_def: Dict[str, Any], columns: Dict[str, str], context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
@@ -1212,7 +4022,9 @@ def schedule(period_def: Dict[str, Any], columns: Dict[str, str], context: Dict[
             freq,
             context,
             item_names,
-            subinstrument_ids
+            subinstrument_ids,
+            roll=period_def.get('roll'),
+            calendar=period_def.get('calendar')
         )
 
     # If no explicit period is provided, support a unified, non-split schedule
@@ -1240,124 +4052,50 @@ def schedule(period_def: Dict[str, Any], columns: Dict[str, str], context: Dict[
             # Evaluate columns for each item producing a single unified schedule (list of rows)
             _in_schedule_evaluation += 1
             try:
-                result = []
-                computed_columns = {col: [] for col in columns.keys()}
-                dsl_funcs = globals().get('DSL_FUNCTIONS', {})
-
-                for idx in range(n):
-                    # Build evaluation context exposing DSL functions and per-row variables
-                    eval_context = {}
-                    eval_context.update(dsl_funcs)
-                    # Per-row extracted values
-                    amount = get_at('amounts', idx, get_at('amount', idx, 0))
-                    subinstrument = get_at('subinstrument_ids', idx, get_at('subinstrument_id', idx, str(idx + 1)))
-                    item_name = get_at('item_names', idx, get_at('product_names', idx, f"Item {idx + 1}"))
-                    start = get_at('start_dates', idx, '')
-                    end = get_at('end_dates', idx, '')
-
-                    # Add user-provided context, converting list-valued keys to per-row values
-                    for k, v in context.items():
-                        if k in ('amounts', 'start_dates', 'end_dates', 'subinstrument_ids', 'item_names'):
-                            continue
-                        if isinstance(v, list):
-                            eval_context[k] = get_at(k, idx, None)
-                        else:
-                            eval_context[k] = v
-
-                    # Add schedule-like variables
-                    eval_context.update({
-                        'amount': amount,
-                        'subinstrument_id': subinstrument,
-                        'item_name': item_name,
-                        'start_date': start,
-                        'end_date': end,
-                        # Auto-generated sequence number for unified schedule
-                        's_no': idx + 1,
-                        'index': idx + 1,
-                        'period_index': idx,
-                        'period_date': '',
-                        'dcf': 0
-                    })
-
-                    # Snapshot prior computed_columns so any lag() calls in expressions
-                    # read a stable view (prevents indexing into in-progress lists).
-                    prior_snapshot = {k: list(v) for k, v in computed_columns.items()}
-
-                    # Provide a lag() helper into the eval context for unified schedules
-                    def create_lag_unified(cols_ref):
-                        def lag_impl(col_name, offset=1, default=0):
-                            col_values = cols_ref.get(col_name, [])
-                            if len(col_values) >= offset:
-                                val = col_values[-offset]
-                                if isinstance(val, str) and val.startswith("ERROR"):
-                                    return default
-                                return val
-                            return default
-                        return lag_impl
-
-                    eval_context['lag'] = create_lag_unified(prior_snapshot)
-
-                    # Include previously computed column values for cross-column references
-                    # Do not overwrite existing per-row context variables (like sale_price)
-                    for col_name, values in computed_columns.items():
-                        if values:
-                            last_val = values[-1]
-                            if not (isinstance(last_val, str) and str(last_val).startswith("ERROR")):
-                                if col_name not in eval_context:
-                                    eval_context[col_name] = last_val
-
-                    # Build row by evaluating each column expression
-                    row = {}
-                    for col_name, expression in columns.items():
-                        expr = str(expression).strip()
-                        if expr == 'period_date':
-                            value = eval_context.get('period_date', '')
-                        elif expr == 'period_index':
-                            value = eval_context.get('period_index', 0)
-                        elif expr == 'dcf':
-                            value = eval_context.get('dcf', 0)
-                        else:
-                            # If the expression is a simple variable name, avoid eval and return
-                            # the per-row context value (handles common user patterns).
-                            if expr.isidentifier():
-                                # Prefer per-row value in eval_context; fallback to context list element
-                                val = eval_context.get(expr)
-                                if val is None and isinstance(context, dict) and expr in context and isinstance(context[expr], list):
-                                    val = get_at(expr, idx, None)
-                                value = val
-                            else:
-                                try:
-                                    value = safe_eval_expression(expr, eval_context)
-                                except Exception as e:
-                                    # If None-subscript error, attempt simple variable fallback
-                                    msg = str(e)
-                                    if 'NoneType' in msg and 'subscript' in msg and isinstance(context, dict):
-                                        # try to extract first bare name from expression
-                                        parts = expr.replace(']', '').replace('[', ' ').split()
-                                        if parts:
-                                            name = parts[0].split('.')[0]
-                                            if name in context and isinstance(context[name], list):
-                                                value = get_at(name, idx, None)
-                                            else:
-                                                value = f"ERROR: {msg}"
-                                        else:
-                                            value = f"ERROR: {msg}"
-                                    else:
-                                        value = f"ERROR: {msg}"
-
-                        row[col_name] = value
-
-                        if isinstance(value, str) and value.startswith("ERROR"):
-                            computed_columns[col_name].append(0)
-                        else:
-                            computed_columns[col_name].append(value)
-
-                        if not (isinstance(value, str) and str(value).startswith("ERROR")):
-                            eval_context[col_name] = value
-
-                    result.append(row)
-
-                return result
+                # Names visible to every row, in shadowing order: user-provided
+                # context (list values read per row), then schedule-like variables
+                names, values = [], []
+
+                def bind(name, kind, value=None, arg=None):
+                    names.append((name, kind, arg))
+                    values.append(value)
+
+                def per_row(key, default=None):
+                    return [get_at(key, idx, default) for idx in range(n)]
+
+                for k, v in context.items():
+                    if k in _UNIFIED_RESERVED_KEYS:
+                        continue
+                    if isinstance(v, list):
+                        bind(k, 'row', per_row(k))
+                    else:
+                        bind(k, 'const', v)
+
+                bind('amount', 'row', [get_at('amounts', idx, get_at('amount', idx, 0)) for idx in range(n)])
+                bind('subinstrument_id', 'row', [get_at('subinstrument_ids', idx, get_at('subinstrument_id', idx, str(idx + 1))) for idx in range(n)])
+                bind('item_name', 'row', [get_at('item_names', idx, get_at('product_names', idx, f"Item {idx + 1}")) for idx in range(n)])
+                bind('start_date', 'row', per_row('start_dates', ''))
+                bind('end_date', 'row', per_row('end_dates', ''))
+                # Auto-generated sequence number for unified schedule
+                bind('s_no', 'index', arg=1)
+                bind('index', 'index', arg=1)
+                bind('period_index', 'index', arg=0)
+                bind('period_date', 'const', '')
+                bind('dcf', 'const', 0)
+                bind('lag', 'lag')
+
+                # Context arrays read directly when an expression resolves to None
+                fallbacks = tuple(k for k, v in context.items() if isinstance(v, list))
+                kernel = _compile_schedule_kernel(
+                    'unified',
+                    tuple((col, str(expr)) for col, expr in columns.items()),
+                    tuple(names),
+                    fallbacks,
+                    trace=_trace_buffer is not None,
+                )
+                if _trace_buffer is not None:
+                    _trace_event({"event": "schedule", "mode": "unified", "rows": n, "columns": list(columns.keys())})
+                return kernel(n, values, [per_row(k) for k in fallbacks])
             finally:
                 _in_schedule_evaluation -= 1
 
@@ -1365,222 +4103,128 @@ def schedule(period_def: Dict[str, Any], columns: Dict[str, str], context: Dict[
         return []
     
     dates = period_def.get("dates", [])
-    convention = period_def.get("convention", "ACT/360")
 
     if not dates:
         return []
 
+    # Identical (dates, convention, columns, context) inputs reuse a cached result
+    key = _schedule_cache_key(period_def, _schedule_columns_token(tuple((col, str(expr)) for col, expr in columns.items())), context)
+    sched = _schedule_cache_get(key)
+    if sched is not None:
+        sched._source = _schedule_source(period_def, columns, context)
+        return sched
+    sched = _dated_schedule(period_def, columns, context)
+    _schedule_cache_put(key, sched)
+    return sched
+
+
+def _dated_schedule(period_def: Dict[str, Any], columns: Dict[str, str], context: Optional[Dict[str, Any]],
+                    resume: Optional[tuple] = None) -> Schedule:
+    """Evaluate a schedule over the dates of `period_def`.
+
+    `resume` is (first_row, carried_values, lag_histories): only rows from
+    first_row on are evaluated, continuing from the given state (see
+    `schedule_state()`).
+    """
+    global _in_schedule_evaluation
+    start, carry, history = resume if resume is not None else (0, {}, {})
     # Mark that we're evaluating schedule column expressions to prevent
     # schedule helper re-entrancy (calling schedule helpers from inside
     # schedule column expressions can lead to recursion / confusing results).
     _in_schedule_evaluation += 1
     try:
-        result = []
-        computed_columns = {col: [] for col in columns.keys()}
-    
-        # Get DSL_FUNCTIONS from the module's global scope (defined at bottom of file)
-        # This avoids circular import issues
-        dsl_funcs = globals().get('DSL_FUNCTIONS', {})
-
-        # Pre-normalize injected context variables into arrays matching the schedule length
-        normalized_arrays = {}
-        if context and isinstance(context, dict):
-            n_dates = len(dates)
-            for k, v in context.items():
-                # If already a list, ensure it's at least n_dates long (pad with last or zeros)
-                if isinstance(v, list):
-                    arr = list(v)
-                    if len(arr) < n_dates:
-                        if arr:
-                            arr = arr + [arr[-1]] * (n_dates - len(arr))
-                        else:
-                            arr = [0] * n_dates
-                elif v is None:
-                    arr = [0] * n_dates
-                else:
-                    # Scalar: broadcast to full-length array
-                    arr = [v] * n_dates
-                normalized_arrays[k] = arr
-
-        for idx, date_str in enumerate(dates):
-            # Calculate DCF and next period date
-            if idx < len(dates) - 1:
-                next_date = dates[idx + 1]
-                dcf_value = day_count_fraction(date_str, next_date, convention)
-            else:
-                # Last period - use previous DCF or default
-                if idx > 0:
-                    prev_date = dates[idx - 1]
-                    dcf_value = day_count_fraction(prev_date, date_str, convention)
-                else:
-                    dcf_value = 1/12  # Default monthly
-
-            # Snapshot prior computed_columns so lag() reads a stable view
-            # This prevents lag() from indexing into in-progress lists containing
-            # placeholders or values appended while evaluating the current row.
-            prior_snapshot = {k: list(v) for k, v in computed_columns.items()}
-
-            # Create lag function with snapshot captured
-            def create_lag(cols_ref):
-                def lag_impl(col_name, offset=1, default=0):
-                    col_values = cols_ref.get(col_name, [])
-                    if len(col_values) >= offset:
-                        val = col_values[-offset]
-                        # If previous value was an error, return default
-                        if isinstance(val, str) and val.startswith("ERROR"):
-                            return default
-                        return val
-                    return default
-                return lag_impl
-
-            # Build context for expression evaluation with ALL DSL functions
-            # Add DSL functions FIRST, then override with local schedule-specific functions
-            eval_context = {}
-            eval_context.update(dsl_funcs)
+        n_dates = len(period_def["dates"])
+        names, values = _dated_schedule_bindings(period_def, context)
+        column_defs = tuple((col, str(expr)) for col, expr in columns.items())
+        # Lag-free columns are computed as whole arrays up front
+        precomputed = _vectorize_columns(column_defs, names, values, n_dates, (start, carry) if start else None)
+        kernel = _compile_schedule_kernel(
+            'dated',
+            column_defs,
+            names,
+            trace=_trace_buffer is not None,
+            precomputed=tuple(sorted(precomputed)),
+        )
+        if _trace_buffer is not None:
+            _trace_event({"event": "schedule", "mode": "dated", "rows": n_dates - start, "columns": list(columns.keys())})
+        sched = kernel(n_dates, values, (), precomputed, resume)
+    finally:
+        _in_schedule_evaluation -= 1
+    sched._source = _schedule_source(period_def, columns, context, start, carry, history)
+    return sched
 
-            # Inject normalized per-row context values and expose full arrays as `<name>_full`
-            if normalized_arrays:
-                for k, arr in normalized_arrays.items():
-                    try:
-                        eval_context[f"{k}_full"] = arr
-                    except Exception:
-                        eval_context[f"{k}_full"] = list(arr)
-                    eval_context[k] = arr[idx] if idx < len(arr) else 0
-
-            # Now add/override with schedule-specific context
-            eval_context.update({
-                # Special schedule variables
-                "period_date": date_str,
-                "period_index": idx,
-                "period_start": dates[idx + 1] if idx < len(dates) - 1 else date_str,
-                "dcf": dcf_value,
-
-                # Lag function for referencing previous rows (overrides DSL_FUNCTIONS lag)
-                "lag": create_lag(prior_snapshot),
-
-                # Python built-ins
-                "abs": abs,
-                "min": min,
-                "max": max,
-                "round": round,
-                "sum": sum_vals,
-                "len": len,
-                "int": int,
-                "float": float,
-                "str": str,
-                "pow": pow,
-                "True": True,
-                "False": False,
-            })
-
-            # Add previously computed columns to context (for referencing other columns in same row)
-            # This allows expressions like "opening * rate" where opening was already computed this row
-            for col_name, values in computed_columns.items():
-                if values:
-                    last_val = values[-1]
-                    # Skip None or ERROR markers when populating eval context
-                    if last_val is None:
-                        continue
-                    if isinstance(last_val, str) and str(last_val).startswith("ERROR"):
-                        continue
-                    eval_context[col_name] = last_val
 
-            # Create row with ONLY user-defined columns
-            row = {}
+def _dated_schedule_chunks(period_def: Dict[str, Any], columns: Dict[str, str], context: Optional[Dict[str, Any]],
+                           chunk_size: int) -> Iterator[Schedule]:
+    """`_dated_schedule()` evaluated `chunk_size` rows at a time.
 
-            # Evaluate each column expression in order
-            for col_name, expression in columns.items():
-                # Debug row/context snapshot
-                try:
-                    _builtin_print(f"DBG_ROW idx={idx} expr=\"{expression}\" period_index={idx} normalized_keys={list(normalized_arrays.keys()) if 'normalized_arrays' in locals() else []}")
-                    _builtin_print(f"DBG_ctx replay_upb={eval_context.get('replay_upb')} replay_upb_full_len={len(eval_context.get('replay_upb_full')) if eval_context.get('replay_upb_full') is not None else None} computed_End_UPB={computed_columns.get('End_UPB')}")
-                except Exception:
-                    pass
-
-                # Handle special keywords
-                if expression == "period_date":
-                    value = date_str
-                elif expression == "period_index":
-                    value = idx
-                elif expression == "dcf":
-                    value = dcf_value
-                else:
-                    try:
-                        # Debug: print evaluation context keys helpful for tracing
-                        try:
-                            _builtin_print(f"EVAL_CTX expr=\"{expression}\" period_index={idx} keys={list(eval_context.keys())}")
-                        except Exception:
-                            pass
-                        # Evaluate expression with full DSL context using safe evaluator
-                        expr_str = str(expression)
-                        # Lazy-evaluate top-level iif(...) to avoid evaluating both branches
-                        def _eval_iif_top(expr):
-                            # expects expr starting with iif(
-                            inside = expr[len('iif('):-1]
-                            # split top-level commas into three parts
-                            parts = []
-                            buf = ''
-                            depth = 0
-                            for ch in inside:
-                                if ch == ',' and depth == 0:
-                                    parts.append(buf.strip())
-                                    buf = ''
-                                    continue
-                                buf += ch
-                                if ch == '(':
-                                    depth += 1
-                                elif ch == ')':
-                                    depth -= 1
-                            if buf:
-                                parts.append(buf.strip())
-                            if len(parts) != 3:
-                                # fallback to normal eval if parse fails
-                                return safe_eval_expression(expr, eval_context)
-                            cond_expr, true_expr, false_expr = parts
-                            cond_val = safe_eval_expression(cond_expr, eval_context)
-                            chosen = true_expr if cond_val else false_expr
-                            return safe_eval_expression(chosen, eval_context)
-
-                        if expr_str.strip().startswith('iif(') and expr_str.strip().endswith(')'):
-                            value = _eval_iif_top(expr_str.strip())
-                        else:
-                            value = safe_eval_expression(expr_str, eval_context)
-                        # Guard: DSL functions must not return None inside schedule - replace None with 0 or []
-                        if value is None:
-                            value = 0
-                    except Exception as e:
-                        # Print error for debug and return error marker
-                        try:
-                            ctx_summary = {}
-                            for ck in ('replay_upb', 'replay_upb_full', 'End_UPB', 'Beg_UPB'):
-                                if ck in eval_context:
-                                    try:
-                                        ctx_summary[ck] = type(eval_context.get(ck)).__name__
-                                    except Exception:
-                                        ctx_summary[ck] = str(eval_context.get(ck))
-                            prior_keys = list(prior_snapshot.keys()) if 'prior_snapshot' in locals() else []
-                            _builtin_print(f"EVAL_ERROR expr=\"{expression}\" error={repr(e)} ctx_types={ctx_summary} prior_keys={prior_keys}")
-                        except Exception:
-                            pass
-                        value = f"ERROR: {str(e)}"
-
-                row[col_name] = value
-
-                # Store the computed value for lag references
-                # Normalize None and ERROR values to safe numeric defaults so lag() can index reliably
-                if isinstance(value, str) and value.startswith("ERROR"):
-                    computed_columns[col_name].append(0)
-                else:
-                    computed_columns[col_name].append(value if value is not None else 0)
+    Each chunk binds only its own rows, vectorizes its lag-free columns on
+    its own, and resumes the kernel from the carried values and lag()
+    histories of the chunk before it (as extend_schedule() does), so the
+    rows equal a single `_dated_schedule()` run.
+    """
+    global _in_schedule_evaluation
+    n_dates = len(period_def["dates"])
+    column_defs = tuple((col, str(expr)) for col, expr in columns.items())
+    depths = _schedule_lag_depths(columns)
+    read = _columns_read_names(column_defs)
+    carry, history = {}, {}
+    if _trace_buffer is not None:
+        _trace_event({"event": "schedule", "mode": "stream", "rows": n_dates, "columns": list(columns.keys())})
+    for start in range(0, n_dates, chunk_size):
+        stop = min(start + chunk_size, n_dates)
+        # Not held across the yield: consumers may call schedule helpers between chunks
+        _in_schedule_evaluation += 1
+        try:
+            names, values = _dated_schedule_bindings(period_def, context, (start, stop), read)
+            precomputed = _vectorize_columns(column_defs, names, values, stop - start,
+                                             (0, carry) if start else None, start)
+            kernel = _compile_schedule_kernel(
+                'dated',
+                column_defs,
+                names,
+                trace=_trace_buffer is not None,
+                precomputed=tuple(sorted(precomputed)),
+            )
+            chunk = kernel(stop, values, (), precomputed, (start, carry, history), start)
+        finally:
+            _in_schedule_evaluation -= 1
+        del names, values, precomputed
+        for col, stored in zip(columns, chunk._columns):
+            stored = [_carried_value(v) for v in stored]
+            carry[col] = stored[-1]
+            if col in depths:
+                kept = history.get(col, []) + stored
+                history[col] = kept[-depths[col]:] if depths[col] else kept
+        yield chunk
+
+
+def _columns_read_names(column_defs: tuple) -> Optional[frozenset]:
+    """Names the column expressions read (None when one does not parse)."""
+    names = set()
+    for _, text in column_defs:
+        try:
+            tree = _parse_expression(text)
+        except Exception:
+            return None
+        names.update(node.id for node in ast.walk(tree) if isinstance(node, ast.Name))
+    return frozenset(names)
 
-                # Update context with new value for subsequent columns in same row
-                if not (isinstance(value, str) and str(value).startswith("ERROR")):
-                    eval_context[col_name] = value
 
-            result.append(row)
-        return result
-    finally:
-        _in_schedule_evaluation -= 1
+def _schedule_source(period_def: Dict[str, Any], columns: Dict[str, str], context: Optional[Dict[str, Any]],
+                     offset: int = 0, carry: Dict[str, Any] = None, history: Dict[str, list] = None) -> Optional[Dict[str, Any]]:
+    """What `schedule_state()` needs to know about how a schedule was generated
+    (None unless it comes from a period() definition)."""
+    if period_def.get("type") != "period" or not period_def.get("start") or not period_def.get("end"):
+        return None
+    return {
+        "period": {key: period_def.get(key) for key in ("start", "end", "freq", "convention", "roll", "calendar")},
+        "columns": dict(columns),
+        "context": dict(context) if isinstance(context, dict) else None,
+        "offset": offset,
+        "carry": carry or {},
+        "history": history or {},
+    }
 
 
 def schedule_sum(sched: List[Dict[str, Any]], column: str) -> float:
@@ -1594,8 +4238,20 @@ def schedule_sum(sched: List[Dict[str, Any]], column: str) -> float:
     def _sum_rows(rows):
         if not rows:
             return 0
+        if isinstance(rows, Schedule):
+            total = rows._total(column)
+            if total is not None:
+                return total
         return sum(row.get(column, 0) for row in rows if isinstance(row.get(column), (int, float)))
 
+    # columnar schedule: read its columns without building rows
+    if isinstance(sched, Schedule) and sched._is_single():
+        return _sum_rows(sched)
+
+    # streamed schedule: one pass over the chunks' columns
+    if isinstance(sched, ScheduleStream):
+        return sum(v for chunk in sched.chunks() for v in chunk._column(column, None) if isinstance(v, (int, float)))
+
     # generate_schedules results: list of result dicts -> return list of totals
     if isinstance(sched, list) and sched and isinstance(sched[0], dict) and 'schedule' in sched[0]:
         return [_sum_rows(r.get('schedule', []) or []) for r in sched]
@@ -1621,11 +4277,19 @@ def schedule_last(sched: List[Dict[str, Any]], column: str) -> float:
     def _last_single(rows):
         if not rows:
             return 0
+        if isinstance(rows, Schedule):
+            values = rows._column(column, _NO_VALUE)
+            if values is not None:
+                return next((v for v in reversed(values) if v is not _NO_VALUE), 0)
         for row in reversed(rows):
             if column in row:
                 return row[column]
         return 0
 
+    # columnar schedule: read its columns without building rows
+    if isinstance(sched, Schedule) and sched._is_single():
+        return _last_single(sched)
+
     # generate_schedules results -> list of last values
     if isinstance(sched, list) and sched and isinstance(sched[0], dict) and 'schedule' in sched[0]:
         return [_last_single(r.get('schedule', []) or []) for r in sched]
@@ -1648,11 +4312,19 @@ def schedule_first(sched: List[Dict[str, Any]], column: str) -> float:
     def _first_single(rows):
         if not rows:
             return 0
+        if isinstance(rows, Schedule):
+            values = rows._column(column, _NO_VALUE)
+            if values is not None:
+                return next((v for v in values if v is not _NO_VALUE), 0)
         for row in rows:
             if column in row:
                 return row[column]
         return 0
 
+    # columnar schedule: read its columns without building rows
+    if isinstance(sched, Schedule) and sched._is_single():
+        return _first_single(sched)
+
     # generate_schedules results -> list of first values
     if isinstance(sched, list) and sched and isinstance(sched[0], dict) and 'schedule' in sched[0]:
         return [_first_single(r.get('schedule', []) or []) for r in sched]
@@ -1683,8 +4355,16 @@ def schedule_column(sched: List[Dict[str, Any]], column: str) -> List[Any]:
     def _col_values(rows):
         if not rows:
             return []
+        if isinstance(rows, Schedule):
+            values = rows._column(column, 0)
+            if values is not None:
+                return list(values)
         return [row.get(column, 0) for row in rows]
 
+    # columnar schedule: read its columns without building rows
+    if isinstance(sched, Schedule) and sched._is_single():
+        return _col_values(sched)
+
     # generate_schedules results: list of dicts with 'schedule' key
     if isinstance(sched, list) and sched and isinstance(sched[0], dict) and 'schedule' in sched[0]:
         return [_col_values(r.get('schedule', []) or []) for r in sched]
@@ -1697,6 +4377,77 @@ def schedule_column(sched: List[Dict[str, Any]], column: str) -> List[Any]:
     return _col_values(sched)
 
 
+def _filter_key(value: Any) -> str:
+    """How schedule_filter() compares a row or literal value: dates normalized, as text."""
+    try:
+        value = normalize_date(value) if isinstance(value, str) else value
+    except Exception:
+        pass
+    return str(value)
+
+
+def _schedule_match_row(rows: List[Dict[str, Any]], match_column: str, key: str) -> Any:
+    """Index of the first row whose `match_column` compares as `key` (None if
+    there is none) for schedule_filter().
+
+    Returns `_NO_VALUE` when a row before the match lacks the column (its
+    value then comes from evaluating `match_column` as an expression).
+    Columnar schedules keep a value -> first row index per match column;
+    rows edited through views are checked on top of it.
+    """
+    if isinstance(rows, Schedule) and rows._indexes is not None:
+        if match_column not in rows._names:
+            return _NO_VALUE
+        index = rows._indexes.get(match_column)
+        if index is None:
+            index = {}
+            for idx, value in enumerate(rows._columns[rows._names.index(match_column)]):
+                if value is not None:
+                    index.setdefault(_filter_key(value), idx)
+            rows._indexes[match_column] = index
+        found = index.get(key)
+        if not rows._views:
+            return found
+        if found in rows._views:
+            value = rows._views[found].get(match_column)
+            if value is None or _filter_key(value) != key:
+                return _scan_match_row(rows._column(match_column, _NO_VALUE), key)
+        for idx, row in sorted(rows._views.items()):
+            if found is not None and idx >= found:
+                break
+            if match_column not in row:
+                return _NO_VALUE
+            value = row[match_column]
+            if value is not None and _filter_key(value) == key:
+                return idx
+        return found
+    return _scan_match_row((row[match_column] if isinstance(row, dict) and match_column in row else _NO_VALUE
+                            for row in rows), key)
+
+
+def _scan_match_row(values, key: str) -> Any:
+    """_schedule_match_row() over per-row values, without an index."""
+    for idx, value in enumerate(values):
+        if value is _NO_VALUE:
+            return _NO_VALUE
+        if value is not None and _filter_key(value) == key:
+            return idx
+    return None
+
+
+def _reads_row_values(expression: str, rows: List[Dict[str, Any]]) -> bool:
+    """True if `expression` reads a name that some row of `rows` defines."""
+    try:
+        names = {node.id for node in ast.walk(_parse_expression(expression)) if isinstance(node, ast.Name)}
+    except Exception:
+        return False
+    if isinstance(rows, Schedule) and rows.column_names:
+        keys = set(rows.column_names).union(*rows._views.values())
+    else:
+        keys = set().union(*(row for row in rows if isinstance(row, dict)))
+    return not names.isdisjoint(keys)
+
+
 def schedule_filter(sched: List[Dict[str, Any]], match_column: str, match_value: Any, return_column: str) -> List[Any]:
     """
     For each schedule (or schedule result), find the first row where
@@ -1706,6 +4457,10 @@ def schedule_filter(sched: List[Dict[str, Any]], match_column: str, match_value:
     Always uses equality matching. Returns a list of values — one entry
     per subInstrumentId/schedule (single-entry list for single schedule).
     If no matching row is found for a schedule, returns 0 for that entry.
+
+    Lookups go through a value -> first row index of `match_column`, kept on
+    each columnar schedule, and `match_value` expressions are evaluated once
+    per schedule unless they read row values.
     """
     if _in_schedule_eval():
         raise ValueError("schedule_filter cannot be called from inside schedule column expressions; compute filters after schedule generation")
@@ -1713,79 +4468,80 @@ def schedule_filter(sched: List[Dict[str, Any]], match_column: str, match_value:
     if not sched:
         return []
 
+    # If match_value is an expression, we'll evaluate it per-schedule (using sched_ctx)
+    needs_eval_match = isinstance(match_value, str) and ("(" in match_value or ")" in match_value)
+
     def _find_value(rows, sched_ctx=None):
-        if not rows:
+        if not rows or not isinstance(match_column, str):
             return 0
 
-        # Get DSL functions for use in evaluation
-        dsl_funcs = globals().get('DSL_FUNCTIONS', {})
-
-        # If match_value is an expression, we'll evaluate it per-schedule (using sched_ctx)
-        needs_eval_match = isinstance(match_value, str) and ("(" in match_value or ")" in match_value)
+        # DSL functions and schedule-level context (like posting_date, amount, etc.)
+        # form one namespace per schedule; row values are layered on top per row.
+        # It is only built when something has to be evaluated.
+        layer = sched_ctx if isinstance(sched_ctx, dict) else None
+        namespace = _layered_namespace(layer) if needs_eval_match else None
 
         # Pre-evaluate match_value per-schedule if possible
         evaluated_match = None
         if needs_eval_match and sched_ctx:
-            eval_ctx = {}
-            eval_ctx.update(dsl_funcs)
-            # include schedule-level context (like posting_date, amount, etc.)
-            if isinstance(sched_ctx, dict):
-                eval_ctx.update(sched_ctx)
             try:
-                evaluated_match = safe_eval_expression(match_value, eval_ctx)
+                evaluated_match = safe_eval_expression(match_value, {}, namespace)
             except Exception:
                 evaluated_match = None
 
+        # Text to compare against: per-schedule evaluated_match if available, a
+        # schedule-level variable, the expression evaluated once when it does
+        # not read row values, or the literal; None means evaluate per row
+        if evaluated_match is not None:
+            mv = str(evaluated_match)
+        elif isinstance(match_value, str) and isinstance(sched_ctx, dict) and match_value in sched_ctx:
+            mv = str(sched_ctx.get(match_value))
+        elif needs_eval_match:
+            if _reads_row_values(match_value, rows):
+                mv = None
+            else:
+                try:
+                    mv = str(safe_eval_expression(match_value, {}, namespace))
+                except Exception:
+                    mv = str(match_value)
+        else:
+            mv = _filter_key(match_value)
+
+        idx = _schedule_match_row(rows, match_column, mv) if mv is not None else _NO_VALUE
+        if idx is None:
+            return 0
+        if idx is not _NO_VALUE:
+            if isinstance(rows, Schedule):
+                return rows._cell(idx, return_column, 0)
+            return rows[idx].get(return_column, 0)
+
+        if namespace is None:
+            namespace = _layered_namespace(layer)
         for row in rows:
-            # Build evaluation context for this row
-            eval_ctx = {}
-            eval_ctx.update(dsl_funcs)
-            if isinstance(sched_ctx, dict):
-                eval_ctx.update(sched_ctx)
             # row values should override schedule-level keys where applicable
-            if isinstance(row, dict):
-                eval_ctx.update(row)
+            eval_ctx = row if isinstance(row, dict) else {}
 
             # Determine row_val: direct lookup if column exists, otherwise evaluate expression
             row_val = None
-            if isinstance(match_column, str) and isinstance(row, dict) and match_column in row:
+            if isinstance(row, dict) and match_column in row:
                 row_val = row.get(match_column)
             else:
-                if isinstance(match_column, str):
-                    try:
-                        row_val = safe_eval_expression(match_column, eval_ctx)
-                    except Exception:
-                        row_val = None
+                try:
+                    row_val = safe_eval_expression(match_column, eval_ctx, namespace)
+                except Exception:
+                    row_val = None
 
             if row_val is None:
                 continue
 
-            # Normalize row value for comparison
-            try:
-                rv = normalize_date(row_val) if isinstance(row_val, str) else row_val
-            except Exception:
-                rv = row_val
-
-            # Determine match value to compare against: per-schedule evaluated_match if available,
-            # otherwise evaluate per-row using same context, or fall back to literal
-            if evaluated_match is not None:
-                mv = evaluated_match
-            else:
-                # If match_value is a simple variable name and present in schedule-level context, use it
-                if isinstance(match_value, str) and isinstance(sched_ctx, dict) and match_value in sched_ctx:
-                    mv = sched_ctx.get(match_value)
-                elif needs_eval_match:
-                    try:
-                        mv = safe_eval_expression(match_value, eval_ctx)
-                    except Exception:
-                        mv = match_value
-                else:
-                    try:
-                        mv = normalize_date(match_value) if isinstance(match_value, str) else match_value
-                    except Exception:
-                        mv = match_value
+            row_mv = mv
+            if row_mv is None:
+                try:
+                    row_mv = str(safe_eval_expression(match_value, eval_ctx, namespace))
+                except Exception:
+                    row_mv = str(match_value)
 
-            if str(rv) == str(mv):
+            if _filter_key(row_val) == row_mv:
                 return row.get(return_column, 0)
 
         return 0
@@ -1803,8 +4559,399 @@ def schedule_filter(sched: List[Dict[str, Any]], match_column: str, match_value:
     
 
 
+def _schedule_values(sched: List[Dict[str, Any]], column: str) -> List[Any]:
+    """Per-row values of one column of a single schedule (0 where missing)."""
+    values = sched._column(column, 0) if isinstance(sched, Schedule) else None
+    return list(values) if values is not None else [row.get(column, 0) for row in sched]
+
+
+def _carried_value(value: Any) -> Any:
+    """A row value as later rows see it: ERROR markers read as 0."""
+    return 0 if isinstance(value, str) and value.startswith('ERROR') else value
+
+
+def _schedule_lag_depths(columns: Dict[str, str]) -> Dict[str, Optional[int]]:
+    """Columns read through lag(), with the deepest offset (None: every row)."""
+    scanner = _ScheduleScopeNames()
+    for expr in columns.values():
+        if str(expr) in _SCHEDULE_SPECIAL_KEYWORDS:
+            continue
+        try:
+            scanner.visit(_parse_expression(str(expr)))
+        except Exception:
+            continue
+    if 'lag' not in scanner.names:
+        return {}
+    if scanner.dynamic_lag:
+        return {col: None for col in columns}
+    return {col: scanner.lag_depths[col] for col in columns if col in scanner.lag_depths}
+
+
+def schedule_state(sched: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Capture what extend_schedule() needs to continue a schedule later.
+
+    The last row is recomputed on extension (its period_start and dcf
+    change once a next period exists), so the state holds the carried
+    column values and lag() histories as of the row before it. The state
+    is a plain dict and can be persisted between runs.
+    
+    Args:
+        sched: Schedule returned by schedule() (or extend_schedule()) for a period() definition
+    
+    Returns:
+        {"period", "columns", "context", "rows", "resume", "carry", "history"}
+    """
+    source = getattr(sched, '_source', None) if isinstance(sched, Schedule) else None
+    if source is None or not len(sched):
+        raise ValueError("schedule_state requires a schedule generated by schedule() from a period() definition")
+    columns = source["columns"]
+    resume = len(sched) - 1
+    if resume:
+        done = {col: [_carried_value(v) for v in _schedule_values(sched, col)[:resume]] for col in columns}
+        carry = {col: values[-1] for col, values in done.items()}
+    else:
+        done = {col: [] for col in columns}
+        carry = dict(source["carry"])
+    history = {}
+    for col, depth in _schedule_lag_depths(columns).items():
+        values = list(source["history"].get(col, ())) + done.get(col, [])
+        history[col] = values[-depth:] if depth else values
+    return {
+        "period": dict(source["period"]),
+        "columns": dict(columns),
+        "context": source["context"],
+        "rows": source["offset"] + len(sched),
+        "resume": source["offset"] + resume,
+        "carry": carry,
+        "history": history,
+    }
+
+
+def extend_schedule(sched: Any, periods: int = 1, context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """
+    Extend a schedule by more periods without recomputing its earlier rows.
+    
+    Evaluation resumes at the schedule's last row (recomputed, since its
+    period_start and dcf depend on the next period) from the stored column
+    values and lag() histories, so the cost grows with the new periods only.
+    The rows equal a schedule() over the longer period.
+    
+    Args:
+        sched: Schedule from schedule()/extend_schedule(), or a schedule_state() dict
+        periods: Number of periods to add
+        context: Context for the extended schedule (default: the original one)
+    
+    Returns:
+        For a schedule: the extended schedule. For a state: the rows from the
+        state's last row on (replacing that stored row).
+    """
+    if _in_schedule_eval():
+        raise ValueError("extend_schedule cannot be called from inside schedule column expressions")
+    periods = _coerce_n_to_int(periods, 'periods')
+    if periods < 0:
+        raise ValueError("periods must be non-negative")
+    state = sched if isinstance(sched, dict) and "resume" in sched else schedule_state(sched)
+    spec = state["period"]
+    freq = spec.get("freq", "M")
+    convention = spec.get("convention", "ACT/360")
+    roll, calendar = spec.get("roll"), spec.get("calendar")
+    dates = period(spec["start"], spec["end"], freq, convention, roll, calendar)["dates"]
+    if len(dates) != state["rows"]:
+        raise ValueError("schedule state does not match its period definition")
+    if roll is not None or calendar is not None:
+        # Step from the unadjusted grid; adjusted dates can sit before it
+        end = datetime.fromisoformat(period(spec["start"], spec["end"], freq, convention)["dates"][-1])
+    else:
+        end = datetime.fromisoformat(dates[-1])
+    for _ in range(periods):
+        end = _next_period_date(end, freq)
+    period_def = period(spec["start"], end.strftime("%Y-%m-%d"), freq, convention, roll, calendar)
+    columns = state["columns"]
+    resume = (state["resume"], state["carry"], state["history"])
+    tail = _dated_schedule(period_def, columns, state["context"] if context is None else context, resume)
+    if sched is state:
+        return tail
+    # Keep the rows before the resumed one
+    keep = state["resume"] - sched._source["offset"]
+    merged = Schedule(tail._names, [_schedule_values(sched, col)[:keep] + values
+                                    for col, values in zip(columns, tail._columns)])
+    merged._source = dict(tail._source, offset=sched._source["offset"],
+                          carry=sched._source["carry"], history=sched._source["history"])
+    return merged
+
+
+def schedule_stream(period_def: Dict[str, Any], columns: Dict[str, str], context: Dict[str, Any] = None,
+                    chunk_size: int = _SCHEDULE_STREAM_CHUNK_ROWS) -> ScheduleStream:
+    """
+    schedule() for very long schedules: rows are evaluated lazily, chunk by chunk.
+    
+    The rows equal schedule()'s, but only `chunk_size` of them exist at a
+    time. schedule_sum, createTransaction and print_schedule read the stream
+    chunk by chunk.
+    
+    Args:
+        period_def: Period definition from period() function
+        columns: Dictionary of column names to expressions (as for schedule())
+        context: Optional dictionary of external variables
+        chunk_size: Rows evaluated per chunk
+    
+    Returns:
+        A ScheduleStream (iterate it for row dicts, or call .chunks())
+    
+    Example:
+        daily = schedule_stream(period("2000-01-01", "2029-12-31", "D"),
+                                {"accrual": "balance * rate * dcf"},
+                                {"balance": 1000000, "rate": 0.05})
+        schedule_sum(daily, "accrual")
+    """
+    if _in_schedule_eval():
+        raise ValueError("schedule_stream cannot be called from inside schedule column expressions")
+    if not isinstance(period_def, dict) or period_def.get("type") == "period_array" or "dates" not in period_def:
+        raise ValueError("schedule_stream requires a period() definition")
+    if not isinstance(columns, dict):
+        raise ValueError("schedule_stream requires a dictionary of column expressions")
+    chunk_size = _coerce_n_to_int(chunk_size, 'chunk_size')
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    return ScheduleStream(period_def, columns, context, chunk_size)
+
+
 # ============= Generic Multi-Item Schedule Generation =============
 
+# Smallest group of same-length items that generate_schedules() evaluates as one batch
+_BATCH_MIN_ITEMS = 2
+
+# generate_schedules(execution=...) modes
+_SCHEDULE_EXECUTION_MODES = ("serial", "process")
+
+# Fewest items sent to the process pool; below this pickling costs more than it saves
+_PARALLEL_MIN_ITEMS = 500
+
+# Shards per pool worker, so uneven shards still balance across workers
+_PARALLEL_SHARDS_PER_WORKER = 4
+
+# Process pool shared by generate_schedules(execution="process") calls
+_schedule_pool = None
+_schedule_pool_workers = 0
+
+# Column of the schedule total, first match wins (see generate_schedules)
+_SCHEDULE_TOTAL_COLUMNS = ("period_amount", "period_revenue", "period_accrual",
+                           "period_amortization", "period_depreciation", "lease_expense")
+
+
+@functools.lru_cache(maxsize=_SCHEDULE_KERNEL_CACHE_SIZE)
+def _plan_batch_columns(columns: tuple, bindings: tuple) -> Optional[tuple]:
+    """Plan a dated schedule definition for items x periods evaluation.
+
+    Returns one entry per column, or None when some column cannot be
+    evaluated exactly on arrays:
+    - ('alias', source): a period keyword or a plain name
+    - ('vector', tree): lag-free, computed over the whole 2-D array
+    - ('recurrence', match): an `_affine_recurrence()` over lag-free inputs,
+      solved along the periods axis
+    - ('recursive', tree): uses lag() (directly or through another
+      recursive column), computed one period at a time for all items
+    Names read by a column resolve to an earlier column if there is one,
+    else to a per-row binding; sources are keyed ('column' | 'binding', name).
+    """
+    final = {name: kind for name, kind, _ in bindings}
+    column_names = [name for name, _ in columns]
+    if final.get('lag') != 'lag' or 'lag' in column_names or not all(isinstance(c, str) for c in column_names):
+        return None
+    available = {name for name, kind in final.items() if kind in _VECTOR_ROW_KINDS and name not in column_names}
+    shadowed = set(final) | set(column_names)
+    recursive = set()
+    plan = []
+    for col_name, text in columns:
+        if text in _SCHEDULE_SPECIAL_KEYWORDS:
+            plan.append(('alias', ('binding', text)))
+        else:
+            try:
+                tree = _parse_expression(text)
+            except Exception:
+                return None
+            if not _vectorizable(tree, available, lag=True):
+                return None
+            recurrence = _match_recurrence(tree, col_name, available - recursive, shadowed)
+            if isinstance(tree.body, ast.Name):
+                name = tree.body.id
+                plan.append(('alias', ('column' if name in column_names else 'binding', name)))
+                if name in recursive:
+                    recursive.add(col_name)
+            elif recurrence is not None:
+                plan.append(('recurrence', recurrence))
+            elif any(_lag_call(node) or (isinstance(node, ast.Name) and node.id in recursive)
+                     for node in ast.walk(tree)):
+                recursive.add(col_name)
+                plan.append(('recursive', tree))
+            else:
+                plan.append(('vector', tree))
+        available.add(col_name)
+    return tuple(plan)
+
+
+def _batch_schedule_columns(columns: tuple, bindings: tuple, item_values: List[List[Any]], n: int) -> Optional[List[List[list]]]:
+    """Evaluate one dated schedule definition for many same-length items.
+
+    Args:
+        columns: ((column_name, expression_text), ...)
+        bindings: binding layout shared by all items (see `_dated_schedule_bindings()`)
+        item_values: the binding values of each item
+        n: number of periods of every item
+
+    Returns:
+        For each column, one list of per-period values per item; None when the
+        definition or the inputs cannot be batched exactly.
+    """
+    plan = _plan_batch_columns(columns, bindings)
+    if plan is None:
+        return None
+    m = len(item_values)
+    column_names = [name for name, _ in columns]
+    positions = {name: pos for pos, (name, _, _) in enumerate(bindings)}
+    aliases = {('column', name): entry[1] for name, entry in zip(column_names, plan) if entry[0] == 'alias'}
+    arrays = {}
+
+    def resolve(key):
+        while key in aliases:
+            key = aliases[key]
+        return key
+
+    def key_of(name):
+        return ('column', name) if name in column_names else ('binding', name)
+
+    def array(key):
+        # items x periods array of a binding's or column's values (None if not exact)
+        key = resolve(key)
+        if key not in arrays:
+            _, kind, arg = bindings[positions[key[1]]]
+            if kind == 'index':
+                arrays[key] = np.tile(np.arange(arg, n + arg).astype(object), (m, 1))
+            else:
+                pos = positions[key[1]]
+                flat = _to_vector([v for values in item_values for v in values[pos][:n]])
+                arrays[key] = flat.reshape(m, n) if flat is not None else None
+        return arrays[key]
+
+    def scope(tree, row=None):
+        env = {}
+        functions = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and node.id not in env and id(node) not in functions:
+                values = array(key_of(node.id))
+                if values is None:
+                    return None
+                env[node.id] = values if row is None else values[:, row]
+        return env
+
+    # Lag-free columns and recurrences first: they never depend on recursive ones
+    for col_name, (kind, payload) in zip(column_names, plan):
+        if kind == 'recurrence':
+            env = scope(ast.Tuple([part for part in payload if isinstance(part, ast.AST)], ast.Load()))
+            try:
+                with np.errstate(all='ignore'):
+                    result = _evaluate_recurrence(payload, env, (m, n)) if env is not None else None
+            except Exception:
+                result = None
+            if result is None:
+                return None
+            arrays[('column', col_name)] = result
+            continue
+        if kind != 'vector':
+            continue
+        env = scope(payload)
+        result = _evaluate_vector(payload.body, env) if env is not None else None
+        if isinstance(result, np.ndarray) and result.shape != (m, n):
+            return None
+        if result is None or isinstance(result, np.datetime64):
+            return None
+        if not isinstance(result, np.ndarray):
+            filled = np.empty((m, n), dtype=object)
+            filled[...] = result
+            result = filled
+        arrays[('column', col_name)] = result
+
+    # Recursive columns: one period at a time, all items at once
+    recursive = [(col_name, tree) for col_name, (kind, tree) in zip(column_names, plan) if kind == 'recursive']
+    for col_name, _ in recursive:
+        arrays[('column', col_name)] = np.empty((m, n), dtype=object)
+    for row in range(n):
+        for col_name, tree in recursive:
+            env = scope(tree, row)
+            if env is None:
+                return None
+
+            def lag(call):
+                target, offset, default_node = call
+                default = 0 if default_node is None else _evaluate_vector(default_node, env, lag)
+                if default is None or _is_date_vector(default):
+                    return None
+                if target not in column_names or row < offset:
+                    return default
+                history = array(('column', target))
+                if history is None or history.dtype.kind == 'M':
+                    return None
+                return history[:, row - offset]
+
+            value = _evaluate_vector(tree.body, env, lag)
+            if value is None or _is_date_vector(value):
+                return None
+            arrays[('column', col_name)][:, row] = value
+
+    outputs = []
+    for col_name, (kind, payload) in zip(column_names, plan):
+        key = resolve(('column', col_name))
+        if key[0] == 'binding' and bindings[positions[key[1]]][1] == 'row':
+            pos = positions[key[1]]
+            # As in the row loop, a None value reads as 0 in a dated schedule
+            outputs.append([[0 if v is None else v for v in values[pos][:n]] for values in item_values])
+        else:
+            outputs.append(_from_vector(array(key)))
+    return outputs
+
+
+def _generate_schedules_batch(entries: List[tuple], columns: Dict[str, str]) -> bool:
+    """Fill the schedules of same-length generate_schedules() items in one batch.
+
+    Args:
+        entries: (result, period_def, sched_context) per item
+        columns: column definitions shared by all items
+
+    Returns:
+        False (leaving the results untouched) when the items cannot be batched.
+    """
+    global _in_schedule_evaluation
+    if 'schedule' in columns:
+        # schedule_sum() would read such rows as generate_schedules results
+        return False
+    n = len(entries[0][1]["dates"])
+    layouts = [_dated_schedule_bindings(period_def, sched_context)
+               for _, period_def, sched_context in entries]
+    bindings = layouts[0][0]
+    if any(layout[0] != bindings for layout in layouts):
+        return False
+    column_defs = tuple((col, str(expr)) for col, expr in columns.items())
+    _in_schedule_evaluation += 1
+    try:
+        outputs = _batch_schedule_columns(column_defs, bindings, [values for _, values in layouts], n)
+    finally:
+        _in_schedule_evaluation -= 1
+    if outputs is None:
+        return False
+
+    names = tuple(columns.keys())
+    total_index = next((names.index(col) for col in _SCHEDULE_TOTAL_COLUMNS if col in columns), None)
+    for i, (result, period_def, sched_context) in enumerate(entries):
+        item_columns = [values[i] for values in outputs]
+        result["schedule"] = Schedule(names, item_columns, n)
+        result["schedule"]._source = _schedule_source(period_def, columns, sched_context)
+        if total_index is not None:
+            result["total"] = sum(v for v in item_columns[total_index] if isinstance(v, (int, float)))
+    return True
+
+
+
 # Pre-defined schedule templates for common accounting use cases
 SCHEDULE_TEMPLATES = {
     "revenue": {
@@ -1878,7 +5025,12 @@ def generate_schedules(
     freq: str = "M",
     context: Dict[str, Any] = None,
     item_names: List[str] = None,
-    subinstrument_ids: List[str] = None
+    subinstrument_ids: List[str] = None,
+    execution: str = "serial",
+    max_workers: Optional[int] = None,
+    parallel_threshold: int = None,
+    roll: str = None,
+    calendar: str = None
 ) -> List[Dict[str, Any]]:
     """
     Generate schedules for multiple items - FULLY GENERIC.
@@ -1900,6 +5052,12 @@ def generate_schedules(
         context: Additional variables for expressions (e.g., {"rate": 0.05})
         item_names: Optional names for each item (for display)
         subinstrument_ids: Optional sub-instrument IDs for each item
+        execution: "serial" (default) or "process" to shard the schedules across
+                   a process pool; results keep the item order either way
+        max_workers: Process-pool size (default: CPU count)
+        parallel_threshold: Minimum number of items worth sending to the pool
+                            (default 500); smaller lists stay serial
+        roll, calendar: Business-day adjustment of the period dates, as in period()
     
     Returns:
         List of schedule result objects, each containing:
@@ -1940,11 +5098,14 @@ def generate_schedules(
             ["PROD-001", "PROD-002", "DISC-001"]
         )
     """
+    if execution not in _SCHEDULE_EXECUTION_MODES:
+        raise ValueError(f"execution must be one of {', '.join(_SCHEDULE_EXECUTION_MODES)}, got {execution!r}")
     if not amounts or not start_dates or not end_dates or not columns:
         return []
     
     n = min(len(amounts), len(start_dates), len(end_dates))
     results = []
+    pending = []  # (result, period_def, sched_context) of items that need a schedule
     
     for i in range(n):
         amount = amounts[i] if i < len(amounts) else 0
@@ -1982,7 +5143,7 @@ def generate_schedules(
             continue
         
         # Generate period definition
-        period_def = period(start, end, freq)
+        period_def = period(start, end, freq, roll=roll, calendar=calendar)
         total_periods = len(period_def.get("dates", []))
         result["total_periods"] = total_periods
         
@@ -2001,25 +5162,142 @@ def generate_schedules(
         if context:
             sched_context.update(context)
         
-        # Generate the schedule
-        sched = schedule(period_def, columns, sched_context)
-        result["schedule"] = sched
-        
-        # Calculate total (look for period_amount, period_revenue, period_accrual, etc.)
-        total = 0
-        amount_columns = ["period_amount", "period_revenue", "period_accrual", 
-                         "period_amortization", "period_depreciation", "lease_expense"]
-        for col in amount_columns:
-            if sched and col in sched[0]:
-                total = schedule_sum(sched, col)
-                break
-        result["total"] = total
-        
+        pending.append((result, period_def, sched_context))
         results.append(result)
+
+    # Items whose inputs were seen before come from the schedule result cache;
+    # of the items sharing inputs within this call only the first is computed
+    misses, repeats = _fill_cached_schedules(pending, columns)
+    pending = [entry for entry, _ in misses]
+
+    threshold = _PARALLEL_MIN_ITEMS if parallel_threshold is None else parallel_threshold
+    if (execution == "process" and len(pending) >= max(threshold, 1)
+            and _trace_buffer is None and not _in_schedule_eval()):
+        _fill_schedules_parallel(pending, columns, max_workers)
+    else:
+        _fill_schedules(pending, columns)
+    for (result, _, _), key in misses:
+        _schedule_cache_put(key, result["schedule"])
+    if repeats:
+        # Anything evicted again in the meantime (tiny cache budgets) is recomputed
+        misses, _ = _fill_cached_schedules(repeats, columns)
+        _fill_schedules([entry for entry, _ in misses], columns)
     
     return results
 
 
+def _schedule_total(sched: List[Dict[str, Any]]) -> Any:
+    """generate_schedules() total: the sum of the first of `_SCHEDULE_TOTAL_COLUMNS` present."""
+    if not sched:
+        return 0
+    for col in _SCHEDULE_TOTAL_COLUMNS:
+        # Columnar schedules are checked without creating a row view
+        if isinstance(sched, Schedule):
+            present = sched._cell(0, col, _NO_VALUE) is not _NO_VALUE
+        else:
+            present = col in sched[0]
+        if present:
+            return schedule_sum(sched, col)
+    return 0
+
+
+def _fill_cached_schedules(pending: List[tuple], columns: Dict[str, str]) -> tuple:
+    """Fill the generate_schedules() results whose schedules are cached.
+
+    Returns ((entry, cache_key), ...) for the items still to compute and the
+    entries whose key repeats one of those (filled once the first is cached).
+    """
+    columns_token = _schedule_columns_token(tuple((col, str(expr)) for col, expr in columns.items()))
+    misses, repeats, missed_keys = [], [], set()
+    for entry in pending:
+        result, period_def, sched_context = entry
+        key = _schedule_cache_key(period_def, columns_token, sched_context) if period_def.get("dates") else None
+        if key is not None and key in missed_keys:
+            repeats.append(entry)
+            continue
+        sched = _schedule_cache_get(key)
+        if sched is None:
+            misses.append((entry, key))
+            missed_keys.add(key)
+            continue
+        sched._source = _schedule_source(period_def, columns, sched_context)
+        result["schedule"] = sched
+        result["total"] = _schedule_total(sched)
+    return misses, repeats
+
+
+def _fill_schedules(pending: List[tuple], columns: Dict[str, str]) -> None:
+    """Set 'schedule' and 'total' on generate_schedules() results.
+
+    Args:
+        pending: (result, period_def, sched_context) per item, in item order
+        columns: column definitions shared by all items
+    """
+    # Items with the same number of periods are evaluated together as
+    # items x periods arrays; anything that cannot be batched exactly (or is
+    # traced) is evaluated on its own, as schedule() would
+    groups = {}
+    for entry in pending:
+        groups.setdefault(len(entry[1].get("dates", [])), []).append(entry)
+    for period_count, entries in groups.items():
+        if (period_count and len(entries) >= _BATCH_MIN_ITEMS and _trace_buffer is None
+                and not _in_schedule_eval() and _generate_schedules_batch(entries, columns)):
+            continue
+        for result, period_def, sched_context in entries:
+            # Generate the schedule
+            sched = _dated_schedule(period_def, columns, sched_context) if period_def.get("dates") else []
+            result["schedule"] = sched
+            
+            # Calculate total (look for period_amount, period_revenue, period_accrual, etc.)
+            result["total"] = _schedule_total(sched)
+
+
+def _schedule_worker_init() -> None:
+    """Process-pool initializer: build the shared evaluation namespace up front."""
+    _get_safe_globals()
+
+
+def _schedule_worker(columns: Dict[str, str], items: List[tuple], calendars: Dict[str, tuple]) -> List[tuple]:
+    """Process-pool task: (schedule, total) for each (period_def, sched_context),
+    with the parent's holiday calendars."""
+    _install_holiday_calendars(calendars)
+    entries = [({"total": 0}, period_def, sched_context) for period_def, sched_context in items]
+    _fill_schedules(entries, columns)
+    return [(result["schedule"], result["total"]) for result, _, _ in entries]
+
+
+def _get_schedule_pool(max_workers: Optional[int]) -> concurrent.futures.ProcessPoolExecutor:
+    """Return the shared schedule process pool, (re)created for `max_workers`."""
+    global _schedule_pool, _schedule_pool_workers
+    workers = max_workers or os.cpu_count() or 1
+    if _schedule_pool is None or _schedule_pool_workers != workers:
+        if _schedule_pool is not None:
+            _schedule_pool.shutdown(wait=False)
+        _schedule_pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_schedule_worker_init)
+        _schedule_pool_workers = workers
+    return _schedule_pool
+
+
+def _fill_schedules_parallel(pending: List[tuple], columns: Dict[str, str], max_workers: Optional[int]) -> None:
+    """`_fill_schedules()` over contiguous shards run in the schedule process pool.
+
+    Shards are collected in order, so results line up with the items and the
+    first failing item (in item order) raises, as in serial execution.
+    """
+    pool = _get_schedule_pool(max_workers)
+    shard_count = _schedule_pool_workers * _PARALLEL_SHARDS_PER_WORKER
+    shard_size = max(1, -(-len(pending) // shard_count))
+    shards = [pending[i:i + shard_size] for i in range(0, len(pending), shard_size)]
+    calendars = _holiday_calendar_specs()
+    futures = [pool.submit(_schedule_worker, columns, [(period_def, sched_context) for _, period_def, sched_context in shard],
+                           calendars)
+               for shard in shards]
+    for shard, future in zip(shards, futures):
+        for (result, _, _), (sched, total) in zip(shard, future.result()):
+            result["schedule"] = sched
+            result["total"] = total
+
+
 def get_schedules_array(results: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
     """
     Extract just the schedule arrays from generate_schedules results.
@@ -2052,6 +5330,84 @@ def get_schedule_totals(results: List[Dict[str, Any]], column: str = None) -> Li
         return [r.get("total", 0) for r in results]
 
 
+# Key of the find_period_amounts() index in Schedule._indexes (match columns are strings)
+_PERIOD_MONTH_INDEX = ('year_month', 'period_date')
+
+
+def _year_month_key(value: Any) -> Optional[int]:
+    """year * 12 + month - 1 of a date as find_period_amounts() reads it, or None."""
+    if not value:
+        return None
+    try:
+        parsed = _read_date(value)
+    except Exception:
+        return None
+    return None if parsed is None else _year_month_of(parsed)
+
+
+def _year_month_of(parsed: datetime) -> int:
+    return parsed.year * 12 + parsed.month - 1
+
+
+def _period_month_index(sched: List[Dict[str, Any]]) -> tuple:
+    """(sorted year-month keys, first row index of each) of a schedule's period_date.
+
+    Columnar schedules keep it until a row is edited through a view.
+    """
+    columnar = isinstance(sched, Schedule) and sched._indexes is not None
+    cacheable = columnar and not sched._views
+    if cacheable and _PERIOD_MONTH_INDEX in sched._indexes:
+        return sched._indexes[_PERIOD_MONTH_INDEX]
+    values = sched._column("period_date", None) if columnar else [row.get("period_date") for row in sched]
+    first = {}
+    for idx, value in enumerate(values):
+        key = _year_month_key(value)
+        if key is not None and key not in first:
+            first[key] = idx
+    keys = sorted(first)
+    index = (keys, [first[key] for key in keys])
+    if cacheable:
+        sched._indexes[_PERIOD_MONTH_INDEX] = index
+    return index
+
+
+def _period_amount_record(result: Dict[str, Any], sched: List[Dict[str, Any]], index: tuple,
+                          target: Optional[int], amount_column: Optional[str]) -> Dict[str, Any]:
+    """One find_period_amounts() entry: the row of `sched` in year-month `target`."""
+    rec = {
+        "item_index": result.get("item_index"),
+        "item_name": result.get("item_name"),
+        "subinstrument_id": result.get("subinstrument_id"),
+        "period_date": None,
+        "period_amount": 0
+    }
+    if target is None:
+        return rec
+    keys, rows = index
+    pos = bisect.bisect_left(keys, target)
+    if pos == len(keys) or keys[pos] != target:
+        return rec
+    idx = rows[pos]
+    # Columnar schedules are read without creating a row view
+    row = None if isinstance(sched, Schedule) else sched[idx]
+
+    def cell(col):
+        return sched._cell(idx, col, _NO_VALUE) if row is None else row.get(col, _NO_VALUE)
+    rec["period_date"] = cell("period_date")
+
+    # Auto-detect amount column
+    value = cell(amount_column) if amount_column else _NO_VALUE
+    if value is _NO_VALUE:
+        # Try common column names
+        for col in _SCHEDULE_TOTAL_COLUMNS:
+            value = cell(col)
+            if value is not _NO_VALUE:
+                break
+    if value is not _NO_VALUE:
+        rec["period_amount"] = value
+    return rec
+
+
 def find_period_amounts(
     results: List[Dict[str, Any]],
     posting_date: str,
@@ -2060,6 +5416,10 @@ def find_period_amounts(
     """
     Find the period amounts for each item based on posting date.
     
+    The row is the first one whose period_date falls in the posting date's
+    year and month, found by bisecting a sorted year-month index kept on
+    each schedule.
+    
     Args:
         results: Results from generate_schedules()
         posting_date: The posting date to match
@@ -2073,60 +5433,41 @@ def find_period_amounts(
     """
     if not results or not posting_date:
         return []
+    return find_period_amounts_many(results, [posting_date], amount_column)[0]
+
+
+def find_period_amounts_many(
+    results: List[Dict[str, Any]],
+    posting_dates: List[str],
+    amount_column: str = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    find_period_amounts() for several posting dates in one pass (backfills).
+    
+    Each schedule's year-month index is built once and every posting date
+    is looked up in it.
+    
+    Args:
+        results: Results from generate_schedules()
+        posting_dates: Posting dates to match
+        amount_column: Column name to extract (auto-detected if not specified)
+    
+    Returns:
+        One find_period_amounts() result per posting date, in order
+        (an empty list for an empty posting date)
+    """
+    if not results or not posting_dates:
+        return [[] for _ in posting_dates or []]
     
-    recognition = []
+    targets = [_year_month_key(posting_date) for posting_date in posting_dates]
+    recognition = [[] for _ in posting_dates]
     
     for r in results:
         sched = r.get("schedule", [])
-        rec = {
-            "item_index": r.get("item_index"),
-            "item_name": r.get("item_name"),
-            "subinstrument_id": r.get("subinstrument_id"),
-            "period_date": None,
-            "period_amount": 0
-        }
-        
-        if sched:
-            # Inline period-match logic (previously schedule_find_period)
-            try:
-                nd_post = normalize_date(posting_date)
-                if not nd_post:
-                    matched_row = {}
-                    raise ValueError("invalid posting_date")
-                target = datetime.fromisoformat(str(nd_post))
-                target_year_month = (target.year, target.month)
-                matched_row = {}
-                for row in sched:
-                    period_date_str = row.get("period_date")
-                    if period_date_str:
-                        try:
-                            nd_pd = normalize_date(period_date_str)
-                            if not nd_pd:
-                                continue
-                            period_date = datetime.fromisoformat(str(nd_pd))
-                        except Exception:
-                            continue
-                        if (period_date.year, period_date.month) == target_year_month:
-                            matched_row = row
-                            break
-            except (ValueError, TypeError):
-                matched_row = {}
-
-            if matched_row:
-                rec["period_date"] = matched_row.get("period_date")
-
-                # Auto-detect amount column
-                if amount_column and amount_column in matched_row:
-                    rec["period_amount"] = matched_row.get(amount_column, 0)
-                else:
-                    # Try common column names
-                    for col in ["period_amount", "period_revenue", "period_accrual",
-                               "period_amortization", "period_depreciation", "lease_expense"]:
-                        if col in matched_row:
-                            rec["period_amount"] = matched_row.get(col, 0)
-                            break
-        
-        recognition.append(rec)
+        index = _period_month_index(sched) if sched else ([], [])
+        for posting_date, target, rec_list in zip(posting_dates, targets, recognition):
+            if posting_date:
+                rec_list.append(_period_amount_record(r, sched, index, target, amount_column))
     
     return recognition
 
@@ -2174,7 +5515,7 @@ def print_schedule(sched: List[Dict[str, Any]], title: str = "Schedule") -> List
     Print a schedule as a formatted table in the console.
     
     Args:
-        sched: Schedule to print
+        sched: Schedule to print (a schedule_stream() is printed chunk by chunk)
         title: Title for the schedule
     
     Returns:
@@ -2187,6 +5528,18 @@ def print_schedule(sched: List[Dict[str, Any]], title: str = "Schedule") -> List
         return sched
     
     _dsl_print(f"═══ {title} ═══")
+    if isinstance(sched, ScheduleStream):
+        # Same text as for the full list, printed a chunk at a time
+        _dsl_print("[")
+        pending = None
+        for chunk in sched.chunks():
+            if pending is not None:
+                _dsl_print(pending + ",")
+            pending = ",\n".join("  " + json.dumps(row, indent=2, default=str).replace("\n", "\n  ")
+                                  for row in (dict(zip(chunk._names, values)) for values in zip(*chunk._columns)))
+        _dsl_print(pending)
+        _dsl_print("]")
+        return sched
     try:
         _dsl_print(json.dumps(sched, indent=2, default=str))
     except:
@@ -2579,6 +5932,30 @@ def createTransaction(postingdate: Any, effectivedate: Any, transactiontype: Any
     """
     global _transaction_results, _current_instrumentid
 
+    # Streamed schedules (schedule_stream) create transactions row by row:
+    # each stream argument stands for its current row
+    args = [postingdate, effectivedate, transactiontype, amount]
+    streams = {id(arg): arg for arg in args if isinstance(arg, ScheduleStream)}
+    if streams:
+        if isinstance(transactiontype, ScheduleStream):
+            raise ValueError("'transactiontype' must be a value, not a schedule stream")
+        lengths = {name: len(arg) for name, arg in zip(('postingdate', 'effectivedate', 'amount'),
+                                                       (postingdate, effectivedate, amount))
+                   if isinstance(arg, ScheduleStream)}
+        if len(set(lengths.values())) > 1:
+            described = ', '.join(f"'{name}' ({length})" for name, length in lengths.items())
+            raise ValueError(f"Schedule streams must have the same number of rows: {described}")
+        created = []
+        for rows in zip(*streams.values()):
+            current = dict(zip(streams, rows))
+            row_args = [current.get(id(arg), arg) if isinstance(arg, ScheduleStream) else arg for arg in args]
+            txn = createTransaction(*row_args, subinstrumentid)
+            if txn is not None:
+                created.extend(txn if isinstance(txn, list) else [txn])
+        if not created:
+            return None
+        return created[0] if len(created) == 1 else created
+
     # Helper to normalize input to list
     def _to_list(x):
         if x is None:
@@ -2713,8 +6090,8 @@ def createTransaction(postingdate: Any, effectivedate: Any, transactiontype: Any
             amt_num = 0.0
 
         txn = {
-            'postingdate': posting_str,
-            'effectivedate': effective_str,
+            'postingdate': str(posting_str),
+            'effectivedate': str(effective_str),
             'instrumentid': _current_instrumentid,
             'subinstrumentid': sub_id,
             'transactiontype': str(type_raw) if type_raw is not None else '',
@@ -2761,8 +6138,8 @@ def for_each(dates_array: List[str], amounts_array: List[float], date_var: str,
     if min_len == 0:
         return results
     
-    # Get DSL_FUNCTIONS from module globals to avoid import issues
-    dsl_funcs = globals().get('DSL_FUNCTIONS', {})
+    # DSL functions take precedence over same-named loop variables
+    shadowed = _shadowed_row_names((date_var, amount_var, 'index', 'postingdate'))
     
     for i in range(min_len):
         # Create local context with current values
@@ -2772,9 +6149,8 @@ def for_each(dates_array: List[str], amounts_array: List[float], date_var: str,
             'index': i,
             'postingdate': dates_array[i],  # Also provide postingdate for convenience
         }
-        
-        # Add all DSL functions to context
-        local_context.update(dsl_funcs)
+        for name in shadowed:
+            local_context.pop(name, None)
         
         try:
             result = safe_eval_expression(expression, local_context)
@@ -2813,24 +6189,24 @@ def for_each_with_index(array: List[Any], var_name: str, expression: str, contex
     if not array:
         return results
     
-    # Get DSL_FUNCTIONS from module globals to avoid import issues
-    dsl_funcs = globals().get('DSL_FUNCTIONS', {})
+    # External context variables sit over the DSL functions (and can override
+    # them if needed); both take precedence over same-named loop variables
+    namespace = _layered_namespace(context)
+    shadowed = _shadowed_row_names((var_name, 'index', 'count'), context)
+    count = len(array)
     
     for i, item in enumerate(array):
         local_context = {
             var_name: item,
             'index': i,
-            'count': len(array),
+            'count': count,
         }
-        # Add DSL functions
-        local_context.update(dsl_funcs)
-        # Add external context variables (can override DSL functions if needed)
-        if context:
-            local_context.update(context)
+        for name in shadowed:
+            local_context.pop(name, None)
         
         try:
             # Allow only safe DSL expressions
-            result = safe_eval_expression(expression, local_context)
+            result = safe_eval_expression(expression, local_context, namespace)
             results.append(result)
         except Exception:
             results.append(None)
@@ -2980,25 +6356,26 @@ def array_filter(array: List[Any], var_name: str, condition: str, context: Dict[
     if not array:
         return []
     
-    # Get DSL_FUNCTIONS from module globals to avoid import issues
-    dsl_funcs = globals().get('DSL_FUNCTIONS', {})
+    # Context over DSL functions over loop variables, as in for_each_with_index
+    namespace = _layered_namespace(context)
+    shadowed = _shadowed_row_names((var_name, 'index', 'count'), context)
+    count = len(array)
     results = []
     
     for i, item in enumerate(array):
         local_context = {
             var_name: item,
             'index': i,
-            'count': len(array),
+            'count': count,
         }
-        local_context.update(dsl_funcs)
-        if context:
-            local_context.update(context)
+        for name in shadowed:
+            local_context.pop(name, None)
         
-            try:
-                if safe_eval_expression(condition, local_context):
-                    results.append(item)
-            except Exception:
-                pass
+        try:
+            if safe_eval_expression(condition, local_context, namespace):
+                results.append(item)
+        except Exception:
+            pass
     
     return results
 
@@ -3077,8 +6454,8 @@ DSL_FUNCTIONS = {
     'normalize_arraydate': normalize_arraydate,
     'normalize_date': normalize_date,
     # Financial
-    'pv': pv, 'fv': fv, 'pmt': pmt, 'rate': rate, 'nper': nper, 'npv': npv, 'irr': irr,
-    'xnpv': xnpv, 'xirr': xirr,
+    'pv': pv, 'fv': fv, 'pmt': pmt, 'rate': rate, 'nper': nper, 'npv': npv, 'irr': irr, 'irr_many': irr_many,
+    'xnpv': xnpv, 'xirr': xirr, 'xirr_many': xirr_many,
     'discount_factor': discount_factor, 'accumulation_factor': accumulation_factor,
     'effective_rate': effective_rate, 'nominal_rate': nominal_rate, 'yield_to_maturity': yield_to_maturity,
     'compound_interest': compound_interest,
@@ -3126,6 +6503,8 @@ DSL_FUNCTIONS = {
     'day_count_fraction': day_count_fraction, 'is_leap_year': is_leap_year,
     'days_in_year': days_in_year, 'quarter': quarter, 'day_of_week': day_of_week,
     'is_weekend': is_weekend, 'business_days': business_days,
+    'holiday_calendar': holiday_calendar, 'is_business_day': is_business_day,
+    'add_business_days': add_business_days, 'roll_date': roll_date,
     
     # Schedule Functions
     'period': period, 'schedule': schedule,
@@ -3133,6 +6512,8 @@ DSL_FUNCTIONS = {
     'schedule_last': schedule_last, 'schedule_first': schedule_first,
     'schedule_column': schedule_column,
     'schedule_filter': schedule_filter,
+    'schedule_state': schedule_state, 'extend_schedule': extend_schedule,
+    'schedule_stream': schedule_stream,
     
     # Generic Multi-Item Schedule Generation (internal implementations retained, not exposed)
     
@@ -3182,8 +6563,10 @@ DSL_FUNCTION_METADATA = [
     {"name": "nper", "params": "rate, pmt, pv, fv=0, type=0", "description": "Number of periods (type: 0=end, 1=beginning)", "category": "Financial"},
     {"name": "npv", "params": "rate, cashflows", "description": "Net present value", "category": "Financial"},
     {"name": "irr", "params": "cashflows", "description": "Internal rate of return", "category": "Financial"},
+    {"name": "irr_many", "params": "cashflow_lists, guess?", "description": "Internal rate of return for many instruments in one batch", "category": "Financial"},
     {"name": "xnpv", "params": "rate, cashflows, dates", "description": "NPV with specific dates (365-day convention)", "category": "Financial"},
     {"name": "xirr", "params": "cashflows, dates", "description": "IRR with specific dates", "category": "Financial"},
+    {"name": "xirr_many", "params": "cashflow_lists, date_lists, guess?", "description": "XIRR for many instruments in one batch (None where no rate is found)", "category": "Financial"},
     {"name": "discount_factor", "params": "rate, dcf", "description": "Discount factor for period", "category": "Financial"},
     {"name": "accumulation_factor", "params": "rate, dcf", "description": "Growth factor", "category": "Financial"},
     {"name": "effective_rate", "params": "nominal, freq", "description": "Nominal to effective rate", "category": "Financial"},
@@ -3256,35 +6639,42 @@ DSL_FUNCTION_METADATA = [
     
     # Date (19)
     # (Removed duplicate normalize_date entry)
-    {"name": "days_between", "params": "d1, d2", "description": "Days between dates", "category": "Date"},
+    {"name": "days_between", "params": "d1, d2", "description": "Days between dates (lists map element-wise)", "category": "Date"},
     {"name": "months_between", "params": "d1, d2", "description": "Months between", "category": "Date"},
     {"name": "years_between", "params": "d1, d2", "description": "Years between", "category": "Date"},
-    {"name": "add_days", "params": "d, n", "description": "Add days to date", "category": "Date"},
-    {"name": "add_months", "params": "d, n", "description": "Add months", "category": "Date"},
+    {"name": "add_days", "params": "d, n", "description": "Add days to date (lists map element-wise)", "category": "Date"},
+    {"name": "add_months", "params": "d, n", "description": "Add months (lists map element-wise)", "category": "Date"},
     {"name": "add_years", "params": "d, n", "description": "Add years", "category": "Date"},
     {"name": "subtract_days", "params": "d, n", "description": "Subtract days from date", "category": "Date"},
     {"name": "subtract_months", "params": "d, n", "description": "Subtract months", "category": "Date"},
     {"name": "subtract_years", "params": "d, n", "description": "Subtract years", "category": "Date"},
-    {"name": "start_of_month", "params": "d", "description": "First day of month", "category": "Date"},
-    {"name": "end_of_month", "params": "d", "description": "Last day of month", "category": "Date"},
-    {"name": "day_count_fraction", "params": "d1, d2, conv='ACT/360'", "description": "Year fraction", "category": "Date"},
+    {"name": "start_of_month", "params": "d", "description": "First day of month (lists map element-wise)", "category": "Date"},
+    {"name": "end_of_month", "params": "d", "description": "Last day of month (lists map element-wise)", "category": "Date"},
+    {"name": "day_count_fraction", "params": "d1, d2, conv='ACT/360'", "description": "Year fraction: ACT/360, ACT/365, 30/360, 30E/360, ACT/ACT ISDA, ACT/365L (lists map element-wise)", "category": "Date"},
     {"name": "is_leap_year", "params": "year", "description": "Check leap year", "category": "Date"},
     {"name": "days_in_year", "params": "year", "description": "Days in year", "category": "Date"},
-    {"name": "quarter", "params": "d", "description": "Get quarter", "category": "Date"},
+    {"name": "quarter", "params": "d", "description": "Get quarter (lists map element-wise)", "category": "Date"},
     {"name": "day_of_week", "params": "d", "description": "Day of week (0-6)", "category": "Date"},
     {"name": "is_weekend", "params": "d", "description": "Is weekend", "category": "Date"},
 
     {"name": "normalize_date", "params": "date_value", "description": "Normalize a date to YYYY-MM-DD string format.", "category": "Date"},
-    {"name": "business_days", "params": "d1, d2", "description": "Business days", "category": "Date"},
+    {"name": "business_days", "params": "d1, d2, calendar?", "description": "Business days between two dates in either order, optionally of a holiday calendar (lists map element-wise)", "category": "Date"},
+    {"name": "holiday_calendar", "params": "name, holidays, weekend?", "description": "Register a holiday calendar (e.g. from a reference event) for the business-day functions", "category": "Date"},
+    {"name": "is_business_day", "params": "d, calendar?", "description": "Is a business day (not a weekend day or holiday)", "category": "Date"},
+    {"name": "add_business_days", "params": "d, n, calendar?", "description": "Move a date by n business days", "category": "Date"},
+    {"name": "roll_date", "params": "d, convention='following', calendar?", "description": "Adjust a date to a business day: following, modified_following, preceding, modified_preceding", "category": "Date"},
     
     # Schedule (5) - Time-based schedule generation for amortization, revenue, FAS-91, etc.
     {"name": "schedule", "params": "period, columns", "description": "Create deterministic time-based schedule table (amortization, revenue, FAS-91, accruals)", "category": "Schedule"},
-    {"name": "period", "params": "start, end, freq, conv?", "description": "Define time axis: freq=M/Q/A/W/D, conv=ACT/360|ACT/365|30/360", "category": "Schedule"},
+    {"name": "period", "params": "start, end, freq, conv?, roll?, calendar?", "description": "Define time axis: freq=M/Q/A/W/D, conv=ACT/360|ACT/365|30/360|30E/360|ACT/ACT ISDA|ACT/365L, roll/calendar adjust dates to business days", "category": "Schedule"},
     {"name": "schedule_sum", "params": "schedule, column", "description": "Sum a column from schedule", "category": "Schedule"},
     {"name": "schedule_last", "params": "schedule, column", "description": "Get last value of column", "category": "Schedule"},
     {"name": "schedule_first", "params": "schedule, column", "description": "Get first value of column", "category": "Schedule"},
     {"name": "schedule_column", "params": "schedule, column", "description": "Return column values from schedule. For multiple schedules returns list of lists per subInstrumentId.", "category": "Schedule"},
     {"name": "schedule_filter", "params": "schedule, match_column, match_value, return_column", "description": "Find first row where match_column == match_value and return return_column (per-schedule).", "category": "Schedule"},
+    {"name": "schedule_state", "params": "schedule", "description": "Capture carried values and lag histories so the schedule can be extended later (persistable dict)", "category": "Schedule"},
+    {"name": "extend_schedule", "params": "schedule_or_state, periods?, context?", "description": "Extend a schedule by N periods, evaluating only the new periods (and the previous last row)", "category": "Schedule"},
+    {"name": "schedule_stream", "params": "period_def, columns, context?, chunk_size?", "description": "Lazily evaluated schedule for very long periods; schedule_sum, createTransaction and print_schedule read it chunk by chunk", "category": "Schedule"},
     
     # Multi Schedules (internal only) - implementations retained but not shown in DSL UI
     
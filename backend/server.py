@@ -61,13 +61,13 @@ import google.generativeai as genai
 import asyncio
 # Support running in different execution contexts: prefer package import, fallback to module-level
 try:
-    from backend.dsl_functions import DSL_FUNCTIONS, DSL_FUNCTION_METADATA, normalize_date
+    from backend.dsl_functions import DSL_FUNCTIONS, DSL_FUNCTION_METADATA, normalize_date, configure_schedule_cache, schedule_cache_stats
 except Exception:
     try:
-        from dsl_functions import DSL_FUNCTIONS, DSL_FUNCTION_METADATA, normalize_date
+        from dsl_functions import DSL_FUNCTIONS, DSL_FUNCTION_METADATA, normalize_date, configure_schedule_cache, schedule_cache_stats
     except Exception:
         # Last resort: try relative import (works when executed as package)
-        from .dsl_functions import DSL_FUNCTIONS, DSL_FUNCTION_METADATA, normalize_date
+        from .dsl_functions import DSL_FUNCTIONS, DSL_FUNCTION_METADATA, normalize_date, configure_schedule_cache, schedule_cache_stats
 
 try:
     from bson import ObjectId
@@ -83,6 +83,13 @@ db_name = os.environ.get('DB_NAME', 'dsl_db')
 client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=5000)
 db = client[db_name]
 
+# Schedule result cache shared by all runs of this process
+configure_schedule_cache(
+    enabled=os.environ.get('SCHEDULE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+    max_bytes=int(os.environ.get('SCHEDULE_CACHE_MAX_MB', '64')) * 1024 * 1024,
+    spill_dir=os.environ.get('SCHEDULE_CACHE_DIR', ''),
+)
+
 # Create the main app
 app = FastAPI()
 # Router without /api prefix - proxy will handle the /api part
@@ -192,6 +199,10 @@ class DSLRunRequest(BaseModel):
     dsl_code: str
     posting_date: Optional[str] = None
     effective_date: Optional[str] = None
+    # Opt-in schedule trace returned as "trace" in the response
+    trace: bool = False
+    trace_max_events: int = 1000
+    trace_sample_every: int = 1
 
 class TemplateExecuteRequest(BaseModel):
     template_id: str
@@ -392,9 +403,9 @@ except Exception:
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 try:
-    from backend.dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print
+    from backend.dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print, _set_schedule_trace, _get_schedule_trace
 except Exception:
-    from dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print
+    from dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print, _set_schedule_trace, _get_schedule_trace
 from datetime import datetime
 import json
 
@@ -564,9 +575,9 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__)))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 try:
-    from backend.dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print
+    from backend.dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print, _set_schedule_trace, _get_schedule_trace
 except Exception:
-    from dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print
+    from dsl_functions import DSL_FUNCTIONS, _set_current_instrumentid, _clear_transaction_results, _get_transaction_results, _set_dsl_print, _set_schedule_trace, _get_schedule_trace
 from datetime import datetime
 import json
 
@@ -1046,8 +1057,13 @@ def dsl_to_python(dsl_code: str, event_fields: List[Dict[str, str]]) -> str:
     all_event_fields = {"DEFAULT": event_fields}
     return dsl_to_python_multi_event(dsl_code, all_event_fields)
 
-async def execute_python_template(python_code: str, event_data: List[Dict[str, Any]], raw_event_data: Dict[str, List[Dict]] = None, override_postingdate: str = None, override_effectivedate: str = None) -> Dict[str, Any]:
-    """Execute Python template on event data and return transactions + print outputs"""
+async def execute_python_template(python_code: str, event_data: List[Dict[str, Any]], raw_event_data: Dict[str, List[Dict]] = None, override_postingdate: str = None, override_effectivedate: str = None, trace_options: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Execute Python template on event data and return transactions + print outputs.
+
+    When `trace_options` (max_events, sample_every) is given, schedule tracing
+    is enabled for this run and the trace is returned under "trace". Schedule
+    cache hits and misses of the run are returned under "schedule_cache".
+    """
     # Execute the generated python template in a restricted context and return results.
     try:
         # When executed as package, templates expect to import dsl_functions; ensure package-qualified import
@@ -1064,17 +1080,28 @@ async def execute_python_template(python_code: str, event_data: List[Dict[str, A
         # Execute the template which defines helper functions like process_event_data, get_print_outputs
         exec(compile(python_code, '<dsl_template>', 'exec'), exec_globals)
 
-        # Prefer calling process_event_data (multi-event template) and pass raw_event_data
-        if 'process_event_data' in exec_globals:
-            try:
-                transactions = exec_globals['process_event_data'](event_data, raw_event_data, override_postingdate, override_effectivedate)
-            except TypeError:
-                # Fallback if template signature differs
-                transactions = exec_globals['process_event_data'](event_data, override_postingdate, override_effectivedate)
-        elif 'process_standalone' in exec_globals:
-            transactions = exec_globals['process_standalone'](override_postingdate, override_effectivedate)
-        else:
-            raise RuntimeError('Template did not define a process function')
+        set_trace = exec_globals.get('_set_schedule_trace') if trace_options else None
+        trace = None
+        cache_before = schedule_cache_stats()
+        if set_trace:
+            set_trace(True, **trace_options)
+        try:
+            # Prefer calling process_event_data (multi-event template) and pass raw_event_data
+            if 'process_event_data' in exec_globals:
+                try:
+                    transactions = exec_globals['process_event_data'](event_data, raw_event_data, override_postingdate, override_effectivedate)
+                except TypeError:
+                    # Fallback if template signature differs
+                    transactions = exec_globals['process_event_data'](event_data, override_postingdate, override_effectivedate)
+            elif 'process_standalone' in exec_globals:
+                transactions = exec_globals['process_standalone'](override_postingdate, override_effectivedate)
+            else:
+                raise RuntimeError('Template did not define a process function')
+            if set_trace:
+                trace = exec_globals['_get_schedule_trace']()
+        finally:
+            if set_trace:
+                set_trace(False)
         # Normalize transactions into TransactionOutput models if needed
         # Some DSL helpers (createTransaction) return plain dicts; convert them to
         # TransactionOutput so callers can call `model_dump()` uniformly.
@@ -1096,7 +1123,11 @@ async def execute_python_template(python_code: str, event_data: List[Dict[str, A
             except Exception:
                 print_outputs = []
 
-        return {"transactions": normalized_transactions, "print_outputs": print_outputs}
+        result = {"transactions": normalized_transactions, "print_outputs": print_outputs,
+                  "schedule_cache": schedule_cache_stats(cache_before)}
+        if trace is not None:
+            result["trace"] = trace
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -1946,6 +1977,10 @@ async def run_dsl_code(request: DSLRunRequest):
     """Run DSL code directly and return results (for console testing)"""
     try:
         dsl_code = request.dsl_code
+        trace_options = {
+            "max_events": request.trace_max_events,
+            "sample_every": request.trace_sample_every,
+        } if request.trace else None
         
         # Extract all event names referenced in the DSL code
         referenced_events = extract_event_names_from_dsl(dsl_code)
@@ -1974,20 +2009,35 @@ async def run_dsl_code(request: DSLRunRequest):
                 if not process_func:
                     raise ValueError("Generated code does not contain process_standalone function")
                 
-                # Execute standalone
-                results, print_outputs = process_func(request.posting_date, request.effective_date)
+                # Execute standalone, tracing schedules if requested
+                set_trace = exec_globals.get('_set_schedule_trace') if trace_options else None
+                trace = None
+                cache_before = schedule_cache_stats()
+                if set_trace:
+                    set_trace(True, **trace_options)
+                try:
+                    results, print_outputs = process_func(request.posting_date, request.effective_date)
+                    if set_trace:
+                        trace = exec_globals['_get_schedule_trace']()
+                finally:
+                    if set_trace:
+                        set_trace(False)
                 
                 # Convert to TransactionOutput models
                 transactions = [TransactionOutput(**result) for result in results]
                 
-                return {
+                response = {
                     "success": True,
                     "transactions": [t.model_dump() for t in transactions],
                     "events_used": [],
                     "row_count": 1,
                     "print_outputs": print_outputs,
-                    "mode": "standalone"
+                    "mode": "standalone",
+                    "schedule_cache": schedule_cache_stats(cache_before)
                 }
+                if trace is not None:
+                    response["trace"] = trace
+                return response
             except Exception as e:
                 logger.error(f"Standalone DSL error: {str(e)}")
                 return {
@@ -2073,7 +2123,8 @@ async def run_dsl_code(request: DSLRunRequest):
             merged_data,
             event_data_dict,  # Pass raw event data for collect() functions
             request.posting_date,
-            request.effective_date
+            request.effective_date,
+            trace_options
         )
         
         transactions = execution_result["transactions"]
@@ -2089,6 +2140,10 @@ async def run_dsl_code(request: DSLRunRequest):
             "row_count": len(merged_data),
             "print_outputs": print_outputs
         }
+        if "trace" in execution_result:
+            result["trace"] = execution_result["trace"]
+        if "schedule_cache" in execution_result:
+            result["schedule_cache"] = execution_result["schedule_cache"]
         
         # Add warning if some events had no data
         if events_without_data:
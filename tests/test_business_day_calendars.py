@@ -0,0 +1,85 @@
+import numpy as np
+
+from backend.dsl_functions import (
+    add_business_days,
+    business_days,
+    clear_schedule_cache,
+    extend_schedule,
+    holiday_calendar,
+    is_business_day,
+    period,
+    roll_date,
+    schedule,
+)
+
+US_HOLIDAYS = ['2026-07-03', '2026-12-25', '2027-01-01']
+
+
+def setup_function():
+    holiday_calendar('US', US_HOLIDAYS)
+
+
+def test_add_business_days_skips_holidays_and_weekends():
+    assert add_business_days('2026-07-02', 1, 'US') == '2026-07-06'
+    assert add_business_days('2026-07-06', -1, 'US') == '2026-07-02'
+    assert add_business_days('2026-07-03', 0, 'US') == '2026-07-06'
+    assert add_business_days('2026-01-02', 1) == '2026-01-05'
+
+
+def test_is_business_day():
+    assert is_business_day('2026-07-03', 'US') is False
+    assert is_business_day('2026-07-03') is True
+    assert is_business_day(['2026-07-03', '2026-07-04', '2026-07-06'], 'US') == [False, False, True]
+
+
+def test_business_days_order_does_not_matter():
+    assert business_days('2026-01-05', '2026-01-09') == 4
+    assert business_days('2026-01-09', '2026-01-05') == 4
+    holiday_calendar('EMPTY', [])
+    assert business_days('2026-01-09', '2026-01-05', 'EMPTY') == 4
+    assert business_days('2026-06-29', '2026-07-10', 'US') == 8
+
+
+def test_calendar_window_grows_to_far_dates():
+    # Each call reaches further from the dates seen so far
+    for start, end in (('2026-07-02', '2026-07-10'), ('1900-01-01', '1900-03-01'),
+                       ('2026-07-02', '2036-12-01'), ('2150-06-01', '2151-01-01')):
+        expected = np.busday_count(start, end, holidays=US_HOLIDAYS)
+        assert business_days(start, end, 'US') == expected
+    for n in (2600, -2600, 40000):
+        expected = np.busday_offset('2026-07-02', n, roll='forward', holidays=US_HOLIDAYS)
+        assert add_business_days('2026-07-02', n, 'US') == str(expected)
+
+
+def test_roll_conventions_around_month_ends():
+    # 2026-05-31 and 2026-02-01 are Sundays
+    assert roll_date('2026-05-31', 'following') == '2026-06-01'
+    assert roll_date('2026-05-31', 'modified_following') == '2026-05-29'
+    assert roll_date('2026-02-01', 'preceding') == '2026-01-30'
+    assert roll_date('2026-02-01', 'modified_preceding') == '2026-02-02'
+    assert roll_date('2026-05-31', 'none') == '2026-05-31'
+    assert roll_date('2026-12-25', 'following', 'US') == '2026-12-28'
+    assert roll_date('2026-12-25', 'preceding', 'US') == '2026-12-24'
+
+
+def test_rolled_period_dates_are_kept_once():
+    # Saturday and Sunday both roll onto Monday
+    dates = period('2026-01-02', '2026-01-06', 'D', roll='following')['dates']
+    assert dates == ['2026-01-02', '2026-01-05', '2026-01-06']
+
+
+def test_extend_schedule_with_roll_and_calendar():
+    clear_schedule_cache()
+    columns = {'d': 'period_date', 'n': 'lag("n", 1, 0) + 1', 'f': 'dcf'}
+    short = schedule(period('2026-01-31', '2026-06-30', 'M', 'ACT/360', 'modified_following', 'US'), columns)
+    longer = schedule(period('2026-01-31', '2026-12-31', 'M', 'ACT/360', 'modified_following', 'US'), columns)
+    assert list(extend_schedule(short, 6)) == list(longer)
+
+
+def test_reregistering_a_calendar_invalidates_cached_schedules():
+    clear_schedule_cache()
+    p = period('2026-07-01', '2026-07-05', 'D')
+    columns = {'open': 'is_business_day(period_date, "US")'}
+    assert [row['open'] for row in schedule(p, columns)] == [True, True, False, False, False]
+    holiday_calendar('US', ['2026-07-01'])
+    assert [row['open'] for row in schedule(p, columns)] == [False, True, True, False, False]
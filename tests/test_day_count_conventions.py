@@ -0,0 +1,42 @@
+import pytest
+
+from backend.dsl_functions import day_count_fraction, period
+
+
+def test_act_act_isda_splits_across_years():
+    # 17 days of 2023 over 365 plus 14 days of leap year 2024 over 366
+    assert day_count_fraction('2023-12-15', '2024-01-15', 'ACT/ACT ISDA') == pytest.approx(17 / 365 + 14 / 366)
+    assert day_count_fraction('2023-06-30', '2025-06-30', 'ACT/ACT ISDA') == pytest.approx(185 / 365 + 1 + 180 / 365)
+    assert day_count_fraction('2024-03-01', '2024-04-01', 'ACT/ACT ISDA') == pytest.approx(31 / 366)
+
+
+def test_30e_360_moves_31st_to_30th_on_both_ends():
+    assert day_count_fraction('2024-01-31', '2024-03-31', '30E/360') == pytest.approx(60 / 360)
+    assert day_count_fraction('2024-02-29', '2024-03-31', '30E/360') == pytest.approx(31 / 360)
+    assert day_count_fraction('2024-02-28', '2024-03-31', '30E/360') == pytest.approx(32 / 360)
+    assert day_count_fraction('2024-02-28', '2024-03-31', '30/360') == pytest.approx(33 / 360)
+
+
+def test_act_365l_uses_the_later_dates_year():
+    assert day_count_fraction('2024-02-15', '2024-03-15', 'ACT/365L') == pytest.approx(29 / 366)
+    assert day_count_fraction('2023-02-15', '2023-03-15', 'ACT/365L') == pytest.approx(28 / 365)
+    assert day_count_fraction('2023-12-15', '2024-01-15', 'ACT/365L') == pytest.approx(31 / 366)
+
+
+def test_list_form_matches_scalar():
+    starts, ends = ['2023-12-15', '2024-02-28'], ['2024-01-15', '2024-03-31']
+    for conv in ('ACT/ACT ISDA', '30E/360', 'ACT/365L'):
+        assert day_count_fraction(starts, ends, conv) == [day_count_fraction(a, b, conv) for a, b in zip(starts, ends)]
+
+
+def test_annual_act_365l_period_uses_feb_29_rule():
+    # 2024-01-15 to 2025-01-15 contains Feb 29 (366 days over 366); the
+    # non-annual rule divides by 365 as 2025 is not a leap year
+    assert day_count_fraction('2024-01-15', '2025-01-15', 'ACT/365L') == pytest.approx(366 / 365)
+    dcf = period('2024-01-15', '2027-01-15', 'A', 'ACT/365L')['dcf']
+    assert dcf == pytest.approx((1.0, 1.0, 1.0, 1.0))
+    # 2023-03-01 to 2024-03-01 contains Feb 29 as well
+    assert period('2023-03-01', '2024-03-01', 'A', 'ACT/365L')['dcf'][0] == pytest.approx(1.0)
+    # Monthly periods keep the non-annual rule
+    monthly = period('2024-01-15', '2024-03-15', 'M', 'ACT/365L')['dcf']
+    assert monthly[0] == pytest.approx(day_count_fraction('2024-01-15', '2024-02-15', 'ACT/365L'))
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from backend.dsl_functions import clear_schedule_cache, extend_schedule, period, schedule, schedule_state
+
+COLUMNS = {
+    'd': 'period_date',
+    'pay': 'min(principal / 12, lag("bal", 1, principal))',
+    'bal': 'lag("bal", 1, principal) * (1 + rate * dcf) - pay',
+    'late': 'lag("pay", 3, 0) + lag("bal", 2, -1)',
+    'last': 'last + 1 if period_index else 0',
+    'ix': 'period_index',
+    'start': 'period_start',
+}
+CONTEXT = {'principal': 1200, 'rate': 0.05}
+
+
+def setup_function():
+    clear_schedule_cache()
+
+
+def _full(start, end, freq):
+    return list(schedule(period(start, end, freq), COLUMNS, dict(CONTEXT)))
+
+
+@pytest.mark.parametrize('freq,start,end,longer_end', [
+    ('M', '2024-01-31', '2024-11-30', '2025-03-31'),
+    ('Q', '2023-05-31', '2024-11-30', '2025-11-30'),
+    ('D', '2024-02-20', '2024-03-05', '2024-03-09'),
+])
+def test_extended_rows_equal_schedule_over_longer_period(freq, start, end, longer_end):
+    base = schedule(period(start, end, freq), COLUMNS, dict(CONTEXT))
+    full = _full(start, longer_end, freq)
+    periods = len(full) - len(base)
+    assert list(extend_schedule(base, periods)) == full
+
+
+def test_extending_twice_equals_extending_once():
+    base = schedule(period('2024-01-31', '2024-06-30', 'M'), COLUMNS, dict(CONTEXT))
+    twice = extend_schedule(extend_schedule(base, 2), 3)
+    assert list(twice) == _full('2024-01-31', '2024-11-30', 'M')
+
+
+def test_state_survives_a_json_round_trip():
+    base = schedule(period('2024-01-31', '2024-06-30', 'M'), COLUMNS, dict(CONTEXT))
+    state = json.loads(json.dumps(schedule_state(base)))
+    tail = extend_schedule(state, 4)
+    full = _full('2024-01-31', '2024-10-31', 'M')
+    assert list(tail) == full[state['resume']:]
+
+    # A tail's own state extends further
+    state = json.loads(json.dumps(schedule_state(tail)))
+    assert list(extend_schedule(state, 2)) == _full('2024-01-31', '2024-12-31', 'M')[state['resume']:]
+
+
+def test_extending_by_zero_periods_keeps_the_rows():
+    base = schedule(period('2024-01-31', '2024-06-30', 'M'), COLUMNS, dict(CONTEXT))
+    assert list(extend_schedule(base, 0)) == list(base)
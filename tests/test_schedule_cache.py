@@ -0,0 +1,32 @@
+from backend.dsl_functions import clear_schedule_cache, period, schedule
+
+
+def _first_row(result):
+    rows = result.to_list() if hasattr(result, 'to_list') else list(result)
+    return rows[0]
+
+
+def test_cache_key_covers_context_read_as_full_array():
+    clear_schedule_cache()
+    p = period('2024-01-31', '2024-04-30', 'M')
+    columns = {'v': 'array_get(x_full, 0, 0)', 'w': 'len(x_full)'}
+
+    first = _first_row(schedule(p, columns, {'x': [1, 2, 3]}))
+    second = _first_row(schedule(p, columns, {'x': [9, 9, 9, 9, 9]}))
+
+    assert first['v'] == 1
+    assert second == {'v': 9, 'w': 5}
+
+
+def test_cache_hits_do_not_share_mutable_cells():
+    clear_schedule_cache()
+    p = period('2024-01-31', '2024-04-30', 'M')
+    columns = {'lst': '[period_index]'}
+
+    first = schedule(p, columns)
+    first[1]['lst'].append('X')
+    second = schedule(p, columns)
+    assert second[1]['lst'] == [1]
+
+    second[1]['lst'].append('Y')
+    assert schedule(p, columns)[1]['lst'] == [1]